@@ -0,0 +1,43 @@
+"""Compares rendering small_movies.json with JSONResponse and FastJSONResponse.
+
+    poetry run python benchmarks/response_rendering.py
+
+FastJSONResponse uses orjson when it is installed (`pip install meilisearch-fastapi[orjson]`), so
+run it with and without orjson to see both of its paths.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from functools import partial
+from pathlib import Path
+from timeit import repeat
+
+from fastapi.responses import JSONResponse
+
+from meilisearch_fastapi._responses import FastJSONResponse, orjson
+
+MOVIES_PATH = Path(__file__).parent.parent / "tests" / "assets" / "small_movies.json"
+NUMBER = 200
+REPEAT = 5
+
+
+def main() -> int:
+    movies = json.loads(MOVIES_PATH.read_text())
+    size = len(JSONResponse(movies).body)
+    sys.stdout.write(
+        f"{len(movies)} documents, {size / 1024:.1f} KB, orjson "
+        f"{'installed' if orjson is not None else 'not installed'}\n"
+    )
+
+    for response_class in (JSONResponse, FastJSONResponse):
+        timings = repeat(partial(response_class, movies), number=NUMBER, repeat=REPEAT)
+        best = min(timings) / NUMBER
+        sys.stdout.write(f"{response_class.__name__:<18}{best * 1000:.3f} ms\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,3 @@
+from meilisearch_fastapi._client import meilisearch_lifespan
+
+__all__ = ["meilisearch_lifespan"]
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from time import monotonic
+
+from fastapi import HTTPException
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS, HTTP_503_SERVICE_UNAVAILABLE
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi.models.admission import AdmissionStats, IndexAdmissionStats
+
+
+class AdmissionRejected(HTTPException):
+    def __init__(self, status_code: int, detail: str, retry_after: float) -> None:
+        super().__init__(
+            status_code, detail, headers={"Retry-After": str(max(1, round(retry_after)))}
+        )
+
+
+@dataclass
+class _Index:
+    semaphore: asyncio.Semaphore
+    active: int = 0
+    waiting: int = 0
+
+
+class AdmissionControl:
+    """Caps how many requests run at once, overall and for each index.
+
+    Requests over a cap wait in a bounded queue for up to `queue_timeout` seconds. When an index
+    already has `index_queue_size` requests waiting, more requests for it are rejected with a 429
+    so one busy index can't fill the queue, and when the whole queue is full or the wait runs out
+    they are rejected with a 503. Either way the client is told to retry instead of timing out.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_concurrent_per_index: int,
+        queue_size: int,
+        index_queue_size: int,
+        queue_timeout: float,
+    ) -> None:
+        self.max_concurrent_per_index = max_concurrent_per_index
+        self.queue_size = queue_size
+        self.index_queue_size = index_queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_index_queue_full = 0
+        self.timed_out = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._indexes: dict[str, _Index] = {}
+
+    @asynccontextmanager
+    async def admit(self, uid: str | None = None) -> AsyncIterator[None]:
+        index = None
+        if uid is not None:
+            index = self._indexes.get(uid)
+            if index is None:
+                index = self._indexes[uid] = _Index(
+                    asyncio.Semaphore(self.max_concurrent_per_index)
+                )
+
+        must_wait = self._semaphore.locked() or (index is not None and index.semaphore.locked())
+        if must_wait:
+            if index is not None and index.waiting >= self.index_queue_size:
+                self.rejected_index_queue_full += 1
+                raise AdmissionRejected(
+                    HTTP_429_TOO_MANY_REQUESTS,
+                    f"Too many requests are waiting for index {uid}",
+                    self.queue_timeout,
+                )
+            if self.waiting >= self.queue_size:
+                self.rejected_queue_full += 1
+                self._release_index(uid)
+                raise AdmissionRejected(
+                    HTTP_503_SERVICE_UNAVAILABLE,
+                    "Too many requests are waiting",
+                    self.queue_timeout,
+                )
+
+        start = monotonic()
+        acquired = False
+        if must_wait:
+            self._wait(index, 1)
+        try:
+            if must_wait:
+                await asyncio.wait_for(self._acquire(index), self.queue_timeout)
+            else:
+                # Free slots are taken without suspending, so there is no task to time out.
+                await self._acquire(index)
+            acquired = True
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise AdmissionRejected(
+                HTTP_503_SERVICE_UNAVAILABLE,
+                "Timed out waiting for a request slot",
+                self.queue_timeout,
+            ) from None
+        finally:
+            if must_wait:
+                self._wait(index, -1)
+            if not acquired:
+                self._release_index(uid)
+
+        if must_wait:
+            waited = monotonic() - start
+            self.waited += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        self.admitted += 1
+        self.active += 1
+        if index is not None:
+            index.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            if index is not None:
+                index.active -= 1
+                index.semaphore.release()
+                self._release_index(uid)
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            active=self.active,
+            waiting=self.waiting,
+            max_waiting=self.max_waiting,
+            admitted=self.admitted,
+            rejected_queue_full=self.rejected_queue_full,
+            rejected_index_queue_full=self.rejected_index_queue_full,
+            timed_out=self.timed_out,
+            average_wait_ms=self.wait_seconds / self.waited * 1000 if self.waited else 0.0,
+            max_wait_ms=self.max_wait_seconds * 1000,
+            indexes={
+                uid: IndexAdmissionStats(active=index.active, waiting=index.waiting)
+                for uid, index in self._indexes.items()
+            },
+        )
+
+    async def _acquire(self, index: _Index | None) -> None:
+        # The index slot is taken first so requests for a busy index don't hold global slots
+        # while they wait for it.
+        if index is None:
+            await self._semaphore.acquire()
+            return
+
+        await index.semaphore.acquire()
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            index.semaphore.release()
+            raise
+
+    def _wait(self, index: _Index | None, delta: int) -> None:
+        self.waiting += delta
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        if index is not None:
+            index.waiting += delta
+
+    def _release_index(self, uid: str | None) -> None:
+        if uid is None:
+            return
+
+        index = self._indexes.get(uid)
+        if index is not None and index.active == 0 and index.waiting == 0:
+            del self._indexes[uid]
+
+
+@lru_cache(maxsize=1)
+def get_admission_control() -> AdmissionControl | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_ADMISSION_CONTROL:
+        return None
+
+    return AdmissionControl(
+        max_concurrent=config.MEILISEARCH_MAX_CONCURRENT_REQUESTS,
+        max_concurrent_per_index=config.MEILISEARCH_MAX_CONCURRENT_REQUESTS_PER_INDEX,
+        queue_size=config.MEILISEARCH_ADMISSION_QUEUE_SIZE,
+        index_queue_size=config.MEILISEARCH_ADMISSION_INDEX_QUEUE_SIZE,
+        queue_timeout=config.MEILISEARCH_ADMISSION_QUEUE_TIMEOUT,
+    )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import HTTPException
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.models.task import TaskInfo
+
+from meilisearch_fastapi._responses import dumps
+from meilisearch_fastapi._streaming import send_documents
+
+
+class DocumentTooLarge(HTTPException):
+    def __init__(self, position: int, size: int, max_payload_size: int) -> None:
+        super().__init__(
+            413,
+            f"Document {position} is {size} bytes, more than the max payload size of "
+            f"{max_payload_size} bytes",
+        )
+
+
+def payload_batches(documents: Iterable[dict[str, Any]], max_payload_size: int) -> list[bytes]:
+    """Encodes documents into JSON array bodies of at most `max_payload_size` bytes each.
+
+    Each document is encoded once, and its size added to the running size of the current body,
+    which is joined from the encoded documents when the next one wouldn't fit.
+    """
+    batches = []
+    parts: list[bytes] = []
+    size = 2  # The array brackets.
+    for position, document in enumerate(documents):
+        encoded = dumps(document)
+        if len(encoded) + 2 > max_payload_size:
+            raise DocumentTooLarge(position, len(encoded), max_payload_size)
+
+        if parts and size + 1 + len(encoded) > max_payload_size:
+            batches.append(b"[" + b",".join(parts) + b"]")
+            parts, size = [], 2
+
+        size += len(encoded) + (1 if parts else 0)
+        parts.append(encoded)
+
+    if parts:
+        batches.append(b"[" + b",".join(parts) + b"]")
+
+    return batches
+
+
+async def send_auto_batches(
+    client: AsyncClient,
+    method: str,
+    uid: str,
+    documents: Iterable[dict[str, Any]],
+    max_payload_size: int,
+    primary_key: str | None = None,
+) -> list[TaskInfo]:
+    """Sends documents in as few requests as fit under `max_payload_size`, in order.
+
+    Every document is encoded before anything is sent, so a document too large for any batch is
+    rejected without part of the others having been added.
+    """
+    tasks = []
+    for batch in payload_batches(documents, max_payload_size):
+        tasks.append(
+            await send_documents(client, method, uid, batch, "application/json", primary_key)
+        )
+
+    return tasks
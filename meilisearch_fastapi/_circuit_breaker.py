@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+from httpx import HTTPStatusError, TransportError
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchApiError, MeilisearchCommunicationError
+
+
+def is_node_failure(error: BaseException) -> bool:
+    """Errors that mean the node is unhealthy, as opposed to a bad request."""
+    if isinstance(error, MeilisearchApiError):
+        return error.status_code >= 500
+
+    if isinstance(error, HTTPStatusError):
+        return error.response.status_code >= 500
+
+    return isinstance(error, (MeilisearchCommunicationError, TransportError, TimeoutError))
+
+
+class CircuitBreaker:
+    """Stops sending requests to a node after consecutive failures or slow responses.
+
+    While open requests fail fast. Once `reset_timeout` seconds have passed the next request
+    probes the node's health endpoint, and the breaker closes again if the probe succeeds.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        probe_timeout: float,
+        slow_call_duration: float | None = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self.slow_call_duration = slow_call_duration
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probe: asyncio.Task[bool] | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+
+        return max(0.0, self.opened_at + self.reset_timeout - monotonic())
+
+    def available(self) -> bool:
+        """True if the breaker is closed or is due to probe the node."""
+        return self.retry_after() == 0.0
+
+    async def allow(self, client: AsyncClient) -> bool:
+        if self.opened_at is None:
+            return True
+
+        if self.retry_after() > 0.0:
+            return False
+
+        # Requests that arrive while the probe is running wait on its result rather than
+        # probing again.
+        if self._probe is None:
+            self._probe = asyncio.create_task(self._run_probe(client))
+
+        return await asyncio.shield(self._probe)
+
+    def record(self, duration: float, error: BaseException | None = None) -> None:
+        slow = self.slow_call_duration is not None and duration > self.slow_call_duration
+
+        if (error is not None and is_node_failure(error)) or slow:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = monotonic()
+        else:
+            self.failures = 0
+
+    async def _run_probe(self, client: AsyncClient) -> bool:
+        try:
+            health = await asyncio.wait_for(client.health(), self.probe_timeout)
+            healthy = health.status == "available"
+        except Exception:
+            healthy = False
+
+        self._probe = None
+
+        if healthy:
+            self.failures = 0
+            self.opened_at = None
+        else:
+            self.opened_at = monotonic()
+
+        return healthy
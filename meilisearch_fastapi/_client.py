@@ -1,13 +1,301 @@
-from collections.abc import AsyncGenerator
+from __future__ import annotations
 
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from math import ceil
+from time import monotonic
+from typing import cast
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from httpx import (
+    AsyncBaseTransport,
+    AsyncByteStream,
+    AsyncHTTPTransport,
+    HTTPStatusError,
+    Limits,
+    Response,
+)
+from httpx import AsyncClient as HttpxAsyncClient
 from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk._http_requests import AsyncHttpRequests
+
+from meilisearch_fastapi._circuit_breaker import CircuitBreaker
+from meilisearch_fastapi._config import MeilisearchConfig, get_config
+from meilisearch_fastapi._facet_cache import get_facet_cache
+from meilisearch_fastapi._filters import get_filterable_attributes_cache
+from meilisearch_fastapi._index_tasks import get_index_tasks
+from meilisearch_fastapi._query_log import get_query_log
+from meilisearch_fastapi._rate_limit import get_rate_limiter
+from meilisearch_fastapi._search_cache import get_search_cache
+from meilisearch_fastapi._typeahead import get_typeahead_cache
+
+
+async def create_client(
+    config: MeilisearchConfig, url: str | None = None, node: MeilisearchNode | None = None
+) -> AsyncClient:
+    url = url or config.MEILISEARCH_URL
+    client = AsyncClient(
+        url=url, api_key=config.MEILISEARCH_API_KEY, timeout=config.MEILISEARCH_TIMEOUT
+    )
+
+    async def track_index_task(response: Response) -> None:
+        await _track_index_task(client, response)
+
+    transport: AsyncBaseTransport = AsyncHTTPTransport(
+        limits=Limits(
+            max_connections=config.MEILISEARCH_MAX_CONNECTIONS,
+            max_keepalive_connections=config.MEILISEARCH_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.MEILISEARCH_KEEPALIVE_EXPIRY,
+        )
+    )
+    if node is not None:
+        transport = _NodeTransport(node, transport)
+
+    # The SDK doesn't expose the connection pool limits or event hooks so its httpx client is
+    # swapped for one that has them set, and closed so its pool isn't left open.
+    http_client = HttpxAsyncClient(
+        base_url=url,
+        timeout=config.MEILISEARCH_TIMEOUT,
+        headers=client._headers,
+        transport=transport,
+        event_hooks={"response": [track_index_task]},
+    )
+    sdk_http_client = client.http_client
+    client.http_client = http_client
+    client._http_requests = AsyncHttpRequests(http_client, json_handler=client.json_handler)
+    await sdk_http_client.aclose()
+
+    return client
+
+
+async def _track_index_task(client: AsyncClient, response: Response) -> None:
+    """Reports every write enqueued on an index so anything cached for it can be dropped."""
+    if response.request.method == "GET" or response.status_code != 202:
+        return
+
+    base_path = client.http_client.base_url.path
+    parts = response.request.url.path[len(base_path) :].strip("/").split("/")
+    if len(parts) < 2 or parts[0] != "indexes":
+        return
+
+    await response.aread()
+    task_uid = response.json().get("taskUid")
+    if task_uid is not None:
+        get_index_tasks().enqueued(client, parts[1], task_uid)
+
+
+class _NodeTransport(AsyncBaseTransport):
+    """Tracks the requests actually sent to a node.
+
+    A request counts as outstanding from when it is sent until its response is closed, and its
+    outcome is recorded on the node's circuit breaker: transport errors, 5xx responses and errors
+    reading the body are failures, and the time to the response headers is the call duration.
+    This happens here rather than in the route dependencies so cache hits aren't counted, and
+    batched searches, background refreshes and streamed bodies are.
+    """
+
+    def __init__(self, node: MeilisearchNode, transport: AsyncBaseTransport) -> None:
+        self._node = node
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> Response:
+        self._node.outstanding += 1
+        start = monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException as e:
+            self._finished(monotonic() - start, e)
+            raise
+
+        duration = monotonic() - start
+        status_error = None
+        if response.status_code >= 500:
+            status_error = HTTPStatusError(
+                f"Server error {response.status_code}", request=request, response=response
+            )
+
+        def finished(error: BaseException | None) -> None:
+            self._finished(duration, error or status_error)
+
+        stream = cast(AsyncByteStream, response.stream)
+        response.stream = _ClosedCallbackStream(stream, finished)
+        return response
+
+    def _finished(self, duration: float, error: BaseException | None) -> None:
+        self._node.outstanding -= 1
+        # Cancelled requests say nothing about the node's health.
+        if error is None or isinstance(error, Exception):
+            self._node.breaker.record(duration, error)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class _ClosedCallbackStream(AsyncByteStream):
+    """Calls `on_close` once with the error raised while reading the body, if there was one."""
+
+    def __init__(
+        self, stream: AsyncByteStream, on_close: Callable[[BaseException | None], None]
+    ) -> None:
+        self._stream = stream
+        self._on_close: Callable[[BaseException | None], None] | None = on_close
+        self._error: BaseException | None = None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except BaseException as e:
+            self._error = e
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                on_close, self._on_close = self._on_close, None
+                on_close(self._error)
+
+
+class MeilisearchNode:
+    def __init__(self, url: str, breaker: CircuitBreaker) -> None:
+        self.url = url
+        self.breaker = breaker
+        self.outstanding = 0
+        self.client: AsyncClient
+
+    @classmethod
+    async def from_config(cls, config: MeilisearchConfig, url: str) -> MeilisearchNode:
+        breaker = CircuitBreaker(
+            failure_threshold=config.MEILISEARCH_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=config.MEILISEARCH_BREAKER_RESET_TIMEOUT,
+            probe_timeout=config.MEILISEARCH_BREAKER_PROBE_TIMEOUT,
+            slow_call_duration=config.MEILISEARCH_BREAKER_SLOW_CALL_DURATION,
+        )
+
+        node = cls(url, breaker)
+        node.client = await create_client(config, url, node)
+
+        return node
+
+
+class MeilisearchNodes:
+    """The primary Meilisearch node, which takes all writes, and the read replicas."""
+
+    def __init__(self, primary: MeilisearchNode, replicas: list[MeilisearchNode]) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self._next_reader = 0
+
+    @classmethod
+    async def from_config(cls, config: MeilisearchConfig) -> MeilisearchNodes:
+        primary = await MeilisearchNode.from_config(config, config.MEILISEARCH_URL)
+        replicas = [
+            await MeilisearchNode.from_config(config, url)
+            for url in config.MEILISEARCH_REPLICA_URLS
+        ]
+
+        return cls(primary, replicas)
+
+    @property
+    def readers(self) -> list[MeilisearchNode]:
+        return self.replicas or [self.primary]
+
+    def reader(self) -> MeilisearchNode:
+        """Picks the reader with the fewest outstanding requests.
+
+        Readers with an open circuit breaker are skipped unless they all are. The starting point
+        rotates so ties don't always land on the first replica.
+        """
+        readers = [node for node in self.readers if node.breaker.available()] or self.readers
+        self._next_reader = (self._next_reader + 1) % len(readers)
+        rotated = readers[self._next_reader :] + readers[: self._next_reader]
+
+        return min(rotated, key=lambda node: node.outstanding)
+
+    async def aclose(self) -> None:
+        for node in (self.primary, *self.replicas):
+            await node.client.aclose()
+
+
+@asynccontextmanager
+async def meilisearch_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Opens the shared Meilisearch clients on startup and closes them on shutdown.
+
+    Pass this as the `lifespan` of the FastAPI app, or enter it from an existing lifespan, so all
+    routes share a single connection pool per Meilisearch node.
+    """
+    nodes = await MeilisearchNodes.from_config(get_config())
+    app.state.meilisearch_nodes = nodes
+
+    try:
+        yield
+    finally:
+        del app.state.meilisearch_nodes
+        await get_index_tasks().aclose()
+        await get_facet_cache().aclose()
+        await get_typeahead_cache().aclose()
+        for closeable in (
+            get_search_cache(),
+            get_filterable_attributes_cache(),
+            get_rate_limiter(),
+        ):
+            if closeable is not None:
+                await closeable.aclose()
+        query_log = get_query_log()
+        if query_log is not None:
+            query_log.close()
+            get_query_log.cache_clear()
+        await nodes.aclose()
+
+
+async def get_nodes(app: FastAPI) -> MeilisearchNodes:
+    nodes: MeilisearchNodes | None = getattr(app.state, "meilisearch_nodes", None)
+
+    # Apps that don't use the lifespan still get shared clients, they just aren't closed on
+    # shutdown.
+    if nodes is None:
+        created = await MeilisearchNodes.from_config(get_config())
+        # Another request may have created them while these were being set up.
+        nodes = getattr(app.state, "meilisearch_nodes", None)
+        if nodes is None:
+            nodes = app.state.meilisearch_nodes = created
+        else:
+            await created.aclose()
+
+    return nodes
+
+
+async def _use_node(node: MeilisearchNode) -> AsyncClient:
+    """The node's client, or a 503 if its circuit breaker is open.
+
+    Outcomes are recorded on the breaker by the node's transport as requests are made.
+    """
+    if not await node.breaker.allow(node.client):
+        raise HTTPException(
+            503,
+            "Meilisearch is unavailable",
+            headers={"Retry-After": str(ceil(node.breaker.retry_after()))},
+        )
+
+    return node.client
+
+
+async def meilisearch_client(request: Request) -> AsyncClient:
+    """Client for the primary node. Used by any route that writes."""
+    return await _use_node((await get_nodes(request.app)).primary)
+
+
+async def meilisearch_local_client(request: Request) -> AsyncClient:
+    """Client for the primary node that is returned even while its breaker is open.
 
-from meilisearch_fastapi._config import get_config
+    For routes like generating tenant tokens that don't call Meilisearch.
+    """
+    return (await get_nodes(request.app)).primary.client
 
 
-async def meilisearch_client() -> AsyncGenerator[AsyncClient, None]:
-    config = get_config()
-    async with AsyncClient(
-        url=config.MEILISEARCH_URL, api_key=config.MEILISEARCH_API_KEY
-    ) as client:
-        yield client
+async def meilisearch_read_client(request: Request) -> AsyncClient:
+    """Client for the least busy read replica, or the primary if there are no replicas."""
+    return await _use_node((await get_nodes(request.app)).reader())
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import gzip
+from collections.abc import Callable
+from functools import lru_cache
+from time import perf_counter
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi.models.compression import CompressionStats
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Compressing bigger bodies than this on the event loop would hold up other requests.
+_THREADPOOL_SIZE = 64 * 1024
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """Parses an `Accept-Encoding` header into each coding's quality."""
+    encodings = {}
+    for part in header.split(","):
+        coding, *params = (p.strip() for p in part.split(";"))
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[coding.lower()] = quality
+
+    return encodings
+
+
+class Compressor:
+    """Compresses JSON responses with the best coding both the client and the server support.
+
+    zstd and brotli are used when `zstandard` and `brotli` are installed, gzip otherwise. Bodies
+    smaller than `min_size` are sent as they are since compressing them saves next to nothing.
+    """
+
+    def __init__(
+        self, min_size: int, gzip_level: int, brotli_quality: int, zstd_level: int
+    ) -> None:
+        self.min_size = min_size
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.encodings: dict[str, int] = {}
+        self._compressors: dict[str, Callable[[bytes], bytes]] = {}
+
+        if zstandard is not None:
+            # Compressors aren't thread safe, and big bodies are compressed in the threadpool.
+            self._compressors["zstd"] = lambda body: zstandard.ZstdCompressor(
+                level=zstd_level
+            ).compress(body)
+        if brotli is not None:
+            self._compressors["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+        self._compressors["gzip"] = lambda body: gzip.compress(body, gzip_level, mtime=0)
+
+    def choose(self, accept_encoding: str) -> str | None:
+        accepted = accepted_encodings(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best = None
+        best_quality = 0.0
+        for encoding in self._compressors:
+            quality = accepted.get(encoding, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+
+        return best
+
+    async def compress(self, request: Request, response: Response) -> Response:
+        body = getattr(response, "body", None)
+        if (
+            not isinstance(body, bytes)
+            or len(body) < self.min_size
+            or "content-encoding" in response.headers
+            or not _compressible(response.media_type)
+        ):
+            return response
+
+        response.headers.append("Vary", "Accept-Encoding")
+        encoding = self.choose(request.headers.get("accept-encoding", ""))
+        if encoding is None:
+            return response
+
+        compress = self._compressors[encoding]
+        start = perf_counter()
+        if len(body) > _THREADPOOL_SIZE:
+            compressed = await run_in_threadpool(compress, body)
+        else:
+            compressed = compress(body)
+        elapsed = perf_counter() - start
+
+        self.responses += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        self.seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+        response.body = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        # The compressed body isn't byte for byte the one the strong ETag was computed from.
+        etag = response.headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            response.headers["ETag"] = f"W/{etag}"
+
+        return response
+
+    def stats(self) -> CompressionStats:
+        return CompressionStats(
+            encodings=list(self._compressors),
+            responses=self.responses,
+            responses_by_encoding=self.encodings,
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            ratio=self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+            average_compression_ms=self.seconds / self.responses * 1000 if self.responses else 0.0,
+            max_compression_ms=self.max_seconds * 1000,
+        )
+
+
+def _compressible(media_type: str | None) -> bool:
+    return media_type is not None and (
+        media_type.startswith("text/") or media_type.endswith(("json", "csv"))
+    )
+
+
+@lru_cache(maxsize=1)
+def get_compressor() -> Compressor | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_COMPRESSION:
+        return None
+
+    return Compressor(
+        min_size=config.MEILISEARCH_COMPRESSION_MIN_SIZE,
+        gzip_level=config.MEILISEARCH_COMPRESSION_GZIP_LEVEL,
+        brotli_quality=config.MEILISEARCH_COMPRESSION_BROTLI_QUALITY,
+        zstd_level=config.MEILISEARCH_COMPRESSION_ZSTD_LEVEL,
+    )
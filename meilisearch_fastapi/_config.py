@@ -11,7 +11,57 @@ class MeilisearchConfig(BaseSettings):
     MEILI_HTTP_ADDR: str
     MEILI_HTTPS_URL: bool = False
     MEILISEARCH_URL: str = "http://localhost:7700"
+    MEILI_REPLICA_HTTP_ADDRS: list[str] = []
+    MEILISEARCH_REPLICA_URLS: list[str] = []
     MEILISEARCH_API_KEY: str | None = Field(None, validation_alias="MEILI_MASTER_KEY")
+    MEILISEARCH_TIMEOUT: int | None = None
+    MEILISEARCH_MAX_CONNECTIONS: int = 100
+    MEILISEARCH_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    MEILISEARCH_KEEPALIVE_EXPIRY: float = 5.0
+    MEILISEARCH_BREAKER_FAILURE_THRESHOLD: int = 5
+    MEILISEARCH_BREAKER_SLOW_CALL_DURATION: float | None = None
+    MEILISEARCH_BREAKER_RESET_TIMEOUT: float = 10.0
+    MEILISEARCH_BREAKER_PROBE_TIMEOUT: float = 2.0
+    MEILISEARCH_SEARCH_COALESCING: bool = True
+    MEILISEARCH_SEARCH_CACHE: bool = False
+    MEILISEARCH_SEARCH_CACHE_TTL: float = 60.0
+    MEILISEARCH_SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    MEILISEARCH_SEARCH_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MEILISEARCH_CACHE_MAX_STALE: float = 0.0
+    MEILISEARCH_COMPRESSION: bool = True
+    MEILISEARCH_COMPRESSION_MIN_SIZE: int = 1024
+    MEILISEARCH_COMPRESSION_GZIP_LEVEL: int = 4
+    MEILISEARCH_COMPRESSION_BROTLI_QUALITY: int = 4
+    MEILISEARCH_COMPRESSION_ZSTD_LEVEL: int = 3
+    MEILISEARCH_ADMISSION_CONTROL: bool = False
+    MEILISEARCH_MAX_CONCURRENT_REQUESTS: int = 100
+    MEILISEARCH_MAX_CONCURRENT_REQUESTS_PER_INDEX: int = 25
+    MEILISEARCH_ADMISSION_QUEUE_SIZE: int = 200
+    MEILISEARCH_ADMISSION_INDEX_QUEUE_SIZE: int = 50
+    MEILISEARCH_ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    MEILISEARCH_RATE_LIMITS: dict[str, tuple[float, int]] = {}
+    MEILISEARCH_RATE_LIMIT_HEADER: str = "Authorization"
+    MEILISEARCH_RATE_LIMIT_REDIS_URL: str | None = None
+    MEILISEARCH_RATE_LIMIT_BACKEND: str | None = None
+    MEILISEARCH_QUERY_LOG: str | None = None
+    MEILISEARCH_QUERY_LOG_SAMPLE_RATE: float = 1.0
+    MEILISEARCH_STREAM_CHUNK_SIZE: int = 8 * 1024 * 1024
+    MEILISEARCH_MAX_PAYLOAD_SIZE: int = 100_000_000
+    MEILISEARCH_SEARCH_BATCHING: bool = False
+    MEILISEARCH_SEARCH_BATCH_WINDOW: float = 0.002
+    MEILISEARCH_SEARCH_BATCH_MAX_SIZE: int = 50
+    MEILISEARCH_PROJECTIONS: dict[str, dict[str, list[str]]] = {}
+    MEILISEARCH_FILTER_VALIDATION: bool = True
+    MEILISEARCH_FILTERABLE_ATTRIBUTES_TTL: float = 60.0
+    MEILISEARCH_FACET_CACHE_MAX_ENTRIES: int = 256
+    MEILISEARCH_FACET_CACHE_IDLE_TTL: float = 600.0
+    MEILISEARCH_FACET_CACHE_TTL: float = 60.0
+    MEILISEARCH_TYPEAHEAD_WINDOW: int = 200
+    MEILISEARCH_TYPEAHEAD_TTL: float = 30.0
+    MEILISEARCH_TYPEAHEAD_MAX_ENTRIES: int = 1024
+    MEILISEARCH_TENANT_TOKEN_CACHE: bool = True
+    MEILISEARCH_TENANT_TOKEN_MIN_REMAINING: float = 300.0
+    MEILISEARCH_TENANT_TOKEN_CACHE_MAX_ENTRIES: int = 10000
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="allow"
     )
@@ -29,11 +79,12 @@ class MeilisearchConfig(BaseSettings):
         ):
             https = True
 
-        if https:
-            values["MEILISEARCH_URL"] = f"https://{values.get('MEILI_HTTP_ADDR')}"
-            return values
+        scheme = "https" if https else "http"
+        values["MEILISEARCH_URL"] = f"{scheme}://{values.get('MEILI_HTTP_ADDR')}"
+        values["MEILISEARCH_REPLICA_URLS"] = [
+            f"{scheme}://{addr}" for addr in values.get("MEILI_REPLICA_HTTP_ADDRS") or []
+        ]
 
-        values["MEILISEARCH_URL"] = f"http://{values.get('MEILI_HTTP_ADDR')}"
         return values
 
 
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any
+
+from meilisearch_fastapi._filters import canonical_filter, quote_attribute, quote_value
+from meilisearch_fastapi.models.search_parameters import CursorSearchParameters
+
+
+class CursorError(ValueError):
+    pass
+
+
+@dataclass
+class Cursor:
+    """Position after the last hit of a page.
+
+    `values` are the last hit's values for each sort attribute and `seen` the primary keys of the
+    hits already returned that share those values, so ties aren't returned twice.
+    """
+
+    fingerprint: str
+    primary_key: str
+    values: list[Any]
+    seen: list[Any]
+
+    def encode(self) -> str:
+        data = json.dumps(
+            {"f": self.fingerprint, "p": self.primary_key, "v": self.values, "s": self.seen},
+            separators=(",", ":"),
+        )
+
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> Cursor:
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return cls(data["f"], data["p"], data["v"], data["s"])
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise CursorError("Invalid cursor") from e
+
+
+def search_fingerprint(cursor_search_parameters: CursorSearchParameters) -> str:
+    """Identifies the search a cursor belongs to, so it can't be used to page another one."""
+    data = json.dumps(
+        [
+            cursor_search_parameters.uid,
+            cursor_search_parameters.query,
+            canonical_filter(cursor_search_parameters.filter),
+            cursor_search_parameters.sort,
+        ],
+        separators=(",", ":"),
+    )
+
+    return blake2b(data.encode(), digest_size=8).hexdigest()
+
+
+def sort_attributes(sort: list[str] | None) -> list[tuple[str, bool]]:
+    """Splits `attribute:asc` and `attribute:desc` sort rules into attributes and directions."""
+    if not sort:
+        raise CursorError("Cursor pagination needs a `sort`")
+
+    attributes = []
+    for rule in sort:
+        attribute, _, direction = rule.rpartition(":")
+        if not attribute or direction not in ("asc", "desc") or attribute.startswith("_geo"):
+            raise CursorError(
+                f"Cursor pagination can't be used with the sort rule `{rule}`, only "
+                "`attribute:asc` and `attribute:desc` rules are supported"
+            )
+        attributes.append((attribute, direction == "asc"))
+
+    return attributes
+
+
+# Built in ranking rules that only order hits by how they match the query, so they tie for every
+# hit of a search without one.
+_QUERY_RANKING_RULES = {"words", "typo", "proximity", "attribute", "exactness"}
+
+
+def check_ranking_rules(ranking_rules: list[str] | None, query: str | None) -> None:
+    """Raises a `CursorError` unless the `sort` of a search decides the order of its hits.
+
+    Any ranking rule before `sort` orders the hits first, and with a query so do the built in ones,
+    which would make the keyset filter skip or repeat hits between pages.
+    """
+    rules = ranking_rules or []
+    if "sort" not in rules:
+        raise CursorError("Cursor pagination needs the `sort` ranking rule on the index")
+
+    before = rules[: rules.index("sort")]
+    custom = [rule for rule in before if rule not in _QUERY_RANKING_RULES]
+    if custom:
+        raise CursorError(
+            "Cursor pagination can't be used while the ranking rules "
+            f"`{', '.join(custom)}` come before `sort`"
+        )
+    if before and query and query.strip():
+        raise CursorError(
+            "Cursor pagination can only be used with a query when `sort` is the first ranking rule"
+        )
+
+
+def added_attributes(requested: list[str], attributes: list[str]) -> list[str]:
+    """The attributes that retrieving `requested` wouldn't already return."""
+    added = []
+    for attribute in attributes:
+        parts = attribute.split(".")
+        prefixes = {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+        if not prefixes & set(requested) and attribute not in added:
+            added.append(attribute)
+
+    return added
+
+
+def drop_attributes(hit: dict[str, Any], attributes: list[str]) -> dict[str, Any]:
+    """A copy of the hit without `attributes`, which may be dotted paths into nested objects.
+
+    Objects that are left empty are dropped as well, since they only held dropped attributes.
+    """
+    hit = dict(hit)
+    for attribute in attributes:
+        _drop(hit, attribute.split("."))
+
+    return hit
+
+
+def _drop(value: dict[str, Any], parts: list[str]) -> None:
+    if len(parts) == 1:
+        value.pop(parts[0], None)
+        return
+
+    child = value.get(parts[0])
+    if not isinstance(child, dict):
+        return
+
+    child = value[parts[0]] = dict(child)
+    _drop(child, parts[1:])
+    if not child:
+        del value[parts[0]]
+
+
+def hit_values(hit: dict[str, Any], attributes: list[str]) -> list[Any] | None:
+    """The hit's value for each attribute, or `None` if it is missing any of them."""
+    values = []
+    for attribute in attributes:
+        value: Any = hit
+        for part in attribute.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return None
+            value = value[part]
+
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            return None
+        values.append(value)
+
+    return values
+
+
+def keyset_filter(sort: list[tuple[str, bool]], cursor: Cursor) -> str:
+    """Filter for the hits that come after the cursor in the sort order.
+
+    For a sort on `a:asc, b:desc` that is `a > va OR (a = va AND b < vb) OR (a = va AND b = vb
+    AND pk NOT IN [seen])`.
+    """
+    branches = []
+    for i, (attribute, ascending) in enumerate(sort):
+        conditions = [
+            f"{quote_attribute(a)} = {_value(v)}" for (a, _), v in zip(sort[:i], cursor.values)
+        ]
+        conditions.append(
+            f"{quote_attribute(attribute)} {'>' if ascending else '<'} {_value(cursor.values[i])}"
+        )
+        branches.append(" AND ".join(conditions))
+
+    if cursor.seen:
+        ties = [f"{quote_attribute(a)} = {_value(v)}" for (a, _), v in zip(sort, cursor.values)]
+        seen = ", ".join(_value(s) for s in cursor.seen)
+        ties.append(f"{quote_attribute(cursor.primary_key)} NOT IN [{seen}]")
+        branches.append(" AND ".join(ties))
+
+    return " OR ".join(f"({branch})" for branch in branches)
+
+
+def _value(value: Any) -> str:
+    return str(value) if isinstance(value, (int, float)) else quote_value(str(value))
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from pydantic import BaseModel
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from meilisearch_fastapi._responses import FastJSONResponse
+
+
+def make_etag(data: bytes) -> str:
+    return f'"{blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's `If-None-Match` header lists the ETag.
+
+    `If-None-Match` uses the weak comparison, so a `W/` prefix on the client's tags is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def conditional_response(request: Request, content: Any, etag: str | None = None) -> Response:
+    """Renders the content with an ETag, or returns a 304 if the client already has it.
+
+    The content is rendered with the response class of the route handling the request. Without an
+    `etag` one is computed from the rendered body, so the content still has to be rendered, but
+    nothing is sent back when it hasn't changed.
+    """
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag)
+
+    if isinstance(content, BaseModel):
+        content = content.model_dump(mode="json", by_alias=True)
+
+    response = _response_class(request)(content)
+    if etag is None:
+        etag = make_etag(response.body)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    response.headers["ETag"] = etag
+
+    return response
+
+
+def _response_class(request: Request) -> type[Response]:
+    route = request.scope.get("route")
+    response_class = getattr(route, "response_class", FastJSONResponse)
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+
+    return response_class
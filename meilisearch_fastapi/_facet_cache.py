@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from time import monotonic
+
+from meilisearch_python_sdk import AsyncClient
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._filters import canonical_filter
+from meilisearch_fastapi._index_tasks import IndexTasks, get_index_tasks
+from meilisearch_fastapi._singleflight import SingleFlight
+from meilisearch_fastapi.models.search_cache import FacetCacheStats
+from meilisearch_fastapi.models.search_parameters import FacetSearchParameters
+from meilisearch_fastapi.models.search_results import FacetSearchResults
+
+
+def facet_cache_key(facet_search_parameters: FacetSearchParameters) -> tuple[str, str, str]:
+    return (
+        facet_search_parameters.uid,
+        ",".join(sorted(set(facet_search_parameters.facets))),
+        canonical_filter(facet_search_parameters.filter),
+    )
+
+
+@dataclass
+class _Entry:
+    client: AsyncClient
+    parameters: FacetSearchParameters
+    results: FacetSearchResults
+    last_read: float
+    fetched_at: float
+
+
+class FacetCache:
+    """Cache of facet distributions that is refreshed in the background instead of on reads.
+
+    Once a write on an index has been processed, every cached distribution for the index is
+    fetched again in the background and the old one is served until the new one arrives.
+    Writes made through other processes aren't seen, so a distribution that is read after it is
+    `ttl` seconds old is refreshed in the background the same way. Distributions that haven't been
+    read for `idle_ttl` seconds are dropped instead of refreshed.
+    """
+
+    def __init__(
+        self, max_entries: int, idle_ttl: float, index_tasks: IndexTasks, ttl: float = 60.0
+    ) -> None:
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.ttl = ttl
+        self.index_tasks = index_tasks
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._flights: SingleFlight[FacetSearchResults] = SingleFlight()
+        self._refreshing: dict[tuple[str, str, str], asyncio.Task[None]] = {}
+
+        index_tasks.add_listener(self.refresh)
+
+    async def get(
+        self, client: AsyncClient, facet_search_parameters: FacetSearchParameters
+    ) -> FacetSearchResults:
+        key = facet_cache_key(facet_search_parameters)
+        entry = self._entries.get(key)
+
+        now = monotonic()
+        if entry is not None and entry.last_read + self.idle_ttl > now:
+            entry.last_read = now
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry.fetched_at + self.ttl <= now:
+                self._start_refresh(key, entry)
+            return entry.results
+
+        self.misses += 1
+        generation = self.index_tasks.generation(facet_search_parameters.uid)
+        results = await self._flights.do(
+            (key, generation), lambda: _facet_search(client, facet_search_parameters)
+        )
+        self._set(key, client, facet_search_parameters, results, generation)
+
+        return results
+
+    def refresh(self, uid: str) -> None:
+        # Writes that are still being processed would only be refreshed again when they finish.
+        if self.index_tasks.pending(uid):
+            return
+
+        now = monotonic()
+        for key, entry in list(self._entries.items()):
+            if entry.parameters.uid != uid:
+                continue
+
+            if entry.last_read + self.idle_ttl <= now:
+                del self._entries[key]
+                continue
+
+            self._start_refresh(key, entry)
+
+    def stats(self) -> FacetCacheStats:
+        return FacetCacheStats(
+            entries=len(self._entries),
+            hits=self.hits,
+            misses=self.misses,
+            refreshes=self.refreshes,
+        )
+
+    async def aclose(self) -> None:
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start_refresh(self, key: tuple[str, str, str], entry: _Entry) -> None:
+        if key in self._refreshing:
+            return
+
+        task = asyncio.create_task(self._refresh(key, entry))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: tuple[str, str, str], entry: _Entry) -> None:
+        generation = self.index_tasks.generation(entry.parameters.uid)
+        try:
+            results = await _facet_search(entry.client, entry.parameters)
+        except Exception:
+            # Better to drop the distribution than to keep serving one that is out of date.
+            self._entries.pop(key, None)
+            return
+
+        if key not in self._entries:
+            return
+
+        self.refreshes += 1
+        self._set(key, entry.client, entry.parameters, results, generation, entry.last_read)
+
+    def _set(
+        self,
+        key: tuple[str, str, str],
+        client: AsyncClient,
+        facet_search_parameters: FacetSearchParameters,
+        results: FacetSearchResults,
+        generation: int,
+        last_read: float | None = None,
+    ) -> None:
+        # A write enqueued while the search was running will refresh the distribution once it's
+        # processed, so there is no point keeping what may be an older one.
+        if generation != self.index_tasks.generation(facet_search_parameters.uid):
+            return
+
+        now = monotonic()
+        self._entries[key] = _Entry(client, facet_search_parameters, results, last_read or now, now)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+async def _facet_search(
+    client: AsyncClient, facet_search_parameters: FacetSearchParameters
+) -> FacetSearchResults:
+    index = client.index(facet_search_parameters.uid)
+    results = await index.search(
+        limit=0, filter=facet_search_parameters.filter, facets=facet_search_parameters.facets
+    )
+
+    return FacetSearchResults(
+        facet_distribution=results.facet_distribution or {},
+        estimated_total_hits=results.estimated_total_hits or 0,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_facet_cache() -> FacetCache:
+    config = get_config()
+
+    return FacetCache(
+        max_entries=config.MEILISEARCH_FACET_CACHE_MAX_ENTRIES,
+        idle_ttl=config.MEILISEARCH_FACET_CACHE_IDLE_TTL,
+        index_tasks=get_index_tasks(),
+        ttl=config.MEILISEARCH_FACET_CACHE_TTL,
+    )
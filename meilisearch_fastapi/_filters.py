@@ -0,0 +1,511 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from time import monotonic
+from typing import Any, NoReturn, Union
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchApiError
+from meilisearch_python_sdk.models.settings import FilterableAttributes
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._index_tasks import IndexTasks, get_index_tasks
+from meilisearch_fastapi._revalidation import Revalidator
+from meilisearch_fastapi._singleflight import SingleFlight
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<operator>!=|>=|<=|=|>|<)
+        |(?P<punctuation>[()\[\],])
+        |(?P<word>(?:[^\s()\[\],=!<>"']|!(?!=))+)
+    )""",
+    re.VERBOSE,
+)
+_COMPARISONS = {"=": "equality", "!=": "equality", ">": "comparison", ">=": "comparison"}
+_COMPARISONS |= {"<": "comparison", "<=": "comparison"}
+_GEO_FUNCTIONS = {"_geoRadius", "_geoBoundingBox", "_geoPolygon"}
+_SIMPLE_WORD = re.compile(r"[\w.\-]+")
+
+
+class FilterError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Condition:
+    attribute: str
+    feature: str | None
+    text: str
+
+
+@dataclass(frozen=True)
+class Group:
+    operator: str
+    operands: tuple[FilterNode, ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: FilterNode
+
+
+FilterNode = Union[Condition, Group, Not]
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str
+    value: str
+    position: int
+
+
+def parse_filter(expression: str | list[Any] | None) -> FilterNode | None:
+    """Parses a filter in either the string or the array syntax Meilisearch accepts.
+
+    Raises a `FilterError` describing the problem if the filter isn't valid. Empty filters parse to
+    `None`.
+    """
+    if expression is None:
+        return None
+
+    if isinstance(expression, str):
+        return _Parser(expression).parse()
+
+    # In the array syntax the outer list is ANDed together and inner lists are ORed.
+    operands = []
+    for item in expression:
+        if isinstance(item, list):
+            inner = [node for node in (parse_filter(i) for i in item) if node is not None]
+            if inner:
+                operands.append(_group("OR", inner))
+        elif isinstance(item, str):
+            node = parse_filter(item)
+            if node is not None:
+                operands.append(node)
+        else:
+            raise FilterError(f"Invalid filter `{item!r}`: expected a string or an array")
+
+    return _group("AND", operands) if operands else None
+
+
+def canonical_filter(expression: str | list[Any] | None) -> str:
+    """A normalized form of the filter where equivalent filters compare equal, for cache keys.
+
+    Spacing, quoting, keyword case, the string or array syntax, and the order of ANDed or ORed
+    conditions don't matter. Filters that can't be parsed fall back to their JSON form.
+    """
+    try:
+        node = parse_filter(expression)
+    except FilterError:
+        return json.dumps(expression, separators=(",", ":"))
+
+    return _render(node) if node is not None else ""
+
+
+def check_filterable(
+    node: FilterNode, filterable_attributes: list[str] | list[FilterableAttributes] | None
+) -> None:
+    """Raises a `FilterError` if the filter uses an attribute that isn't filterable."""
+    for condition in _conditions(node):
+        if not _is_filterable(condition, filterable_attributes or []):
+            available = ", ".join(
+                a if isinstance(a, str) else ", ".join(a.attribute_patterns)
+                for a in filterable_attributes or []
+            )
+            raise FilterError(
+                f"Attribute `{condition.attribute}` is not filterable. Available filterable "
+                f"attributes are: `{available}`."
+            )
+
+
+def _is_filterable(
+    condition: Condition, filterable_attributes: list[str] | list[FilterableAttributes]
+) -> bool:
+    # Making an object filterable makes all of its fields filterable.
+    parts = condition.attribute.split(".")
+    names = {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+
+    for filterable in filterable_attributes:
+        if isinstance(filterable, str):
+            if filterable in names:
+                return True
+            continue
+
+        if not any(fnmatchcase(n, p) for n in names for p in filterable.attribute_patterns):
+            continue
+
+        if condition.feature is None or getattr(filterable.features.filter, condition.feature):
+            return True
+
+    return False
+
+
+def _conditions(node: FilterNode) -> Iterator[Condition]:
+    if isinstance(node, Condition):
+        yield node
+    elif isinstance(node, Not):
+        yield from _conditions(node.operand)
+    else:
+        for operand in node.operands:
+            yield from _conditions(operand)
+
+
+def _group(operator: str, operands: list[FilterNode]) -> FilterNode:
+    flattened: list[FilterNode] = []
+    for operand in operands:
+        if isinstance(operand, Group) and operand.operator == operator:
+            flattened.extend(operand.operands)
+        else:
+            flattened.append(operand)
+
+    return flattened[0] if len(flattened) == 1 else Group(operator, tuple(flattened))
+
+
+def _render(node: FilterNode) -> str:
+    if isinstance(node, Condition):
+        return node.text
+    if isinstance(node, Not):
+        return f"NOT {_render_operand(node.operand)}"
+
+    return f" {node.operator} ".join(sorted(_render_operand(o) for o in node.operands))
+
+
+def _render_operand(node: FilterNode) -> str:
+    return f"({_render(node)})" if isinstance(node, Group) else _render(node)
+
+
+def quote_value(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def quote_attribute(value: str) -> str:
+    return value if _SIMPLE_WORD.fullmatch(value) else quote_value(value)
+
+
+class _Parser:
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = self._tokenize(expression)
+        self.position = 0
+
+    def parse(self) -> FilterNode | None:
+        if not self.tokens:
+            return None
+
+        node = self._or()
+        if self._peek() is not None:
+            self._fail("expected `AND`, `OR`, or the end of the filter")
+
+        return node
+
+    def _tokenize(self, expression: str) -> list[_Token]:
+        tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN.match(expression, position)
+            if match is None or match.lastgroup is None:
+                raise FilterError(
+                    f"Invalid filter `{expression}`: unexpected character at position "
+                    f"{position + 1}"
+                )
+
+            value = match.group(match.lastgroup)
+            if match.lastgroup == "string":
+                value = re.sub(r"\\(.)", r"\1", value[1:-1])
+            tokens.append(_Token(match.lastgroup, value, match.start(match.lastgroup)))
+            position = match.end()
+
+        return tokens
+
+    def _or(self) -> FilterNode:
+        operands = [self._and()]
+        while self._keyword("OR"):
+            operands.append(self._and())
+
+        return _group("OR", operands)
+
+    def _and(self) -> FilterNode:
+        operands = [self._not()]
+        while self._keyword("AND"):
+            operands.append(self._not())
+
+        return _group("AND", operands)
+
+    def _not(self) -> FilterNode:
+        if self._keyword("NOT"):
+            return Not(self._not())
+
+        if self._punctuation("("):
+            node = self._or()
+            if not self._punctuation(")"):
+                self._fail("expected `)`")
+            return node
+
+        return self._condition()
+
+    def _condition(self) -> FilterNode:
+        token = self._next("expected an attribute")
+        if token.kind not in ("word", "string"):
+            self._fail("expected an attribute", token)
+
+        if token.kind == "word" and token.value in _GEO_FUNCTIONS:
+            return self._geo(token)
+
+        attribute = token.value
+        name = quote_attribute(attribute)
+
+        operator = self._peek()
+        if operator is not None and operator.kind == "operator":
+            self.position += 1
+            value = self._value()
+            return Condition(
+                attribute, _COMPARISONS[operator.value], f"{name} {operator.value} {value}"
+            )
+
+        negated = self._keyword("NOT")
+        prefix = f"{name} NOT" if negated else name
+
+        if self._keyword("IN"):
+            return Condition(attribute, "equality", f"{prefix} IN [{self._values()}]")
+        if self._keyword("EXISTS"):
+            return Condition(attribute, "equality", f"{prefix} EXISTS")
+        if self._keyword("CONTAINS"):
+            return Condition(attribute, None, f"{prefix} CONTAINS {self._value()}")
+        if self._keyword("STARTS"):
+            if not self._keyword("WITH"):
+                self._fail("expected `WITH`")
+            return Condition(attribute, None, f"{prefix} STARTS WITH {self._value()}")
+        if negated:
+            self._fail("expected `IN`, `EXISTS`, `CONTAINS`, or `STARTS WITH`")
+
+        if self._keyword("IS"):
+            prefix = f"{name} IS NOT" if self._keyword("NOT") else f"{name} IS"
+            for keyword in ("NULL", "EMPTY"):
+                if self._keyword(keyword):
+                    return Condition(attribute, "equality", f"{prefix} {keyword}")
+            self._fail("expected `NULL` or `EMPTY`")
+
+        start = self._value(
+            "expected an operator like `=`, `!=`, `>`, `>=`, `<`, `<=`, `TO`, `IN`, `EXISTS`, or "
+            "`IS`"
+        )
+        if not self._keyword("TO"):
+            self._fail("expected `TO`")
+
+        return Condition(attribute, "comparison", f"{name} {start} TO {self._value()}")
+
+    def _geo(self, token: _Token) -> Condition:
+        if not self._punctuation("("):
+            self._fail("expected `(`")
+
+        arguments: list[str] = []
+        shapes: list[int] = []
+        while True:
+            if self._punctuation("["):
+                numbers = self._numbers("]")
+                arguments.append(f"[{', '.join(numbers)}]")
+                shapes.append(len(numbers))
+            else:
+                arguments.append(self._number())
+                shapes.append(0)
+            if self._punctuation(")"):
+                break
+            if not self._punctuation(","):
+                self._fail("expected `,` or `)`")
+
+        if token.value == "_geoRadius":
+            valid = shapes in ([0, 0, 0], [0, 0, 0, 0])
+        elif token.value == "_geoBoundingBox":
+            valid = shapes == [2, 2]
+        else:
+            valid = len(shapes) >= 3 and all(shape == 2 for shape in shapes)
+        if not valid:
+            self._fail(f"invalid arguments for `{token.value}`", token)
+
+        rendered = ", ".join(arguments)
+
+        return Condition("_geo", None, f"{token.value}({rendered})")
+
+    def _numbers(self, end: str) -> list[str]:
+        numbers = [self._number()]
+        while self._punctuation(","):
+            numbers.append(self._number())
+        if not self._punctuation(end):
+            self._fail(f"expected `{end}`")
+
+        return numbers
+
+    def _number(self) -> str:
+        token = self._next("expected a number")
+        try:
+            float(token.value)
+        except ValueError:
+            self._fail("expected a number", token)
+
+        return token.value
+
+    def _values(self) -> str:
+        if not self._punctuation("["):
+            self._fail("expected `[`")
+
+        values: list[str] = []
+        # Meilisearch allows a trailing comma before the closing bracket.
+        while not self._punctuation("]"):
+            values.append(self._value())
+            if not self._punctuation(","):
+                if not self._punctuation("]"):
+                    self._fail("expected `,` or `]`")
+                break
+
+        return ", ".join(values)
+
+    def _value(self, expected: str = "expected a value") -> str:
+        token = self._peek()
+        if token is None or token.kind not in ("word", "string"):
+            self._fail(expected)
+
+        self.position += 1
+
+        return quote_value(token.value)
+
+    def _keyword(self, keyword: str) -> bool:
+        token = self._peek()
+        if token is not None and token.kind == "word" and token.value.upper() == keyword:
+            self.position += 1
+            return True
+
+        return False
+
+    def _punctuation(self, value: str) -> bool:
+        token = self._peek()
+        if token is not None and token.kind == "punctuation" and token.value == value:
+            self.position += 1
+            return True
+
+        return False
+
+    def _peek(self) -> _Token | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self, expected: str) -> _Token:
+        token = self._peek()
+        if token is None:
+            self._fail(expected)
+
+        self.position += 1
+
+        return token
+
+    def _fail(self, expected: str, token: _Token | None = None) -> NoReturn:
+        token = token or self._peek()
+        where = f"at position {token.position + 1}" if token else "at the end of the filter"
+
+        raise FilterError(f"Invalid filter `{self.expression}`: {expected} {where}")
+
+
+class FilterableAttributesCache:
+    """Cache of each index's filterable attributes, used to check filters before searching.
+
+    An index's entry is dropped when a write is enqueued on it and again when the write finishes.
+    For up to `max_stale` seconds after it expires it is still used while it is fetched again in
+    the background. Writes made through other processes aren't seen, so cached attributes are read
+    again before a filter is rejected.
+    """
+
+    def __init__(self, ttl: float, index_tasks: IndexTasks, max_stale: float = 0.0) -> None:
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.index_tasks = index_tasks
+        self._entries: dict[str, tuple[list[str] | list[FilterableAttributes] | None, float]] = {}
+        self._revalidator = Revalidator()
+        self._flights: SingleFlight[list[str] | list[FilterableAttributes] | None] = SingleFlight()
+
+        index_tasks.add_listener(self.invalidate)
+
+    async def get(
+        self, client: AsyncClient, uid: str
+    ) -> list[str] | list[FilterableAttributes] | None:
+        entry = self._entries.get(uid)
+        if entry is not None:
+            now = monotonic()
+            if entry[1] > now:
+                return entry[0]
+            if entry[1] + self.max_stale > now:
+                self._revalidator.start(uid, lambda: self._fetch(client, uid))
+                return entry[0]
+
+        return await self._fetch(client, uid)
+
+    async def _fetch(
+        self, client: AsyncClient, uid: str
+    ) -> list[str] | list[FilterableAttributes] | None:
+        generation = self.index_tasks.generation(uid)
+        filterable_attributes = await client.index(uid).get_filterable_attributes()
+        if generation == self.index_tasks.generation(uid) and not self.index_tasks.pending(uid):
+            self._entries[uid] = (filterable_attributes, monotonic() + self.ttl)
+
+        return filterable_attributes
+
+    def invalidate(self, uid: str) -> None:
+        self._entries.pop(uid, None)
+
+    async def aclose(self) -> None:
+        await self._revalidator.aclose()
+
+    async def check(
+        self, client: AsyncClient, uid: str, expression: str | list[Any] | None
+    ) -> None:
+        """Raises a `FilterError` if the filter uses an attribute the index can't filter on.
+
+        Filters that can't be parsed, and filters on indexes whose filterable attributes can't be
+        read, for example because the index doesn't exist, are left for Meilisearch to check so a
+        gap in the local grammar never rejects a filter Meilisearch accepts.
+        """
+        try:
+            node = parse_filter(expression)
+        except FilterError:
+            return
+        if node is None:
+            return
+
+        cached = uid in self._entries
+        try:
+            filterable_attributes = await self.get(client, uid)
+        except MeilisearchApiError:
+            return
+
+        try:
+            check_filterable(node, filterable_attributes)
+        except FilterError:
+            if not cached:
+                raise
+
+            try:
+                filterable_attributes = await self._flights.do(
+                    uid, lambda: self._fetch(client, uid)
+                )
+            except MeilisearchApiError:
+                return
+
+            check_filterable(node, filterable_attributes)
+
+
+@lru_cache(maxsize=1)
+def get_filterable_attributes_cache() -> FilterableAttributesCache | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_FILTER_VALIDATION:
+        return None
+
+    return FilterableAttributesCache(
+        ttl=config.MEILISEARCH_FILTERABLE_ATTRIBUTES_TTL,
+        index_tasks=get_index_tasks(),
+        max_stale=config.MEILISEARCH_CACHE_MAX_STALE,
+    )
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+
+
+def fingerprint(value: str) -> str:
+    """Stands in for a secret, such as an API key, wherever it is used as a key or kept in memory."""
+    return blake2b(value.encode(), digest_size=16).hexdigest()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from functools import lru_cache
+
+from meilisearch_python_sdk import AsyncClient
+
+
+class IndexTasks:
+    """Tracks the write tasks enqueued on each index until Meilisearch has processed them.
+
+    Listeners are called with the index uid when a write is enqueued and again once the latest
+    enqueued task for that index has finished, so anything cached for the index can be dropped.
+    Each notification also bumps the index's generation, so results read before a write can be
+    told apart from results read after it. Only one watcher per index polls Meilisearch no matter
+    how many writes are in flight.
+    """
+
+    def __init__(self, poll_interval_ms: int = 100) -> None:
+        self.poll_interval_ms = poll_interval_ms
+        self._listeners: list[Callable[[str], None]] = []
+        self._latest: dict[str, int] = {}
+        self._generations: dict[str, int] = {}
+        self._watchers: dict[str, asyncio.Task[None]] = {}
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        self._listeners.append(listener)
+
+    def pending(self, uid: str) -> bool:
+        return uid in self._watchers
+
+    def generation(self, uid: str) -> int:
+        return self._generations.get(uid, 0)
+
+    def enqueued(self, client: AsyncClient, uid: str, task_uid: int) -> None:
+        self._latest[uid] = max(task_uid, self._latest.get(uid, task_uid))
+
+        # The watcher is registered first so listeners already see the index as pending.
+        if uid not in self._watchers:
+            self._watchers[uid] = asyncio.create_task(self._watch(client, uid))
+
+        self._notify(uid)
+
+    async def aclose(self) -> None:
+        watchers = list(self._watchers.values())
+        for watcher in watchers:
+            watcher.cancel()
+
+        await asyncio.gather(*watchers, return_exceptions=True)
+
+        # Watchers cancelled before they started never reach their own cleanup.
+        self._watchers.clear()
+        self._latest.clear()
+
+    async def _watch(self, client: AsyncClient, uid: str) -> None:
+        try:
+            while True:
+                task_uid = self._latest[uid]
+                await client.wait_for_task(
+                    task_uid, timeout_in_ms=None, interval_in_ms=self.poll_interval_ms
+                )
+                if self._latest[uid] == task_uid:
+                    break
+        except Exception:
+            # If the task status can't be read there is nothing left to wait on. Anything cached
+            # in the meantime is still bounded by its own expiry.
+            pass
+        finally:
+            del self._latest[uid]
+            del self._watchers[uid]
+            self._notify(uid)
+
+    def _notify(self, uid: str) -> None:
+        self._generations[uid] = self.generation(uid) + 1
+
+        for listener in self._listeners:
+            listener(uid)
+
+
+@lru_cache(maxsize=1)
+def get_index_tasks() -> IndexTasks:
+    return IndexTasks()
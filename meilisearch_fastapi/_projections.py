@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+from meilisearch_fastapi.models.search_parameters import SearchParameters
+
+SearchParametersT = TypeVar("SearchParametersT", bound=SearchParameters)
+
+
+class ProjectionError(ValueError):
+    pass
+
+
+def apply_projection(
+    search_parameters: SearchParametersT, projections: dict[str, dict[str, list[str]]]
+) -> SearchParametersT:
+    """Replaces the search's `projection` with the attributes of that projection for the index.
+
+    Searches that name neither a projection nor `attributes_to_retrieve` get the index's `default`
+    projection, if it has one.
+    """
+    profiles = projections.get(search_parameters.uid, {})
+    name = search_parameters.projection
+
+    if name is None:
+        if "attributes_to_retrieve" in search_parameters.model_fields_set:
+            return search_parameters
+        if "default" not in profiles:
+            return search_parameters
+        name = "default"
+
+    if name not in profiles:
+        raise ProjectionError(
+            f"Unknown projection `{name}` for index `{search_parameters.uid}`. Available "
+            f"projections are: `{', '.join(profiles)}`."
+        )
+
+    return search_parameters.model_copy(
+        update={"attributes_to_retrieve": profiles[name], "projection": None}
+    )
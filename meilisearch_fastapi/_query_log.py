@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+from functools import lru_cache
+from queue import Empty, Full, Queue
+from time import time
+from typing import Any
+
+from meilisearch_fastapi._config import get_config
+
+# Lines waiting to be written beyond this are dropped rather than held in memory.
+_MAX_PENDING_LINES = 10_000
+
+
+class QueryLog:
+    """Appends a sample of the searches received to an NDJSON file, for replaying later.
+
+    Each line holds the route, the parameters as they were sent, how long the search took in
+    milliseconds, the response status and the number of hits, for example:
+
+        {"at":1700000000.0,"route":"search","ms":3.1,"status":200,"hits":12,
+         "params":{"uid":"movies","query":"dark"}}
+
+    but on a single line. Lines are written and flushed by a background thread so searches don't
+    wait on the file.
+    """
+
+    def __init__(self, path: str, sample_rate: float) -> None:
+        self.path = path
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._lines: Queue[str | None] = Queue(_MAX_PENDING_LINES)
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._write, name="meilisearch-query-log", daemon=True
+        )
+        self._writer.start()
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def record(
+        self,
+        route: str,
+        params: dict[str, Any],
+        duration: float,
+        status: int,
+        hits: int | None = None,
+    ) -> None:
+        line = json.dumps(
+            {
+                "at": round(time(), 3),
+                "route": route,
+                "ms": round(duration * 1000, 3),
+                "status": status,
+                "hits": hits,
+                "params": params,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        if self._closed:
+            return
+
+        try:
+            self._lines.put_nowait(line)
+        except Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Writes the lines still waiting and closes the file."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._lines.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def _write(self) -> None:
+        while True:
+            line = self._lines.get()
+            # Everything already waiting is written before the file is flushed.
+            while line is not None:
+                self._file.write(line + "\n")
+                try:
+                    line = self._lines.get_nowait()
+                except Empty:
+                    break
+            self._file.flush()
+
+            if line is None:
+                return
+
+
+@lru_cache(maxsize=1)
+def get_query_log() -> QueryLog | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_QUERY_LOG:
+        return None
+
+    return QueryLog(config.MEILISEARCH_QUERY_LOG, config.MEILISEARCH_QUERY_LOG_SAMPLE_RATE)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import importlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from math import ceil
+from time import monotonic
+from typing import Any, Protocol
+
+from fastapi import HTTPException, Request
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._fingerprint import fingerprint
+
+try:
+    from redis.asyncio import Redis  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    Redis = None
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float
+    retry_after: float
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(ceil(self.reset)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, ceil(self.retry_after)))
+
+        return headers
+
+
+def _result(tokens: float, allowed: bool, rate: float, burst: int) -> RateLimitResult:
+    return RateLimitResult(
+        allowed=allowed,
+        limit=burst,
+        remaining=int(tokens),
+        reset=(burst - tokens) / rate,
+        retry_after=0.0 if allowed else (1 - tokens) / rate,
+    )
+
+
+class RateLimitBackend(Protocol):
+    """Where token buckets are kept. Buckets start full and hold at most `burst` tokens."""
+
+    async def take(self, key: str, rate: float, burst: int) -> RateLimitResult: ...
+
+    async def aclose(self) -> None: ...
+
+
+class MemoryRateLimitBackend:
+    """Buckets kept in the process, so each worker enforces the limits on its own.
+
+    Only the `max_entries` most recently used buckets are kept. A dropped bucket starts full again,
+    which is what it would have refilled to unless its caller was very busy.
+    """
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> RateLimitResult:
+        now = monotonic()
+        tokens, updated = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+
+        return _result(tokens, allowed, rate, burst)
+
+    async def aclose(self) -> None:
+        pass
+
+
+# Refills and takes from a bucket atomically, using the Redis clock so workers on different hosts
+# agree on the time.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Buckets kept in Redis so the limits hold across worker processes and hosts."""
+
+    def __init__(self, url: str, prefix: str = "meilisearch-fastapi:rate-limit:") -> None:
+        if Redis is None:
+            raise ImportError("The redis package is needed for a Redis rate limit backend")
+
+        self.prefix = prefix
+        self._redis = Redis.from_url(url)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> RateLimitResult:
+        allowed, tokens = await self._take(keys=[self.prefix + key], args=[rate, burst])
+
+        return _result(float(tokens), bool(allowed), rate, burst)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+def caller_identity(request: Request, header: str) -> str:
+    """Who a request is from, for the purpose of rate limiting.
+
+    Tenant tokens are identified by the API key they were signed with, so every token signed with
+    a key shares one bucket. Their other claims aren't used, because anyone holding the key can
+    sign tokens with whatever claims they like. Other credentials are identified by a hash of the
+    credential itself, and requests without one by their address. The token isn't verified here,
+    that is up to the app's authentication.
+    """
+    credential = request.headers.get(header)
+    if not credential:
+        return f"address:{request.client.host if request.client else 'unknown'}"
+
+    scheme, _, token = credential.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        credential = token.strip()
+
+    claims = _tenant_token_claims(credential)
+    if claims is not None:
+        return f"tenant:{claims['apiKeyUid']}"
+
+    return f"key:{fingerprint(credential)}"
+
+
+def _tenant_token_claims(token: str) -> dict[str, Any] | None:
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+
+    if not isinstance(claims, dict) or not isinstance(claims.get("apiKeyUid"), str):
+        return None
+
+    return claims
+
+
+class RateLimiter:
+    """Token bucket rate limits for each caller, set per route group.
+
+    `limits` maps route groups (`search`, `documents`, `indexes`, `settings` and `meilisearch`)
+    to a rate in requests per second and a burst size. Groups without a limit aren't limited.
+    """
+
+    def __init__(
+        self, limits: dict[str, tuple[float, int]], backend: RateLimitBackend, header: str
+    ) -> None:
+        self.limits = limits
+        self.backend = backend
+        self.header = header
+
+    async def check(self, request: Request, group: str | None) -> RateLimitResult | None:
+        """Takes a token for the request, raising a 429 if the caller has none left."""
+        if group is None or group not in self.limits:
+            return None
+
+        rate, burst = self.limits[group]
+        identity = caller_identity(request, self.header)
+        result = await self.backend.take(f"{group}:{identity}", rate, burst)
+
+        if not result.allowed:
+            raise HTTPException(
+                HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded", headers=result.headers()
+            )
+
+        return result
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+
+def load_rate_limit_backend(path: str) -> RateLimitBackend:
+    """Creates a backend from the `module:attribute` path of a class or function that takes no
+    arguments and returns a `RateLimitBackend`.
+    """
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"A rate limit backend is given as module:attribute, not {path!r}")
+
+    factory = getattr(importlib.import_module(module_name), attribute)
+
+    return factory()
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_RATE_LIMITS:
+        return None
+
+    backend: RateLimitBackend
+    if config.MEILISEARCH_RATE_LIMIT_BACKEND:
+        backend = load_rate_limit_backend(config.MEILISEARCH_RATE_LIMIT_BACKEND)
+    elif config.MEILISEARCH_RATE_LIMIT_REDIS_URL:
+        backend = RedisRateLimitBackend(config.MEILISEARCH_RATE_LIMIT_REDIS_URL)
+    else:
+        backend = MemoryRateLimitBackend()
+
+    return RateLimiter(
+        limits=config.MEILISEARCH_RATE_LIMITS,
+        backend=backend,
+        header=config.MEILISEARCH_RATE_LIMIT_HEADER,
+    )
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes, from orjson when it is installed or the stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """The default response class for the package's routers.
+
+    Content is rendered with orjson when it is installed, falling back to compact stdlib json.
+    FastAPI has already turned the route's response model into plain JSON data by the time this
+    is called, so nothing goes through `jsonable_encoder` again.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class Revalidator:
+    """Runs at most one background refresh per key for caches that serve expired entries.
+
+    A failed refresh is dropped, leaving the cache to serve the old entry until it is too stale.
+    """
+
+    def __init__(self) -> None:
+        self.revalidations = 0
+        self._tasks: dict[Hashable, asyncio.Task[None]] = {}
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._tasks:
+            return
+
+        self.revalidations += 1
+        task = asyncio.create_task(self._run(fn))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    async def aclose(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, fn: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await fn()
+        except Exception:
+            pass
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import AsyncExitStack
+from typing import Any, ClassVar
+
+from fastapi import Request, Response
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+
+from meilisearch_fastapi._admission import get_admission_control
+from meilisearch_fastapi._compression import get_compressor
+from meilisearch_fastapi._rate_limit import get_rate_limiter
+from meilisearch_fastapi._responses import FastJSONResponse
+
+# Bodies bigger than this are document batches, not worth parsing twice just to find the index.
+_MAX_INDEX_BODY_SIZE = 16 * 1024
+
+
+async def request_index(request: Request) -> str | None:
+    """The uid of the index a request is for, from its path or its JSON body."""
+    uid = request.path_params.get("uid")
+    if isinstance(uid, str):
+        return uid
+
+    if not request.headers.get("content-type", "").startswith("application/json"):
+        return None
+
+    body = await request.body()
+    if not body or len(body) > _MAX_INDEX_BODY_SIZE:
+        return None
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+
+    uid = data.get("uid") if isinstance(data, dict) else None
+
+    return uid if isinstance(uid, str) else None
+
+
+class MeilisearchRoute(APIRoute):
+    """Route class of the package's routers.
+
+    Requests are rate limited by route group and go through admission control, and responses are
+    compressed, each when enabled. Responses are rendered with `FastJSONResponse` unless a response
+    class is given for the route, or where its router is included, or for the app.
+    """
+
+    group: ClassVar[str | None] = None
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        # Kept as a placeholder so that a response class given by include_router still wins.
+        if isinstance(kwargs.get("response_class", Default(None)), DefaultPlaceholder):
+            kwargs["response_class"] = Default(FastJSONResponse)
+
+        super().__init__(path, endpoint, **kwargs)
+
+    @classmethod
+    def for_group(cls, group: str) -> type[MeilisearchRoute]:
+        return type(f"{group.title()}{cls.__name__}", (cls,), {"group": group})
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            rate_limiter = get_rate_limiter()
+            rate_limit = None
+            if rate_limiter is not None:
+                rate_limit = await rate_limiter.check(request, self.group)
+
+            admission_control = get_admission_control()
+            if admission_control is None:
+                response = await handler(request)
+            else:
+                async with AsyncExitStack() as stack:
+                    await stack.enter_async_context(
+                        admission_control.admit(await request_index(request))
+                    )
+                    response = await handler(request)
+                    # A streamed body is produced while it is sent, after the handler returns.
+                    if isinstance(response, StreamingResponse):
+                        _release_after_body(response, stack.pop_all())
+
+            if rate_limit is not None:
+                response.headers.update(rate_limit.headers())
+
+            compressor = get_compressor()
+            if compressor is None:
+                return response
+
+            return await compressor.compress(request, response)
+
+        return route_handler
+
+
+def _release_after_body(response: StreamingResponse, stack: AsyncExitStack) -> None:
+    """Closes `stack` once the response body has been sent, or the client has gone away."""
+    body = response.body_iterator
+    background = response.background
+
+    async def stream() -> AsyncIterator[str | bytes | memoryview]:
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            await stack.aclose()
+
+    # Runs even when the client disconnects before the body is started.
+    async def after() -> None:
+        try:
+            if background is not None:
+                await background()
+        finally:
+            await stack.aclose()
+
+    response.body_iterator = stream()
+    response.background = BackgroundTask(after)
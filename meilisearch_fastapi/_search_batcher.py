@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import monotonic
+from typing import cast
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchApiError
+from meilisearch_python_sdk.models.search import SearchParams, SearchResults, SearchResultsWithUID
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi.models.search_cache import SearchBatcherStats
+
+
+@dataclass
+class _Search:
+    params: SearchParams
+    future: asyncio.Future[SearchResults]
+    queued_at: float
+
+
+@dataclass
+class _Batch:
+    searches: list[_Search] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class SearchBatcher:
+    """Collects the searches that arrive within a short window and sends them as one multi-search.
+
+    A batch is sent once `window` seconds have passed since its first search or once it holds
+    `max_size` searches, whichever comes first. Searches are batched per client so searches bound
+    for different nodes aren't mixed. If Meilisearch rejects a batch, its searches are sent again
+    one at a time so only the invalid ones fail.
+    """
+
+    def __init__(self, window: float, max_size: int) -> None:
+        self.window = window
+        self.max_size = max_size
+        self.batches = 0
+        self.searches = 0
+        self.max_batch_size = 0
+        self.added_latency = 0.0
+        self.max_added_latency = 0.0
+        self._batches: dict[AsyncClient, _Batch] = {}
+        self._sending: set[asyncio.Task[None]] = set()
+
+    async def search(self, client: AsyncClient, params: SearchParams) -> SearchResults:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[SearchResults] = loop.create_future()
+
+        batch = self._batches.get(client)
+        if batch is None:
+            batch = self._batches[client] = _Batch()
+            batch.timer = loop.call_later(self.window, self._flush, client)
+
+        batch.searches.append(_Search(params, future, monotonic()))
+        if len(batch.searches) >= self.max_size:
+            self._flush(client)
+
+        return await future
+
+    def stats(self) -> SearchBatcherStats:
+        return SearchBatcherStats(
+            batches=self.batches,
+            searches=self.searches,
+            average_batch_size=self.searches / self.batches if self.batches else 0.0,
+            max_batch_size=self.max_batch_size,
+            average_added_latency_ms=(
+                self.added_latency / self.searches * 1000 if self.searches else 0.0
+            ),
+            max_added_latency_ms=self.max_added_latency * 1000,
+        )
+
+    def _flush(self, client: AsyncClient) -> None:
+        batch = self._batches.pop(client)
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        # Searches whose request has gone away don't need to be sent.
+        searches = [search for search in batch.searches if not search.future.done()]
+        if not searches:
+            return
+
+        now = monotonic()
+        self.batches += 1
+        self.searches += len(searches)
+        self.max_batch_size = max(self.max_batch_size, len(searches))
+        for search in searches:
+            self.added_latency += now - search.queued_at
+            self.max_added_latency = max(self.max_added_latency, now - search.queued_at)
+
+        task = asyncio.create_task(self._send(client, searches))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, client: AsyncClient, searches: list[_Search]) -> None:
+        try:
+            # Without federation Meilisearch returns one result per query, in order.
+            found = cast(
+                list[SearchResultsWithUID],
+                await client.multi_search([search.params for search in searches]),
+            )
+        except MeilisearchApiError as e:
+            if len(searches) > 1:
+                await asyncio.gather(*[self._send(client, [search]) for search in searches])
+            else:
+                _set_exception(searches[0], e)
+            return
+        except Exception as e:
+            for search in searches:
+                _set_exception(search, e)
+            return
+
+        for search, result in zip(searches, found):
+            if not search.future.done():
+                search.future.set_result(
+                    SearchResults.model_validate(result.model_dump(exclude={"index_uid"}))
+                )
+
+
+def _set_exception(search: _Search, error: Exception) -> None:
+    if not search.future.done():
+        search.future.set_exception(error)
+
+
+@lru_cache(maxsize=1)
+def get_search_batcher() -> SearchBatcher | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_SEARCH_BATCHING:
+        return None
+
+    return SearchBatcher(
+        window=config.MEILISEARCH_SEARCH_BATCH_WINDOW,
+        max_size=config.MEILISEARCH_SEARCH_BATCH_MAX_SIZE,
+    )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
+from time import monotonic
+
+from meilisearch_python_sdk.models.search import SearchResults
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._filters import canonical_filter
+from meilisearch_fastapi._index_tasks import IndexTasks, get_index_tasks
+from meilisearch_fastapi._revalidation import Revalidator
+from meilisearch_fastapi.models.search_cache import SearchCacheStats
+from meilisearch_fastapi.models.search_parameters import SearchParameters
+
+
+def search_cache_key(search_parameters: SearchParameters) -> str:
+    canonical = json.dumps(
+        search_parameters.model_dump() | {"filter": canonical_filter(search_parameters.filter)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+    return blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class _Entry:
+    uid: str
+    results: SearchResults
+    size: int
+    expires_at: float
+
+
+class SearchCache:
+    """LRU cache of search results with an expiry and limits on entry count and total size.
+
+    Entries for an index are dropped whenever a write is enqueued on it and again when the write
+    finishes. Nothing is stored for an index while it has writes in progress, or if a write was
+    enqueued while the search was running, so stale results can't outlive the write.
+
+    For up to `max_stale` seconds after an entry expires it is still served while the search is
+    sent again in the background, so expiring entries don't make requests wait on Meilisearch.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        index_tasks: IndexTasks,
+        max_stale: float = 0.0,
+    ) -> None:
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.index_tasks = index_tasks
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._revalidator = Revalidator()
+
+        index_tasks.add_listener(self.invalidate)
+
+    def get(
+        self, key: str, revalidate: Callable[[], Awaitable[object]] | None = None
+    ) -> SearchResults | None:
+        """Looks up a search.
+
+        `revalidate` sends the search again and stores the results, and is what allows an expired
+        entry to be served while it runs.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        now = monotonic()
+        if entry.expires_at <= now:
+            if revalidate is None or entry.expires_at + self.max_stale <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._revalidator.start(key, revalidate)
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+
+        self._entries.move_to_end(key)
+
+        return entry.results
+
+    def set(self, key: str, uid: str, results: SearchResults, generation: int) -> None:
+        """Stores the results of a search.
+
+        `generation` is the index's generation from before the search was sent, so results are
+        dropped if a write was enqueued while the search was running.
+        """
+        if self.index_tasks.pending(uid) or generation != self.index_tasks.generation(uid):
+            return
+
+        size = len(results.model_dump_json())
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = _Entry(uid, results, size, monotonic() + self.ttl)
+        self.size += size
+
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, uid: str) -> None:
+        for key in [k for k, entry in self._entries.items() if entry.uid == uid]:
+            self._remove(key)
+            self.invalidations += 1
+
+    def stats(self) -> SearchCacheStats:
+        return SearchCacheStats(
+            entries=len(self._entries),
+            size_bytes=self.size,
+            hits=self.hits,
+            stale_hits=self.stale_hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+            revalidations=self._revalidator.revalidations,
+        )
+
+    async def aclose(self) -> None:
+        await self._revalidator.aclose()
+
+    def _remove(self, key: str) -> None:
+        self.size -= self._entries.pop(key).size
+
+
+@lru_cache(maxsize=1)
+def get_search_cache() -> SearchCache | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_SEARCH_CACHE:
+        return None
+
+    return SearchCache(
+        ttl=config.MEILISEARCH_SEARCH_CACHE_TTL,
+        max_entries=config.MEILISEARCH_SEARCH_CACHE_MAX_ENTRIES,
+        max_bytes=config.MEILISEARCH_SEARCH_CACHE_MAX_BYTES,
+        index_tasks=get_index_tasks(),
+        max_stale=config.MEILISEARCH_CACHE_MAX_STALE,
+    )
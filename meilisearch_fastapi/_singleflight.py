@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from functools import lru_cache
+from typing import Generic, TypeVar
+
+from meilisearch_python_sdk.models.search import SearchResults
+
+from meilisearch_fastapi._config import get_config
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Shares one in-flight call between all concurrent callers that use the same key.
+
+    The call is shielded so a caller that disconnects doesn't cancel it for everyone else.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: dict[Hashable, asyncio.Future[T]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._in_flight.get(key)
+
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(future)
+
+    def _done(self, key: Hashable, future: asyncio.Future[T]) -> None:
+        del self._in_flight[key]
+
+        # Mark the error as retrieved in case every caller was cancelled before it was raised.
+        if not future.cancelled():
+            future.exception()
+
+
+@lru_cache(maxsize=1)
+def get_search_flights() -> SingleFlight[SearchResults] | None:
+    if not get_config().MEILISEARCH_SEARCH_COALESCING:
+        return None
+
+    return SingleFlight()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator
+
+from httpx import HTTPStatusError, RequestError
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchApiError, MeilisearchCommunicationError
+from meilisearch_python_sdk.models.task import TaskInfo
+
+
+class RecordChunks:
+    """Splits a stream of NDJSON or CSV into chunks of whole records, each about `max_bytes`.
+
+    Only the piece of the stream being passed on is held in memory. A chunk ends at the first
+    record boundary after `max_bytes`, and CSV chunks each start with the header line. Newlines
+    inside quoted CSV fields aren't treated as record boundaries. Each chunk has to be read to the
+    end before the next one is started.
+    """
+
+    def __init__(self, stream: AsyncIterable[bytes], max_bytes: int, csv: bool = False) -> None:
+        self.max_bytes = max_bytes
+        self.csv = csv
+        self._stream = stream.__aiter__()
+        self._pending = b""
+        self._header: bytes | None = None
+        self._in_quotes = False
+
+    async def has_more(self) -> bool:
+        if self.csv and self._header is None:
+            await self._read_header()
+
+        while not self._pending.strip():
+            piece = await self._read()
+            if piece is None:
+                return False
+            self._pending += piece
+
+        return True
+
+    async def chunk(self) -> AsyncIterator[bytes]:
+        size = 0
+        if self._header:
+            yield self._header
+            size += len(self._header)
+
+        while True:
+            if self._pending:
+                piece, self._pending = self._pending, b""
+            else:
+                read = await self._read()
+                if read is None:
+                    return
+                piece = read
+
+            if size + len(piece) >= self.max_bytes:
+                cut = self._boundary(piece, max(0, self.max_bytes - size - 1))
+                if cut is not None:
+                    self._pending = piece[cut:]
+                    self._in_quotes = False
+                    yield piece[:cut]
+                    return
+
+            if self.csv:
+                self._in_quotes ^= piece.count(b'"') % 2 == 1
+            size += len(piece)
+            yield piece
+
+    def _boundary(self, piece: bytes, start: int) -> int | None:
+        """The index just after the first record ending at or after `start`, if there is one."""
+        in_quotes = self._in_quotes
+        counted = 0
+        newline = piece.find(b"\n", start)
+        while newline != -1:
+            if self.csv:
+                in_quotes ^= piece.count(b'"', counted, newline) % 2 == 1
+                counted = newline
+            if not in_quotes:
+                return newline + 1
+            newline = piece.find(b"\n", newline + 1)
+
+        return None
+
+    async def _read_header(self) -> None:
+        while True:
+            newline = self._pending.find(b"\n")
+            if newline != -1:
+                self._header = self._pending[: newline + 1]
+                self._pending = self._pending[newline + 1 :]
+                return
+
+            piece = await self._read()
+            if piece is None:
+                self._header, self._pending = self._pending + b"\n", b""
+                return
+            self._pending += piece
+
+    async def _read(self) -> bytes | None:
+        async for piece in self._stream:
+            if piece:
+                return piece
+
+        return None
+
+
+async def send_documents(
+    client: AsyncClient,
+    method: str,
+    uid: str,
+    content: bytes | AsyncIterator[bytes],
+    content_type: str,
+    primary_key: str | None = None,
+    csv_delimiter: str | None = None,
+) -> TaskInfo:
+    """Sends an already encoded body of documents to Meilisearch, streaming it if it is an iterator."""
+    params = {}
+    if primary_key is not None:
+        params["primaryKey"] = primary_key
+    if csv_delimiter is not None:
+        params["csvDelimiter"] = csv_delimiter
+
+    try:
+        response = await client.http_client.request(
+            method,
+            f"indexes/{uid}/documents",
+            params=params,
+            content=content,
+            headers={"Content-Type": content_type},
+        )
+        response.raise_for_status()
+    except HTTPStatusError as e:
+        raise MeilisearchApiError(str(e), e.response) from e
+    except RequestError as e:
+        raise MeilisearchCommunicationError(str(e)) from e
+
+    return TaskInfo(**response.json())
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
+
+from meilisearch_python_sdk.models.client import Key
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._fingerprint import fingerprint
+
+
+def tenant_token_cache_key(
+    api_key: Key, search_rules: dict[str, Any] | list[str], expires: bool
+) -> tuple[str, str, str, str, bool]:
+    return (
+        api_key.uid,
+        fingerprint(api_key.key),
+        json.dumps(api_key.indexes, sort_keys=True),
+        json.dumps(search_rules, sort_keys=True, separators=(",", ":")),
+        expires,
+    )
+
+
+@dataclass
+class _Entry:
+    token: str
+    expires_at: datetime | None
+
+
+class TenantTokenCache:
+    """Reuses tenant tokens signed for the same API key and search rules.
+
+    A cached token is only handed out if it expires no later than the requested `expires_at`, so
+    callers never get a token that outlives what they asked for, and if it has at least
+    `min_remaining` left. Tokens without an expiry are only reused for requests without one.
+    """
+
+    def __init__(self, min_remaining: float, max_entries: int) -> None:
+        self.min_remaining = timedelta(seconds=min_remaining)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str, str, str, bool], _Entry] = OrderedDict()
+
+    def get(
+        self,
+        api_key: Key,
+        search_rules: dict[str, Any] | list[str],
+        expires_at: datetime | None,
+    ) -> str | None:
+        # Naive times can't be compared with the cached ones, leave them to the client to reject.
+        if expires_at is not None and expires_at.tzinfo is None:
+            return None
+
+        key = tenant_token_cache_key(api_key, search_rules, expires_at is not None)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at is not None and expires_at is not None:
+            if entry.expires_at > expires_at:
+                return None
+            if entry.expires_at - datetime.now(tz=timezone.utc) < self.min_remaining:
+                del self._entries[key]
+                return None
+
+        self._entries.move_to_end(key)
+
+        return entry.token
+
+    def set(
+        self,
+        api_key: Key,
+        search_rules: dict[str, Any] | list[str],
+        expires_at: datetime | None,
+        token: str,
+    ) -> None:
+        key = tenant_token_cache_key(api_key, search_rules, expires_at is not None)
+        self._entries[key] = _Entry(token, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def evict(self, key: str) -> None:
+        """Drops the tokens of an API key, given either its uid or the key itself."""
+        hashed_key = fingerprint(key)
+        for cache_key in [k for k in self._entries if key == k[0] or hashed_key == k[1]]:
+            del self._entries[cache_key]
+
+
+@lru_cache(maxsize=1)
+def get_tenant_token_cache() -> TenantTokenCache | None:
+    config = get_config()
+
+    if not config.MEILISEARCH_TENANT_TOKEN_CACHE:
+        return None
+
+    return TenantTokenCache(
+        min_remaining=config.MEILISEARCH_TENANT_TOKEN_MIN_REMAINING,
+        max_entries=config.MEILISEARCH_TENANT_TOKEN_CACHE_MAX_ENTRIES,
+    )
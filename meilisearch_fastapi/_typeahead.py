@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
+from time import monotonic
+from typing import Any
+
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._filters import canonical_filter
+from meilisearch_fastapi._index_tasks import IndexTasks, get_index_tasks
+from meilisearch_fastapi._revalidation import Revalidator
+from meilisearch_fastapi.models.search_cache import TypeaheadCacheStats
+from meilisearch_fastapi.models.search_parameters import TypeaheadSearchParameters
+
+_WORD = re.compile(r"\w+")
+
+
+def query_words(query: str | None) -> list[str]:
+    return _WORD.findall((query or "").casefold())
+
+
+def typeahead_signature(search_parameters: TypeaheadSearchParameters) -> str:
+    """Key shared by every keystroke of a typeahead search: everything but the query and paging."""
+    canonical = json.dumps(
+        search_parameters.model_dump(exclude={"query", "offset", "limit", "page", "hits_per_page"})
+        | {"filter": canonical_filter(search_parameters.filter)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+    return blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def can_narrow(search_parameters: TypeaheadSearchParameters) -> bool:
+    """Whether results for the search can be worked out from the hits of a shorter query.
+
+    Anything Meilisearch computes per query, like highlighting, cropping, match positions, ranking
+    scores, and facet counts, can't be, and the full documents are needed to match the words.
+    """
+    return (
+        search_parameters.attributes_to_retrieve == ["*"]
+        and not search_parameters.facets
+        and not search_parameters.attributes_to_crop
+        and not search_parameters.attributes_to_highlight
+        and not search_parameters.show_matches_position
+        and not search_parameters.show_ranking_score
+        and search_parameters.page is None
+        and search_parameters.hits_per_page is None
+        and search_parameters.matching_strategy != "frequency"
+    )
+
+
+def narrow(
+    hits: list[dict[str, Any]],
+    words: list[str],
+    matching_strategy: str,
+    searchable_attributes: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Picks out the hits that match `words` the way Meilisearch would, keeping their order.
+
+    Only the index's `searchable_attributes` are matched, all of them if it is `None` or `["*"]`.
+    The last word matches as a prefix and the others must match a whole word. With the `last`
+    matching strategy hits that only match the leading words are kept after the ones that match
+    all of them. Typo tolerance isn't applied.
+    """
+    if not words:
+        return hits
+
+    matched = []
+    for hit in hits:
+        tokens = set(_searchable_tokens(hit, searchable_attributes))
+        count = 0
+        for i, word in enumerate(words):
+            if i == len(words) - 1:
+                found = any(token.startswith(word) for token in tokens)
+            else:
+                found = word in tokens
+            if not found:
+                break
+            count += 1
+
+        if count == len(words) or (count and matching_strategy == "last"):
+            matched.append((count, hit))
+
+    matched.sort(key=lambda match: match[0], reverse=True)
+
+    return [hit for _, hit in matched]
+
+
+def _searchable_tokens(
+    hit: dict[str, Any], searchable_attributes: list[str] | None
+) -> Iterator[str]:
+    if searchable_attributes is None or "*" in searchable_attributes:
+        yield from _tokens(hit)
+        return
+
+    for attribute in searchable_attributes:
+        yield from _tokens(_attribute_values(hit, attribute.split(".")))
+
+
+def _attribute_values(value: Any, parts: list[str]) -> Any:
+    """The values at a dotted attribute path, which runs through arrays of objects as well."""
+    if not parts:
+        return value
+    if isinstance(value, list):
+        return [_attribute_values(v, parts) for v in value]
+    if isinstance(value, dict) and parts[0] in value:
+        return _attribute_values(value[parts[0]], parts[1:])
+
+    return None
+
+
+def _tokens(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield from query_words(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _tokens(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _tokens(v)
+
+
+@dataclass
+class TypeaheadWindow:
+    uid: str
+    hits: list[dict[str, Any]]
+    searchable_attributes: list[str] | None
+    expires_at: float
+
+
+class TypeaheadCache:
+    """Keeps every hit of recent typeahead searches that had few enough hits to fetch them all.
+
+    A search whose query extends a cached one, for example "spi" after "sp", can only match hits
+    the shorter query matched, so it is answered by narrowing those hits locally. Windows are keyed
+    by the signature of the search, so searches with other filters or sessions don't share them,
+    and they are dropped whenever a write is enqueued on their index.
+    """
+
+    def __init__(self, window: int, ttl: float, max_entries: int, index_tasks: IndexTasks) -> None:
+        self.window = window
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.index_tasks = index_tasks
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._windows: OrderedDict[tuple[str, str], TypeaheadWindow] = OrderedDict()
+        self._fills = Revalidator()
+
+        index_tasks.add_listener(self.invalidate)
+
+    def get(self, signature: str, words: list[str]) -> TypeaheadWindow | None:
+        """Returns the window of the longest cached query that `words` extends, if there is one."""
+        query = " ".join(words)
+        now = monotonic()
+
+        for end in range(len(query), -1, -1):
+            key = (signature, query[:end])
+            window = self._windows.get(key)
+            if window is None:
+                continue
+
+            if window.expires_at <= now:
+                del self._windows[key]
+                continue
+
+            self._windows.move_to_end(key)
+            self.hits += 1
+
+            return window
+
+        self.misses += 1
+
+        return None
+
+    def set(
+        self,
+        signature: str,
+        uid: str,
+        words: list[str],
+        hits: list[dict[str, Any]],
+        generation: int,
+        searchable_attributes: list[str] | None = None,
+    ) -> None:
+        """Stores every hit of a search, along with the index's searchable attributes.
+
+        `generation` is the index's generation from before the search was sent, so the hits are
+        dropped if a write was enqueued while the search was running.
+        """
+        if self.index_tasks.pending(uid) or generation != self.index_tasks.generation(uid):
+            return
+
+        key = (signature, " ".join(words))
+        self._windows[key] = TypeaheadWindow(
+            uid, hits, searchable_attributes, monotonic() + self.ttl
+        )
+        self._windows.move_to_end(key)
+
+        while len(self._windows) > self.max_entries:
+            self._windows.popitem(last=False)
+
+    def fill(
+        self,
+        signature: str,
+        uid: str,
+        words: list[str],
+        fetch: Callable[[int], Awaitable[list[dict[str, Any]]]],
+        searchable_attributes: Callable[[], Awaitable[list[str]]],
+        generation: int,
+    ) -> None:
+        """Fetches the hits of a search and the index's searchable attributes in the background
+        and stores them if the window holds all of the hits, so the search that asked for them
+        doesn't wait on more requests.
+
+        `fetch` is called with the number of hits to fetch, one more than the window holds, which
+        tells whether the window has all of them.
+        """
+
+        async def run() -> None:
+            hits, attributes = await asyncio.gather(fetch(self.window + 1), searchable_attributes())
+            if len(hits) <= self.window:
+                self.set(signature, uid, words, hits, generation, attributes)
+
+        self._fills.start((signature, " ".join(words)), run)
+
+    async def aclose(self) -> None:
+        await self._fills.aclose()
+
+    def invalidate(self, uid: str) -> None:
+        for key in [k for k, window in self._windows.items() if window.uid == uid]:
+            del self._windows[key]
+            self.invalidations += 1
+
+    def stats(self) -> TypeaheadCacheStats:
+        return TypeaheadCacheStats(
+            entries=len(self._windows),
+            hits=self.hits,
+            misses=self.misses,
+            invalidations=self.invalidations,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_typeahead_cache() -> TypeaheadCache:
+    config = get_config()
+
+    return TypeaheadCache(
+        window=config.MEILISEARCH_TYPEAHEAD_WINDOW,
+        ttl=config.MEILISEARCH_TYPEAHEAD_TTL,
+        max_entries=config.MEILISEARCH_TYPEAHEAD_MAX_ENTRIES,
+        index_tasks=get_index_tasks(),
+    )
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from camel_converter.pydantic_base import CamelBase
+
+
+class IndexAdmissionStats(CamelBase):
+    active: int
+    waiting: int
+
+
+class AdmissionStats(CamelBase):
+    active: int
+    waiting: int
+    max_waiting: int
+    admitted: int
+    rejected_queue_full: int
+    rejected_index_queue_full: int
+    timed_out: int
+    average_wait_ms: float
+    max_wait_ms: float
+    indexes: dict[str, IndexAdmissionStats]
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from camel_converter.pydantic_base import CamelBase
+
+
+class CompressionStats(CamelBase):
+    encodings: list[str]
+    responses: int
+    responses_by_encoding: dict[str, int]
+    bytes_in: int
+    bytes_out: int
+    ratio: float
+    average_compression_ms: float
+    max_compression_ms: float
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from camel_converter.pydantic_base import CamelBase
+
+
+class SearchCacheStats(CamelBase):
+    entries: int
+    size_bytes: int
+    hits: int
+    stale_hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    revalidations: int
+
+
+class TypeaheadCacheStats(CamelBase):
+    entries: int
+    hits: int
+    misses: int
+    invalidations: int
+
+
+class SearchBatcherStats(CamelBase):
+    batches: int
+    searches: int
+    average_batch_size: float
+    max_batch_size: int
+    average_added_latency_ms: float
+    max_added_latency_ms: float
+
+
+class FacetCacheStats(CamelBase):
+    entries: int
+    hits: int
+    misses: int
+    refreshes: int
@@ -24,3 +24,38 @@ class SearchParameters(CamelBase):
     matching_strategy: Literal["all", "last", "frequency"] = "last"
     hits_per_page: int | None = None
     page: int | None = None
+    show_ranking_score: bool = False
+    projection: str | None = None
+
+
+class SearchExportParameters(SearchParameters):
+    batch_size: int = 1000
+    max_hits: int | None = None
+
+
+class CursorSearchParameters(SearchParameters):
+    cursor: str | None = None
+
+
+class TypeaheadSearchParameters(SearchParameters):
+    session: str | None = None
+
+
+class FacetSearchParameters(CamelBase):
+    uid: str
+    facets: list[str]
+    filter: str | list[str | list[str]] | None = None
+
+
+class MultiSearchParameters(CamelBase):
+    queries: list[SearchParameters]
+
+
+class FederatedQuery(SearchParameters):
+    weight: float = 1.0
+
+
+class FederatedSearchParameters(CamelBase):
+    queries: list[FederatedQuery]
+    offset: int = 0
+    limit: int = 20
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any
+
+from camel_converter.pydantic_base import CamelBase
+
+
+class FederatedSearchResults(CamelBase):
+    hits: list[dict[str, Any]]
+    offset: int
+    limit: int
+    estimated_total_hits: int
+    processing_time_ms: int
+
+
+class FacetSearchResults(CamelBase):
+    facet_distribution: dict[str, Any]
+    estimated_total_hits: int
+
+
+class CursorSearchResults(CamelBase):
+    hits: list[dict[str, Any]]
+    limit: int
+    processing_time_ms: int
+    query: str
+    next_cursor: str | None = None
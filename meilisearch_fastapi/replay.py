@@ -0,0 +1,198 @@
+"""Replays a query log against a running app and reports latency and throughput.
+
+    python -m meilisearch_fastapi.replay queries.ndjson --url http://localhost:8000/search --qps 50
+
+With `--qps` searches are sent at a fixed rate whether or not earlier ones have finished, which
+shows how latency grows with load. With `--concurrency` a fixed number of searches are kept in
+flight, which shows the most the app can serve.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from itertools import cycle, islice
+from math import ceil
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from httpx import AsyncClient, HTTPError, Limits
+
+# The query log's route names and the path of each under the search router.
+_ROUTE_PATHS = {"search": ""}
+
+
+@dataclass
+class ReplayReport:
+    sent: int = 0
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+    latencies: list[float] = field(default_factory=list)
+    duration: float = 0.0
+
+    def record(self, status: int | None, latency: float) -> None:
+        self.sent += 1
+        if status is None or status >= 400:
+            self.errors += 1
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latencies.append(latency)
+
+    def summary(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        return {
+            "sent": self.sent,
+            "errors": self.errors,
+            "statuses": self.statuses,
+            "duration_s": round(self.duration, 3),
+            "throughput_rps": round(self.sent / self.duration, 1) if self.duration else 0.0,
+            "latency_ms": {
+                name: round(percentile(latencies, p) * 1000, 3)
+                for name, p in (("p50", 50), ("p90", 90), ("p95", 95), ("p99", 99), ("max", 100))
+            },
+        }
+
+
+def percentile(ordered: Sequence[float], p: float) -> float:
+    """Nearest rank percentile of already sorted values."""
+    if not ordered:
+        return 0.0
+
+    return ordered[max(0, ceil(p / 100 * len(ordered)) - 1)]
+
+
+def read_queries(path: Path) -> list[tuple[str, dict[str, Any]]]:
+    queries = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("route") in _ROUTE_PATHS:
+                queries.append((entry["route"], entry["params"]))
+
+    return queries
+
+
+async def replay(
+    client: AsyncClient,
+    url: str,
+    queries: Sequence[tuple[str, dict[str, Any]]],
+    qps: float | None = None,
+    concurrency: int | None = None,
+) -> ReplayReport:
+    """Sends the queries at `qps` searches per second, or with `concurrency` in flight."""
+    report = ReplayReport()
+    base = url.rstrip("/")
+
+    async def send(route: str, params: dict[str, Any]) -> None:
+        start = perf_counter()
+        try:
+            response = await client.post(f"{base}{_ROUTE_PATHS[route]}", json=params)
+            status: int | None = response.status_code
+        except HTTPError:
+            status = None
+        report.record(status, perf_counter() - start)
+
+    start = perf_counter()
+    if qps is not None:
+        tasks = []
+        for i, (route, params) in enumerate(queries):
+            delay = start + i / qps - perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(route, params)))
+        await asyncio.gather(*tasks)
+    else:
+        pending = iter(queries)
+
+        async def worker() -> None:
+            for route, params in pending:
+                await send(route, params)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency or 1)))
+    report.duration = perf_counter() - start
+
+    return report
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:  # Also rejects nan
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+
+    return number
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+
+    return number
+
+
+def _format(summary: dict[str, Any]) -> str:
+    latency = summary["latency_ms"]
+    statuses = ", ".join(
+        f"{status}: {count}" for status, count in sorted(summary["statuses"].items())
+    )
+
+    return "\n".join(
+        [
+            f"sent        {summary['sent']} in {summary['duration_s']}s",
+            f"throughput  {summary['throughput_rps']} requests/s",
+            f"errors      {summary['errors']} ({statuses})",
+            "latency ms  " + "  ".join(f"{name} {value}" for name, value in latency.items()),
+        ]
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m meilisearch_fastapi.replay",
+        description="Replay a query log against the search routes of a running app.",
+    )
+    parser.add_argument("log", type=Path, help="NDJSON query log written by MEILISEARCH_QUERY_LOG")
+    parser.add_argument(
+        "--url", default="http://localhost:8000/search", help="URL the search router is served at"
+    )
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument("--qps", type=_positive_float, help="Searches sent per second")
+    rate.add_argument(
+        "--concurrency", type=_positive_int, default=10, help="Searches kept in flight"
+    )
+    parser.add_argument(
+        "--requests", type=int, help="Number of searches to send, cycling through the log"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait per search")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    queries = read_queries(args.log)
+    if not queries:
+        parser.error(f"No searches found in {args.log}")
+    if args.requests is not None:
+        queries = list(islice(cycle(queries), args.requests))
+
+    concurrency = None if args.qps is not None else args.concurrency
+
+    async def run() -> ReplayReport:
+        limits = Limits(max_connections=concurrency)
+        async with AsyncClient(timeout=args.timeout, limits=limits) as client:
+            return await replay(client, args.url, queries, qps=args.qps, concurrency=concurrency)
+
+    summary = asyncio.run(run()).summary()
+    sys.stdout.write((json.dumps(summary) if args.json else _format(summary)) + "\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from meilisearch_python_sdk import AsyncClient
 from meilisearch_python_sdk.models.documents import DocumentsInfo
 from meilisearch_python_sdk.models.task import TaskInfo
 
-from meilisearch_fastapi._client import meilisearch_client
+from meilisearch_fastapi._auto_batch import send_auto_batches
+from meilisearch_fastapi._client import meilisearch_client, meilisearch_read_client
+from meilisearch_fastapi._config import MeilisearchConfig, get_config
+from meilisearch_fastapi._etags import conditional_response
+from meilisearch_fastapi._routing import MeilisearchRoute
+from meilisearch_fastapi._streaming import RecordChunks, send_documents
 from meilisearch_fastapi.models.document_info import (
     DocumentDelete,
     DocumentInfo,
+    DocumentInfoAutoBatch,
     DocumentInfoBatches,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=MeilisearchRoute.for_group("documents"))
 
 
 @router.post("/", response_model=TaskInfo, status_code=202, tags=["Meilisearch Documents"])
@@ -40,6 +46,63 @@ async def add_documents_in_batches(
     )
 
 
+@router.post(
+    "/auto-batch", response_model=list[TaskInfo], status_code=202, tags=["Meilisearch Documents"]
+)
+async def add_documents_auto_batch(
+    document_info: DocumentInfoAutoBatch,
+    client: AsyncClient = Depends(meilisearch_client),
+    config: MeilisearchConfig = Depends(get_config),
+) -> list[TaskInfo]:
+    """Adds documents in batches as large as fit under the max payload size.
+
+    `max_payload_size` defaults to `MEILISEARCH_MAX_PAYLOAD_SIZE`, and the task of each batch is
+    returned.
+    """
+    return await send_auto_batches(
+        client,
+        "POST",
+        document_info.uid,
+        document_info.documents,
+        document_info.max_payload_size or config.MEILISEARCH_MAX_PAYLOAD_SIZE,
+        document_info.primary_key,
+    )
+
+
+@router.post(
+    "/{uid}/stream", response_model=list[TaskInfo], status_code=202, tags=["Meilisearch Documents"]
+)
+async def add_documents_stream(
+    uid: str,
+    request: Request,
+    primary_key: str | None = None,
+    csv_delimiter: str | None = None,
+    client: AsyncClient = Depends(meilisearch_client),
+    config: MeilisearchConfig = Depends(get_config),
+) -> list[TaskInfo]:
+    """Adds documents from an NDJSON or CSV body without holding the whole body in memory.
+
+    The body is forwarded to Meilisearch as it arrives, split into chunks of whole documents of
+    about `MEILISEARCH_STREAM_CHUNK_SIZE` bytes each, and the task of each chunk is returned.
+    """
+    return await _stream_documents(client, "POST", uid, request, primary_key, csv_delimiter, config)
+
+
+@router.put(
+    "/{uid}/stream", response_model=list[TaskInfo], status_code=202, tags=["Meilisearch Documents"]
+)
+async def update_documents_stream(
+    uid: str,
+    request: Request,
+    primary_key: str | None = None,
+    csv_delimiter: str | None = None,
+    client: AsyncClient = Depends(meilisearch_client),
+    config: MeilisearchConfig = Depends(get_config),
+) -> list[TaskInfo]:
+    """Updates documents from an NDJSON or CSV body the same way documents are streamed in."""
+    return await _stream_documents(client, "PUT", uid, request, primary_key, csv_delimiter, config)
+
+
 @router.delete("/{uid}", response_model=TaskInfo, status_code=202, tags=["Meilisearch Documents"])
 async def delete_all_documents(
     uid: str, client: AsyncClient = Depends(meilisearch_client)
@@ -77,11 +140,12 @@ async def delete_documents(
 async def get_document(
     uid: str,
     document_id: str,
-    client: AsyncClient = Depends(meilisearch_client),
-) -> dict:
+    request: Request,
+    client: AsyncClient = Depends(meilisearch_read_client),
+) -> Response:
     index = client.index(uid)
 
-    return await index.get_document(document_id)
+    return conditional_response(request, await index.get_document(document_id))
 
 
 @router.get("/{uid}", response_model=DocumentsInfo, tags=["Meilisearch Documents"])
@@ -90,7 +154,7 @@ async def get_documents(
     limit: int = 20,
     offset: int = 0,
     fields: list[str] | None = None,
-    client: AsyncClient = Depends(meilisearch_client),
+    client: AsyncClient = Depends(meilisearch_read_client),
 ) -> DocumentsInfo:
     index = client.index(uid)
 
@@ -127,3 +191,53 @@ async def update_documents_in_batches(
         batch_size=document_info.batch_size,
         primary_key=document_info.primary_key,
     )
+
+
+@router.put(
+    "/auto-batch", response_model=list[TaskInfo], status_code=202, tags=["Meilisearch Documents"]
+)
+async def update_documents_auto_batch(
+    document_info: DocumentInfoAutoBatch,
+    client: AsyncClient = Depends(meilisearch_client),
+    config: MeilisearchConfig = Depends(get_config),
+) -> list[TaskInfo]:
+    """Updates documents in batches the same way documents are auto batched in."""
+    return await send_auto_batches(
+        client,
+        "PUT",
+        document_info.uid,
+        document_info.documents,
+        document_info.max_payload_size or config.MEILISEARCH_MAX_PAYLOAD_SIZE,
+        document_info.primary_key,
+    )
+
+
+async def _stream_documents(
+    client: AsyncClient,
+    method: str,
+    uid: str,
+    request: Request,
+    primary_key: str | None,
+    csv_delimiter: str | None,
+    config: MeilisearchConfig,
+) -> list[TaskInfo]:
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in ("application/x-ndjson", "application/ndjson"):
+        content_type = "application/x-ndjson"
+    elif media_type == "text/csv":
+        content_type = "text/csv"
+    else:
+        raise HTTPException(415, "Documents can be streamed as application/x-ndjson or text/csv")
+
+    chunks = RecordChunks(
+        request.stream(), config.MEILISEARCH_STREAM_CHUNK_SIZE, csv=content_type == "text/csv"
+    )
+    tasks = []
+    while await chunks.has_more():
+        tasks.append(
+            await send_documents(
+                client, method, uid, chunks.chunk(), content_type, primary_key, csv_delimiter
+            )
+        )
+
+    return tasks
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from meilisearch_python_sdk import AsyncClient
 from meilisearch_python_sdk.models.index import IndexBase, IndexInfo, IndexStats
 from meilisearch_python_sdk.models.settings import Faceting
 from meilisearch_python_sdk.models.task import TaskInfo
 from starlette.status import HTTP_202_ACCEPTED, HTTP_204_NO_CONTENT
 
-from meilisearch_fastapi._client import meilisearch_client
+from meilisearch_fastapi._client import meilisearch_client, meilisearch_read_client
 from meilisearch_fastapi._config import MeilisearchConfig, get_config
+from meilisearch_fastapi._etags import conditional_response, make_etag
+from meilisearch_fastapi._routing import MeilisearchRoute
 from meilisearch_fastapi.models.index import (
     DisplayedAttributes,
     DisplayedAttributesUID,
@@ -33,7 +35,7 @@ from meilisearch_fastapi.models.index import (
     TypoToleranceWithUID,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=MeilisearchRoute.for_group("indexes"))
 
 
 @router.post("/", response_model=IndexInfo, status_code=201, tags=["Meilisearch Index"])
@@ -201,7 +203,9 @@ async def delete_typo_tolerance(
 
 
 @router.get("/faceting/{uid}", response_model=Faceting, tags=["Meilisearch Index"])
-async def get_faceting(uid: str, client: AsyncClient = Depends(meilisearch_client)) -> Faceting:
+async def get_faceting(
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
+) -> Faceting:
     index = client.index(uid)
     faceting = await index.get_faceting()
 
@@ -213,7 +217,7 @@ async def get_faceting(uid: str, client: AsyncClient = Depends(meilisearch_clien
 )
 async def get_filterable_attributes(
     uid: str,
-    client: AsyncClient = Depends(meilisearch_client),
+    client: AsyncClient = Depends(meilisearch_read_client),
 ) -> FilterableAttributes:
     index = client.index(uid)
     filterable_attributes = await index.get_filterable_attributes()
@@ -225,7 +229,7 @@ async def get_filterable_attributes(
     "/displayed-attributes/{uid}", response_model=DisplayedAttributes, tags=["Meilisearch Index"]
 )
 async def get_displayed_attributes(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
 ) -> DisplayedAttributes:
     index = client.index(uid)
     displayed_attributes = await index.get_displayed_attributes()
@@ -237,7 +241,7 @@ async def get_displayed_attributes(
     "/attributes/distinct/{uid}", response_model=DistinctAttribute, tags=["Meilisearch Index"]
 )
 async def get_distinct_attribute(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
 ) -> DistinctAttribute:
     index = client.index(uid)
     attribute = await index.get_distinct_attribute()
@@ -248,19 +252,23 @@ async def get_distinct_attribute(
 @router.get("/{uid}", response_model=IndexInfo, tags=["Meilisearch Index"])
 async def get_index(
     uid: str,
-    client: AsyncClient = Depends(meilisearch_client),
-) -> IndexInfo:
+    request: Request,
+    client: AsyncClient = Depends(meilisearch_read_client),
+) -> Response:
     index = await client.get_raw_index(uid)
 
     if not index:
         raise HTTPException(404, "Index not found")
 
-    return index
+    # Meilisearch bumps `updated_at` whenever the index changes, so it stands in for the body.
+    etag = make_etag(f"{index.uid}:{index.primary_key}:{index.updated_at.isoformat()}".encode())
+
+    return conditional_response(request, index, etag)
 
 
 @router.get("/ranking-rules/{uid}", response_model=RankingRules, tags=["Meilisearch Index"])
 async def get_ranking_rules(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
 ) -> RankingRules:
     index = client.index(uid)
     ranking_rules = await index.get_ranking_rules()
@@ -269,7 +277,7 @@ async def get_ranking_rules(
 
 
 @router.get("/stats/{uid}", response_model=IndexStats, tags=["Meilisearch Index"])
-async def get_stats(uid: str, client: AsyncClient = Depends(meilisearch_client)) -> IndexStats:
+async def get_stats(uid: str, client: AsyncClient = Depends(meilisearch_read_client)) -> IndexStats:
     index = client.index(uid)
 
     return await index.get_stats()
@@ -277,7 +285,7 @@ async def get_stats(uid: str, client: AsyncClient = Depends(meilisearch_client))
 
 @router.get("/", response_model=list[IndexInfo], tags=["Meilisearch Index"])
 async def get_indexes(
-    client: AsyncClient = Depends(meilisearch_client),
+    client: AsyncClient = Depends(meilisearch_read_client),
 ) -> list[IndexInfo]:
     indexes = await client.get_raw_indexes()
 
@@ -289,7 +297,7 @@ async def get_indexes(
 
 @router.get("/primary-key/{uid}", response_model=PrimaryKey, tags=["Meilisearch Index"])
 async def get_primary_key(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
 ) -> PrimaryKey:
     index = client.index(uid)
     primary_key = await index.get_primary_key()
@@ -301,7 +309,7 @@ async def get_primary_key(
     "/searchable-attributes/{uid}", response_model=SearchableAttributes, tags=["Meilisearch Index"]
 )
 async def get_searchable_attributes(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
 ) -> SearchableAttributes:
     index = client.index(uid)
     attributes = await index.get_searchable_attributes()
@@ -313,7 +321,7 @@ async def get_searchable_attributes(
     "/sortable-attributes/{uid}", response_model=SortableAttributes, tags=["Meilisearch Index"]
 )
 async def get_sortable_attributes(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
 ) -> SortableAttributes:
     index = client.index(uid)
     attributes = await index.get_sortable_attributes()
@@ -322,7 +330,9 @@ async def get_sortable_attributes(
 
 
 @router.get("/stop-words/{uid}", response_model=StopWords, tags=["Meilisearch Index"])
-async def get_stop_words(uid: str, client: AsyncClient = Depends(meilisearch_client)) -> StopWords:
+async def get_stop_words(
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
+) -> StopWords:
     index = client.index(uid)
     stop_words = await index.get_stop_words()
 
@@ -330,7 +340,9 @@ async def get_stop_words(uid: str, client: AsyncClient = Depends(meilisearch_cli
 
 
 @router.get("/synonyms/{uid}", response_model=Synonyms, tags=["Meilisearch Index"])
-async def get_synonyms(uid: str, client: AsyncClient = Depends(meilisearch_client)) -> Synonyms:
+async def get_synonyms(
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
+) -> Synonyms:
     index = client.index(uid)
     synonyms = await index.get_synonyms()
 
@@ -339,7 +351,7 @@ async def get_synonyms(uid: str, client: AsyncClient = Depends(meilisearch_clien
 
 @router.get("/typo-tolerance/{uid}", response_model=TypoTolerance, tags=["Meilisearch Index"])
 async def get_typo_tolerance(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
+    uid: str, client: AsyncClient = Depends(meilisearch_read_client)
 ) -> TypoTolerance:
     index = client.index(uid)
     typo_tolerance = await index.get_typo_tolerance()
@@ -12,16 +12,53 @@ from meilisearch_python_sdk.models.health import Health
 from meilisearch_python_sdk.models.version import Version
 from starlette.status import HTTP_204_NO_CONTENT
 
-from meilisearch_fastapi._client import meilisearch_client
+from meilisearch_fastapi._admission import AdmissionControl, get_admission_control
+from meilisearch_fastapi._client import meilisearch_client, meilisearch_local_client
+from meilisearch_fastapi._compression import Compressor, get_compressor
+from meilisearch_fastapi._routing import MeilisearchRoute
+from meilisearch_fastapi._tenant_tokens import TenantTokenCache, get_tenant_token_cache
+from meilisearch_fastapi.models.admission import AdmissionStats
+from meilisearch_fastapi.models.compression import CompressionStats
 from meilisearch_fastapi.models.tenant_token import TenantToken, TenantTokenSettings
 
-router = APIRouter()
+router = APIRouter(route_class=MeilisearchRoute.for_group("meilisearch"))
+
+
+@router.get("/admission", response_model=AdmissionStats, tags=["Meilisearch"])
+async def get_admission_stats(
+    admission_control: AdmissionControl | None = Depends(get_admission_control),
+) -> AdmissionStats:
+    if admission_control is None:
+        raise HTTPException(404, "Admission control is not enabled")
+
+    return admission_control.stats()
+
+
+@router.get("/compression", response_model=CompressionStats, tags=["Meilisearch"])
+async def get_compression_stats(
+    compressor: Compressor | None = Depends(get_compressor),
+) -> CompressionStats:
+    if compressor is None:
+        raise HTTPException(404, "Response compression is not enabled")
+
+    return compressor.stats()
 
 
 @router.post("/generate-tenant-token", response_model=TenantToken, tags=["Meilisearch"])
 async def generate_tenant_token(
-    tenant_token_settings: TenantTokenSettings, client: AsyncClient = Depends(meilisearch_client)
+    tenant_token_settings: TenantTokenSettings,
+    client: AsyncClient = Depends(meilisearch_local_client),
+    tenant_token_cache: TenantTokenCache | None = Depends(get_tenant_token_cache),
 ) -> TenantToken:
+    if tenant_token_cache is not None:
+        token = tenant_token_cache.get(
+            tenant_token_settings.api_key,
+            tenant_token_settings.search_rules,
+            tenant_token_settings.expires_at,
+        )
+        if token is not None:
+            return TenantToken(tenant_token=token)
+
     try:
         token = client.generate_tenant_token(
             tenant_token_settings.search_rules,
@@ -33,6 +70,14 @@ async def generate_tenant_token(
     except ValueError as e:
         raise HTTPException(400, str(e)) from e
 
+    if tenant_token_cache is not None:
+        tenant_token_cache.set(
+            tenant_token_settings.api_key,
+            tenant_token_settings.search_rules,
+            tenant_token_settings.expires_at,
+            token,
+        )
+
     return TenantToken(tenant_token=token)
 
 
@@ -47,8 +92,14 @@ async def create_key(key: KeyCreate, client: AsyncClient = Depends(meilisearch_c
 
 
 @router.delete("/keys/{key}", status_code=HTTP_204_NO_CONTENT, tags=["Meilisearch"])
-async def delete_key(key: str, client: AsyncClient = Depends(meilisearch_client)) -> None:
+async def delete_key(
+    key: str,
+    client: AsyncClient = Depends(meilisearch_client),
+    tenant_token_cache: TenantTokenCache | None = Depends(get_tenant_token_cache),
+) -> None:
     await client.delete_key(key)
+    if tenant_token_cache is not None:
+        tenant_token_cache.evict(key)
 
 
 @router.get("/keys", response_model=KeySearch, tags=["Meilisearch"])
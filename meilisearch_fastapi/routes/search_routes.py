@@ -1,17 +1,638 @@
-from fastapi import APIRouter, Depends
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Sequence
+from time import perf_counter
+from typing import Any, cast
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from meilisearch_python_sdk import AsyncClient
-from meilisearch_python_sdk.models.search import SearchResults
+from meilisearch_python_sdk.models.search import SearchParams, SearchResults, SearchResultsWithUID
 
-from meilisearch_fastapi._client import meilisearch_client
-from meilisearch_fastapi.models.search_parameters import SearchParameters
+from meilisearch_fastapi._client import meilisearch_read_client
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._cursor import (
+    Cursor,
+    CursorError,
+    added_attributes,
+    check_ranking_rules,
+    drop_attributes,
+    hit_values,
+    keyset_filter,
+    search_fingerprint,
+    sort_attributes,
+)
+from meilisearch_fastapi._facet_cache import FacetCache, get_facet_cache
+from meilisearch_fastapi._filters import (
+    FilterableAttributesCache,
+    FilterError,
+    get_filterable_attributes_cache,
+)
+from meilisearch_fastapi._index_tasks import IndexTasks, get_index_tasks
+from meilisearch_fastapi._projections import (
+    ProjectionError,
+    SearchParametersT,
+    apply_projection,
+)
+from meilisearch_fastapi._query_log import QueryLog, get_query_log
+from meilisearch_fastapi._routing import MeilisearchRoute
+from meilisearch_fastapi._search_batcher import SearchBatcher, get_search_batcher
+from meilisearch_fastapi._search_cache import SearchCache, get_search_cache, search_cache_key
+from meilisearch_fastapi._singleflight import SingleFlight, get_search_flights
+from meilisearch_fastapi._typeahead import (
+    TypeaheadCache,
+    can_narrow,
+    get_typeahead_cache,
+    narrow,
+    query_words,
+    typeahead_signature,
+)
+from meilisearch_fastapi.models.search_cache import (
+    FacetCacheStats,
+    SearchBatcherStats,
+    SearchCacheStats,
+    TypeaheadCacheStats,
+)
+from meilisearch_fastapi.models.search_parameters import (
+    CursorSearchParameters,
+    FacetSearchParameters,
+    FederatedSearchParameters,
+    MultiSearchParameters,
+    SearchExportParameters,
+    SearchParameters,
+    TypeaheadSearchParameters,
+)
+from meilisearch_fastapi.models.search_results import (
+    CursorSearchResults,
+    FacetSearchResults,
+    FederatedSearchResults,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=MeilisearchRoute.for_group("search"))
 
 
 @router.post("/", response_model=SearchResults, tags=["Meilisearch Search"])
 async def search(
-    search_parameters: SearchParameters, client: AsyncClient = Depends(meilisearch_client)
+    search_parameters: SearchParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+    search_cache: SearchCache | None = Depends(get_search_cache),
+    search_flights: SingleFlight[SearchResults] | None = Depends(get_search_flights),
+    search_batcher: SearchBatcher | None = Depends(get_search_batcher),
+    index_tasks: IndexTasks = Depends(get_index_tasks),
+    query_log: QueryLog | None = Depends(get_query_log),
+) -> SearchResults:
+    async def run() -> SearchResults:
+        projected = _project(search_parameters)
+        await _check_filters(client, filterable_attributes, [projected])
+
+        return await _cached_search(
+            client, projected, search_cache, search_flights, index_tasks, search_batcher
+        )
+
+    if query_log is None or not query_log.sampled():
+        return await run()
+
+    start = perf_counter()
+    status = 500
+    hits = None
+    try:
+        results = await run()
+        status = 200
+        hits = results.estimated_total_hits or results.total_hits or len(results.hits)
+        return results
+    except HTTPException as e:
+        status = e.status_code
+        raise
+    finally:
+        # The parameters as they were sent, so a replay goes through projections and filter
+        # checks too.
+        query_log.record(
+            "search",
+            search_parameters.model_dump(mode="json", by_alias=True, exclude_unset=True),
+            perf_counter() - start,
+            status,
+            hits,
+        )
+
+
+@router.post("/cursor", response_model=CursorSearchResults, tags=["Meilisearch Search"])
+async def cursor_search(
+    cursor_search_parameters: CursorSearchParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+    search_cache: SearchCache | None = Depends(get_search_cache),
+    search_flights: SingleFlight[SearchResults] | None = Depends(get_search_flights),
+    search_batcher: SearchBatcher | None = Depends(get_search_batcher),
+    index_tasks: IndexTasks = Depends(get_index_tasks),
+) -> CursorSearchResults:
+    """Search that pages with an opaque cursor instead of an offset.
+
+    Each page is filtered down to the hits that come after the previous page's last hit in the
+    sort order, so deep pages cost the same as the first one and aren't capped by `maxTotalHits`.
+    The sort attributes and the index's primary key have to be filterable, and the sort has to
+    decide the order of the hits: no custom ranking rule can come before `sort`, and searches
+    with a query need `sort` to be the first ranking rule. Pass the `nextCursor` of a page as the
+    `cursor` of the same search to get the next one.
+    """
+    cursor_search_parameters = _project(cursor_search_parameters)
+    uid = cursor_search_parameters.uid
+    limit = cursor_search_parameters.limit
+
+    try:
+        sort = sort_attributes(cursor_search_parameters.sort)
+        fingerprint = search_fingerprint(cursor_search_parameters)
+        cursor = None
+        if cursor_search_parameters.cursor:
+            cursor = Cursor.decode(cursor_search_parameters.cursor)
+            if cursor.fingerprint != fingerprint or len(cursor.values) != len(sort):
+                raise CursorError("The cursor belongs to a different search")
+    except CursorError as e:
+        raise HTTPException(400, str(e)) from e
+
+    if cursor is None:
+        index = client.index(uid)
+        primary_key, ranking_rules = await asyncio.gather(
+            index.get_primary_key(), index.get_ranking_rules()
+        )
+        try:
+            check_ranking_rules(ranking_rules, cursor_search_parameters.query)
+        except CursorError as e:
+            raise HTTPException(400, str(e)) from e
+        filter = cursor_search_parameters.filter
+    else:
+        primary_key = cursor.primary_key
+        filter = _and_filters(cursor_search_parameters.filter, keyset_filter(sort, cursor))
+
+    attributes = [attribute for attribute, _ in sort]
+    attributes_to_retrieve = cursor_search_parameters.attributes_to_retrieve
+    # The sort values and primary key of each hit are needed for the cursor but are only returned
+    # if they were asked for.
+    added: list[str] = []
+    if "*" not in attributes_to_retrieve:
+        added = added_attributes(
+            attributes_to_retrieve, [*attributes, *([primary_key] if primary_key else [])]
+        )
+        attributes_to_retrieve = [*attributes_to_retrieve, *added]
+
+    search_parameters = SearchParameters.model_validate(
+        cursor_search_parameters.model_dump(exclude={"cursor"})
+        | {
+            "filter": filter,
+            "offset": 0,
+            "page": None,
+            "hits_per_page": None,
+            "attributes_to_retrieve": attributes_to_retrieve,
+        }
+    )
+    await _check_filters(client, filterable_attributes, [search_parameters])
+    results = await _cached_search(
+        client, search_parameters, search_cache, search_flights, index_tasks, search_batcher
+    )
+
+    next_cursor = None
+    if len(results.hits) == limit and primary_key is not None:
+        values = hit_values(results.hits[-1], attributes)
+        # Without the last hit's sort values there is nothing to continue from.
+        if values is not None and primary_key in results.hits[-1]:
+            seen = [
+                hit[primary_key]
+                for hit in results.hits
+                if primary_key in hit and hit_values(hit, attributes) == values
+            ]
+            if cursor is not None and cursor.values == values:
+                seen = cursor.seen + seen
+            next_cursor = Cursor(fingerprint, primary_key, values, seen).encode()
+
+    return CursorSearchResults(
+        hits=[drop_attributes(hit, added) for hit in results.hits] if added else results.hits,
+        limit=limit,
+        processing_time_ms=results.processing_time_ms,
+        query=results.query,
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/typeahead", response_model=SearchResults, tags=["Meilisearch Search"])
+async def typeahead_search(
+    typeahead_search_parameters: TypeaheadSearchParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+    search_cache: SearchCache | None = Depends(get_search_cache),
+    search_flights: SingleFlight[SearchResults] | None = Depends(get_search_flights),
+    search_batcher: SearchBatcher | None = Depends(get_search_batcher),
+    index_tasks: IndexTasks = Depends(get_index_tasks),
+    typeahead_cache: TypeaheadCache = Depends(get_typeahead_cache),
+) -> SearchResults:
+    """Search for search-as-you-type boxes that send a search on every keystroke.
+
+    Once a query has few enough hits to hold all of them, searches that extend it with more
+    characters or words are answered from those hits without asking Meilisearch. Passing a
+    `session` keeps each user's hits apart. The hits are matched without typo tolerance, so a
+    longer query can miss hits Meilisearch would have found with a typo.
+    """
+    typeahead_search_parameters = _project(typeahead_search_parameters)
+    await _check_filters(client, filterable_attributes, [typeahead_search_parameters])
+
+    search_parameters = SearchParameters.model_validate(
+        typeahead_search_parameters.model_dump(exclude={"session"})
+    )
+    if not can_narrow(typeahead_search_parameters):
+        return await _cached_search(
+            client, search_parameters, search_cache, search_flights, index_tasks, search_batcher
+        )
+
+    uid = search_parameters.uid
+    offset = search_parameters.offset
+    limit = search_parameters.limit
+    signature = typeahead_signature(typeahead_search_parameters)
+    words = query_words(search_parameters.query)
+
+    window = typeahead_cache.get(signature, words)
+    if window is not None:
+        hits = narrow(
+            window.hits, words, search_parameters.matching_strategy, window.searchable_attributes
+        )
+        return SearchResults(
+            hits=hits[offset : offset + limit],
+            offset=offset,
+            limit=limit,
+            estimated_total_hits=len(hits),
+            processing_time_ms=0,
+            query=search_parameters.query or "",
+        )
+
+    generation = index_tasks.generation(uid)
+    results = await _cached_search(
+        client, search_parameters, search_cache, search_flights, index_tasks, search_batcher
+    )
+
+    # With every hit already returned only the searchable attributes have to be read.
+    complete = offset == 0 and len(results.hits) < limit
+
+    async def fetch(count: int) -> list[dict[str, Any]]:
+        if complete:
+            return results.hits
+
+        found = await _search(
+            client, search_parameters.model_copy(update={"offset": 0, "limit": count})
+        )
+        return found.hits
+
+    async def searchable_attributes() -> list[str]:
+        return await client.index(uid).get_searchable_attributes()
+
+    if complete or (results.estimated_total_hits or 0) <= typeahead_cache.window:
+        typeahead_cache.fill(signature, uid, words, fetch, searchable_attributes, generation)
+
+    return results
+
+
+@router.post("/facets", response_model=FacetSearchResults, tags=["Meilisearch Search"])
+async def facet_search(
+    facet_search_parameters: FacetSearchParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+    facet_cache: FacetCache = Depends(get_facet_cache),
+) -> FacetSearchResults:
+    """Facet distribution for the documents that match a filter, for facet panels.
+
+    Distributions are cached and fetched again in the background after writes to the index.
+    """
+    await _check_filters(client, filterable_attributes, [facet_search_parameters])
+
+    return await facet_cache.get(client, facet_search_parameters)
+
+
+@router.post("/federated", response_model=FederatedSearchResults, tags=["Meilisearch Search"])
+async def federated_search(
+    federated_search_parameters: FederatedSearchParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+    search_cache: SearchCache | None = Depends(get_search_cache),
+    search_flights: SingleFlight[SearchResults] | None = Depends(get_search_flights),
+    search_batcher: SearchBatcher | None = Depends(get_search_batcher),
+    index_tasks: IndexTasks = Depends(get_index_tasks),
+) -> FederatedSearchResults:
+    """Searches several indexes at once and merges the hits by their weighted ranking score.
+
+    Each index is asked for enough hits to fill the requested page on its own, so the offset and
+    limit of the individual queries are ignored.
+    """
+    offset = federated_search_parameters.offset
+    limit = federated_search_parameters.limit
+    queries = [_project(query) for query in federated_search_parameters.queries]
+    await _check_filters(client, filterable_attributes, queries)
+
+    all_results = await asyncio.gather(
+        *[
+            _cached_search(
+                client,
+                SearchParameters.model_validate(
+                    query.model_dump(exclude={"weight"})
+                    | {
+                        "offset": 0,
+                        "limit": offset + limit,
+                        "page": None,
+                        "hits_per_page": None,
+                        "show_ranking_score": True,
+                    }
+                ),
+                search_cache,
+                search_flights,
+                index_tasks,
+                search_batcher,
+            )
+            for query in queries
+        ]
+    )
+
+    hits = [
+        {
+            **hit,
+            "_federation": {
+                "indexUid": query.uid,
+                "queriesPosition": position,
+                "weightedRankingScore": hit.get("_rankingScore", 0.0) * query.weight,
+            },
+        }
+        for position, (query, results) in enumerate(zip(queries, all_results))
+        for hit in results.hits
+    ]
+    hits.sort(key=lambda hit: hit["_federation"]["weightedRankingScore"], reverse=True)
+
+    return FederatedSearchResults(
+        hits=hits[offset : offset + limit],
+        offset=offset,
+        limit=limit,
+        estimated_total_hits=sum(
+            results.estimated_total_hits or results.total_hits or 0 for results in all_results
+        ),
+        processing_time_ms=max((results.processing_time_ms for results in all_results), default=0),
+    )
+
+
+@router.post("/multi", response_model=list[SearchResultsWithUID], tags=["Meilisearch Search"])
+async def multi_search(
+    multi_search_parameters: MultiSearchParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+    search_cache: SearchCache | None = Depends(get_search_cache),
+    index_tasks: IndexTasks = Depends(get_index_tasks),
+) -> list[SearchResultsWithUID]:
+    queries = [_project(query) for query in multi_search_parameters.queries]
+    await _check_filters(client, filterable_attributes, queries)
+
+    results: list[SearchResultsWithUID | None] = [None] * len(queries)
+    keys = [search_cache_key(search_parameters) for search_parameters in queries]
+
+    if search_cache is not None:
+        for i, (search_parameters, key) in enumerate(zip(queries, keys)):
+            cached = search_cache.get(key)
+            if cached is not None:
+                results[i] = SearchResultsWithUID(
+                    index_uid=search_parameters.uid, **cached.model_dump(exclude={"index_uid"})
+                )
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    if misses:
+        generations = [index_tasks.generation(queries[i].uid) for i in misses]
+        # Without federation Meilisearch returns one result per query, in order.
+        found = cast(
+            list[SearchResultsWithUID],
+            await client.multi_search([_search_params(queries[i]) for i in misses]),
+        )
+
+        for i, generation, result in zip(misses, generations, found):
+            results[i] = result
+            if search_cache is not None:
+                # Cached as plain results so /search doesn't return the `indexUid`.
+                cached = SearchResults(**result.model_dump(exclude={"index_uid"}))
+                search_cache.set(keys[i], queries[i].uid, cached, generation)
+
+    return [result for result in results if result is not None]
+
+
+@router.post("/raw", response_class=Response, tags=["Meilisearch Search"])
+async def raw_search(
+    search_parameters: SearchParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+) -> Response:
+    """Search that returns Meilisearch's response body untouched.
+
+    The results aren't parsed into a `SearchResults` model, validated, or serialized again, which
+    saves a lot of work for searches that return many large hits. The search cache isn't used.
+    """
+    search_parameters = _project(search_parameters)
+    await _check_filters(client, filterable_attributes, [search_parameters])
+
+    body = _search_params(search_parameters).model_dump(by_alias=True, exclude_none=True)
+    del body["indexUid"]
+    response = await client._http_requests.post(f"indexes/{search_parameters.uid}/search", body)
+
+    return Response(response.content, media_type="application/json")
+
+
+@router.post("/export", response_class=StreamingResponse, tags=["Meilisearch Search"])
+async def export_search(
+    search_export_parameters: SearchExportParameters,
+    client: AsyncClient = Depends(meilisearch_read_client),
+    filterable_attributes: FilterableAttributesCache | None = Depends(
+        get_filterable_attributes_cache
+    ),
+) -> StreamingResponse:
+    """Streams every hit of a search as newline delimited JSON.
+
+    Hits are requested from Meilisearch `batch_size` at a time, starting at `offset`, until there
+    are no more or `max_hits` have been sent. The `limit` of the search is ignored. The number of
+    hits that can be reached is still capped by the index's `maxTotalHits` setting.
+    """
+    search_export_parameters = _project(search_export_parameters)
+    await _check_filters(client, filterable_attributes, [search_export_parameters])
+
+    return StreamingResponse(
+        _export_hits(client, search_export_parameters), media_type="application/x-ndjson"
+    )
+
+
+@router.get("/projections/{uid}", response_model=dict[str, list[str]], tags=["Meilisearch Search"])
+async def get_projections(uid: str) -> dict[str, list[str]]:
+    """The projections that can be used for searches on the index, by name."""
+    return get_config().MEILISEARCH_PROJECTIONS.get(uid, {})
+
+
+@router.get("/cache", response_model=SearchCacheStats, tags=["Meilisearch Search"])
+async def get_search_cache_stats(
+    search_cache: SearchCache | None = Depends(get_search_cache),
+) -> SearchCacheStats:
+    if search_cache is None:
+        raise HTTPException(404, "The search cache is not enabled")
+
+    return search_cache.stats()
+
+
+@router.get("/batcher", response_model=SearchBatcherStats, tags=["Meilisearch Search"])
+async def get_search_batcher_stats(
+    search_batcher: SearchBatcher | None = Depends(get_search_batcher),
+) -> SearchBatcherStats:
+    if search_batcher is None:
+        raise HTTPException(404, "Search batching is not enabled")
+
+    return search_batcher.stats()
+
+
+@router.get("/facets/cache", response_model=FacetCacheStats, tags=["Meilisearch Search"])
+async def get_facet_cache_stats(
+    facet_cache: FacetCache = Depends(get_facet_cache),
+) -> FacetCacheStats:
+    return facet_cache.stats()
+
+
+@router.get("/typeahead/cache", response_model=TypeaheadCacheStats, tags=["Meilisearch Search"])
+async def get_typeahead_cache_stats(
+    typeahead_cache: TypeaheadCache = Depends(get_typeahead_cache),
+) -> TypeaheadCacheStats:
+    return typeahead_cache.stats()
+
+
+def _project(search_parameters: SearchParametersT) -> SearchParametersT:
+    try:
+        return apply_projection(search_parameters, get_config().MEILISEARCH_PROJECTIONS)
+    except ProjectionError as e:
+        raise HTTPException(400, str(e)) from e
+
+
+def _and_filters(
+    first: str | list[str | list[str]] | None, second: str
+) -> str | list[str | list[str]]:
+    if first is None:
+        return second
+    if isinstance(first, str):
+        return [first, second]
+
+    return [*first, second]
+
+
+async def _check_filters(
+    client: AsyncClient,
+    filterable_attributes: FilterableAttributesCache | None,
+    queries: Sequence[SearchParameters | FacetSearchParameters],
+) -> None:
+    """Rejects filters on attributes that aren't filterable with a 400."""
+    if filterable_attributes is None:
+        return
+
+    try:
+        await asyncio.gather(
+            *[filterable_attributes.check(client, q.uid, q.filter) for q in queries if q.filter]
+        )
+    except FilterError as e:
+        raise HTTPException(400, str(e)) from e
+
+
+async def _export_hits(
+    client: AsyncClient, search_export_parameters: SearchExportParameters
+) -> AsyncIterator[bytes]:
+    offset = search_export_parameters.offset
+    remaining = search_export_parameters.max_hits
+
+    def fetch_page() -> asyncio.Future[SearchResults] | None:
+        limit = search_export_parameters.batch_size
+        if remaining is not None:
+            limit = min(limit, remaining)
+
+        if limit <= 0:
+            return None
+
+        page = search_export_parameters.model_copy(
+            update={"offset": offset, "limit": limit, "page": None, "hits_per_page": None}
+        )
+
+        return asyncio.ensure_future(_search(client, page))
+
+    # The next page is requested before the current one is written so Meilisearch and the
+    # response are working at the same time.
+    next_page = fetch_page()
+    try:
+        while next_page is not None:
+            results = await next_page
+            next_page = None
+            offset += len(results.hits)
+            if remaining is not None:
+                remaining -= len(results.hits)
+
+            if len(results.hits) == results.limit:
+                next_page = fetch_page()
+
+            yield b"".join(
+                json.dumps(hit, separators=(",", ":")).encode() + b"\n" for hit in results.hits
+            )
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+
+async def _cached_search(
+    client: AsyncClient,
+    search_parameters: SearchParameters,
+    search_cache: SearchCache | None,
+    search_flights: SingleFlight[SearchResults] | None,
+    index_tasks: IndexTasks,
+    search_batcher: SearchBatcher | None = None,
+) -> SearchResults:
+    if search_cache is None and search_flights is None:
+        return await _search(client, search_parameters, search_batcher)
+
+    key = search_cache_key(search_parameters)
+    generation = index_tasks.generation(search_parameters.uid)
+
+    async def fetch() -> SearchResults:
+        results = await _search(client, search_parameters, search_batcher)
+        if search_cache is not None:
+            search_cache.set(key, search_parameters.uid, results, generation)
+
+        return results
+
+    async def fly() -> SearchResults:
+        if search_flights is None:
+            return await fetch()
+
+        # Searches that start after a write don't join a flight that started before it.
+        return await search_flights.do((key, generation), fetch)
+
+    if search_cache is not None:
+        results = search_cache.get(key, fly)
+        if results is not None:
+            return results
+
+    return await fly()
+
+
+async def _search(
+    client: AsyncClient,
+    search_parameters: SearchParameters,
+    search_batcher: SearchBatcher | None = None,
 ) -> SearchResults:
+    if search_batcher is not None:
+        return await search_batcher.search(client, _search_params(search_parameters))
+
     index = client.index(search_parameters.uid)
 
     return await index.search(
@@ -32,4 +653,29 @@ async def search(
         matching_strategy=search_parameters.matching_strategy,
         hits_per_page=search_parameters.hits_per_page,
         page=search_parameters.page,
+        show_ranking_score=search_parameters.show_ranking_score,
+    )
+
+
+def _search_params(search_parameters: SearchParameters) -> SearchParams:
+    return SearchParams(
+        index_uid=search_parameters.uid,
+        q=search_parameters.query,
+        offset=search_parameters.offset,
+        limit=search_parameters.limit,
+        filter=search_parameters.filter,
+        facets=search_parameters.facets,
+        attributes_to_retrieve=search_parameters.attributes_to_retrieve,
+        attributes_to_crop=search_parameters.attributes_to_crop,
+        sort=search_parameters.sort,
+        crop_length=search_parameters.crop_length,
+        attributes_to_highlight=search_parameters.attributes_to_highlight,
+        show_matches_position=search_parameters.show_matches_position,
+        highlight_pre_tag=search_parameters.highlight_pre_tag,
+        highlight_post_tag=search_parameters.highlight_post_tag,
+        crop_marker=search_parameters.crop_marker,
+        matching_strategy=search_parameters.matching_strategy,
+        hits_per_page=search_parameters.hits_per_page,
+        page=search_parameters.page,
+        show_ranking_score=search_parameters.show_ranking_score,
     )
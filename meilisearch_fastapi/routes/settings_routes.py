@@ -1,36 +1,30 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from meilisearch_python_sdk import AsyncClient
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
 from meilisearch_python_sdk.models.task import TaskInfo
 
-from meilisearch_fastapi._client import meilisearch_client
-from meilisearch_fastapi._config import MeilisearchConfig, get_config
+from meilisearch_fastapi._client import meilisearch_client, meilisearch_read_client
+from meilisearch_fastapi._etags import conditional_response
+from meilisearch_fastapi._routing import MeilisearchRoute
 from meilisearch_fastapi.models.settings import MeilisearchIndexSettings
 
-router = APIRouter()
+router = APIRouter(route_class=MeilisearchRoute.for_group("settings"))
 
 
 @router.get("/{uid}", response_model=MeilisearchSettings, tags=["Meilisearch Settings"])
 async def get_settings(
-    uid: str, client: AsyncClient = Depends(meilisearch_client)
-) -> MeilisearchSettings:
+    uid: str, request: Request, client: AsyncClient = Depends(meilisearch_read_client)
+) -> Response:
     index = client.index(uid)
 
-    return await index.get_settings()
+    return conditional_response(request, await index.get_settings())
 
 
 @router.delete("/{uid}", response_model=TaskInfo, tags=["Meilisearch Settings"])
-async def delete_settings(
-    uid: str,
-    client: AsyncClient = Depends(meilisearch_client),
-    config: MeilisearchConfig = Depends(get_config),
-) -> TaskInfo:
-    async with AsyncClient(
-        url=config.MEILISEARCH_URL, api_key=config.MEILISEARCH_API_KEY
-    ) as client:
-        index = client.index(uid)
+async def delete_settings(uid: str, client: AsyncClient = Depends(meilisearch_client)) -> TaskInfo:
+    index = client.index(uid)
 
-        return await index.reset_settings()
+    return await index.reset_settings()
 
 
 @router.patch("/", response_model=TaskInfo, tags=["Meilisearch Settings"])
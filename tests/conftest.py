@@ -6,7 +6,20 @@ import pytest
 from fastapi import APIRouter, FastAPI
 from httpx import ASGITransport, AsyncClient
 
+from meilisearch_fastapi import meilisearch_lifespan
+from meilisearch_fastapi._admission import get_admission_control
+from meilisearch_fastapi._compression import get_compressor
 from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._facet_cache import get_facet_cache
+from meilisearch_fastapi._filters import get_filterable_attributes_cache
+from meilisearch_fastapi._index_tasks import get_index_tasks
+from meilisearch_fastapi._query_log import get_query_log
+from meilisearch_fastapi._rate_limit import get_rate_limiter
+from meilisearch_fastapi._search_batcher import get_search_batcher
+from meilisearch_fastapi._search_cache import get_search_cache
+from meilisearch_fastapi._singleflight import get_search_flights
+from meilisearch_fastapi._tenant_tokens import get_tenant_token_cache
+from meilisearch_fastapi._typeahead import get_typeahead_cache
 from meilisearch_fastapi.routes import (
     document_routes,
     index_routes,
@@ -71,18 +84,36 @@ async def fastapi_test_client():
 
     app.include_router(api_router)
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app),  # type: ignore
-        base_url="http://test/",
-        follow_redirects=True,
-    ) as ac:
-        yield ac
+    async with meilisearch_lifespan(app):
+        async with AsyncClient(
+            transport=ASGITransport(app=app),  # type: ignore
+            base_url="http://test/",
+            follow_redirects=True,
+        ) as ac:
+            yield ac
 
 
 @pytest.fixture(autouse=True)
 def clear_config_cache():
     yield
+    # Only a log the test opened is closed, calling get_query_log otherwise would open one.
+    if get_query_log.cache_info().currsize:
+        query_log = get_query_log()
+        if query_log is not None:
+            query_log.close()
     get_config.cache_clear()
+    get_admission_control.cache_clear()
+    get_compressor.cache_clear()
+    get_index_tasks.cache_clear()
+    get_facet_cache.cache_clear()
+    get_filterable_attributes_cache.cache_clear()
+    get_query_log.cache_clear()
+    get_rate_limiter.cache_clear()
+    get_search_batcher.cache_clear()
+    get_search_cache.cache_clear()
+    get_search_flights.cache_clear()
+    get_tenant_token_cache.cache_clear()
+    get_typeahead_cache.cache_clear()
 
 
 @pytest.fixture
@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from meilisearch_fastapi import _routing
+from meilisearch_fastapi._admission import AdmissionControl, AdmissionRejected
+from meilisearch_fastapi._routing import MeilisearchRoute, request_index
+
+
+def admission_control(
+    max_concurrent=2,
+    max_concurrent_per_index=1,
+    queue_size=2,
+    index_queue_size=1,
+    queue_timeout=1.0,
+):
+    return AdmissionControl(
+        max_concurrent=max_concurrent,
+        max_concurrent_per_index=max_concurrent_per_index,
+        queue_size=queue_size,
+        index_queue_size=index_queue_size,
+        queue_timeout=queue_timeout,
+    )
+
+
+async def hold(control, uid, release):
+    async with control.admit(uid):
+        await release.wait()
+
+
+async def test_admits_up_to_the_caps():
+    control = admission_control()
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(hold(control, uid, release)) for uid in ("a", "b")]
+    await asyncio.sleep(0)
+
+    assert control.stats().active == 2
+    assert control.stats().indexes["a"].active == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert control.stats().active == 0
+    assert control.stats().admitted == 2
+    assert control.stats().indexes == {}
+
+
+async def test_admitted_right_away_is_not_counted_as_waiting():
+    control = admission_control()
+
+    async with control.admit("a"):
+        assert control.stats().waiting == 0
+        assert control.stats().indexes["a"].waiting == 0
+
+    assert control.stats().max_waiting == 0
+
+
+async def test_waits_for_the_index_slot():
+    control = admission_control()
+    release = asyncio.Event()
+    first = asyncio.create_task(hold(control, "a", release))
+    second = asyncio.create_task(hold(control, "a", release))
+    await asyncio.sleep(0)
+
+    stats = control.stats()
+    assert stats.active == 1
+    assert stats.waiting == 1
+    assert stats.indexes["a"].waiting == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert control.stats().admitted == 2
+    assert control.stats().max_waiting == 1
+    assert control.stats().max_wait_ms > 0
+
+
+async def test_busy_index_is_rejected_with_429():
+    control = admission_control()
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(hold(control, "a", release)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as e:
+        async with control.admit("a"):
+            pass
+
+    assert e.value.status_code == 429
+    assert e.value.headers == {"Retry-After": "1"}
+    assert control.stats().rejected_index_queue_full == 1
+
+    # Other indexes still get through.
+    async with control.admit("b"):
+        pass
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_full_queue_is_rejected_with_503():
+    control = admission_control(max_concurrent=1, queue_size=1, index_queue_size=5)
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(hold(control, uid, release)) for uid in ("a", "b")]
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as e:
+        async with control.admit("c"):
+            pass
+
+    assert e.value.status_code == 503
+    assert control.stats().rejected_queue_full == 1
+    assert "c" not in control.stats().indexes
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_wait_times_out_with_503():
+    control = admission_control(max_concurrent=1, queue_timeout=0.01)
+    release = asyncio.Event()
+    task = asyncio.create_task(hold(control, "a", release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as e:
+        async with control.admit("b"):
+            pass
+
+    assert e.value.status_code == 503
+    assert control.stats().timed_out == 1
+    assert control.stats().waiting == 0
+    assert "b" not in control.stats().indexes
+
+    release.set()
+    await task
+
+    # The slot that timed out wasn't leaked.
+    async with control.admit("b"):
+        assert control.stats().active == 1
+
+
+@pytest.fixture
+async def index_client():
+    app = FastAPI()
+
+    @app.api_route("/{uid}", methods=["GET"])
+    @app.api_route("/", methods=["POST"])
+    async def index(request: Request) -> dict:
+        return {"uid": await request_index(request)}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_request_index(index_client):
+    assert (await index_client.get("/movies")).json() == {"uid": "movies"}
+    assert (await index_client.post("/", json={"uid": "movies"})).json() == {"uid": "movies"}
+    assert (await index_client.post("/", json=[{"uid": "movies"}])).json() == {"uid": None}
+    assert (await index_client.post("/", content=b"{")).json() == {"uid": None}
+
+
+async def test_streamed_responses_hold_their_slot_until_sent(monkeypatch):
+    control = admission_control()
+    monkeypatch.setattr(_routing, "get_admission_control", lambda: control)
+    active_while_streaming = []
+    router = APIRouter(route_class=MeilisearchRoute.for_group("search"))
+
+    @router.get("/{uid}/export")
+    async def export(uid: str) -> StreamingResponse:
+        async def body():
+            for line in (b"a\n", b"b\n"):
+                await asyncio.sleep(0)
+                active_while_streaming.append(control.stats().indexes[uid].active)
+                yield line
+
+        return StreamingResponse(body())
+
+    app = FastAPI()
+    app.include_router(router)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/movies/export")
+
+    assert response.text == "a\nb\n"
+    assert active_while_streaming == [1, 1]
+    assert control.stats().active == 0
+    assert control.stats().indexes == {}
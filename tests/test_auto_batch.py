@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from meilisearch_fastapi._auto_batch import DocumentTooLarge, payload_batches
+from meilisearch_fastapi._responses import dumps
+
+MOVIES = json.loads((Path(__file__).parent / "assets" / "small_movies.json").read_text())
+
+
+@pytest.mark.parametrize("max_payload_size", [2_000, 10_000, 100_000, 100_000_000])
+def test_payload_batches_fit_under_max_payload_size(max_payload_size):
+    batches = payload_batches(MOVIES, max_payload_size)
+
+    assert [movie for batch in batches for movie in json.loads(batch)] == MOVIES
+    assert all(len(batch) <= max_payload_size for batch in batches)
+
+
+@pytest.mark.parametrize("max_payload_size", [2_000, 10_000, 100_000])
+def test_payload_batches_are_full(max_payload_size):
+    batches = payload_batches(MOVIES, max_payload_size)
+
+    for batch, following in zip(batches, batches[1:]):
+        first = dumps(json.loads(following)[0])
+        assert len(batch) + 1 + len(first) > max_payload_size
+
+
+def test_payload_batches_exact_fit():
+    documents = [{"id": i} for i in range(4)]
+    size = len(dumps(documents[:2]))
+
+    batches = payload_batches(documents, size)
+
+    assert [json.loads(batch) for batch in batches] == [documents[:2], documents[2:]]
+    assert batches[0] == dumps(documents[:2])
+
+
+def test_payload_batches_single_batch():
+    assert payload_batches(MOVIES, 100_000_000) == [dumps(MOVIES)]
+
+
+def test_payload_batches_no_documents():
+    assert payload_batches([], 1_000) == []
+
+
+def test_payload_batches_document_too_large():
+    documents: list[dict] = [{"id": 1}, {"id": 2, "overview": "x" * 1_000}]
+
+    with pytest.raises(DocumentTooLarge) as e:
+        payload_batches(documents, 500)
+
+    assert e.value.status_code == 413
+    assert "Document 1" in e.value.detail
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from httpx import ConnectError, ReadTimeout, Request, Response
+from meilisearch_python_sdk.errors import MeilisearchApiError, MeilisearchCommunicationError
+from meilisearch_python_sdk.models.health import Health
+
+from meilisearch_fastapi._circuit_breaker import CircuitBreaker, is_node_failure
+
+
+class FakeClient:
+    def __init__(self, status="available", delay=0.0):
+        self.status = status
+        self.delay = delay
+        self.probes = 0
+
+    async def health(self):
+        self.probes += 1
+        await asyncio.sleep(self.delay)
+        if self.status is None:
+            raise MeilisearchCommunicationError("down")
+        return Health(status=self.status)
+
+
+def api_error(status_code):
+    response = Response(status_code, json={"message": "error"}, request=Request("GET", "/"))
+    return MeilisearchApiError("error", response)
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (MeilisearchCommunicationError("down"), True),
+        (ConnectError("down"), True),
+        (ReadTimeout("slow"), True),
+        (api_error(503), True),
+        (api_error(404), False),
+        (ValueError("bad"), False),
+    ],
+)
+def test_is_node_failure(error, expected):
+    assert is_node_failure(error) is expected
+
+
+async def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60, probe_timeout=1)
+    client = FakeClient()
+
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+    assert await breaker.allow(client)  # type: ignore[arg-type]
+
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+    assert breaker.is_open
+    assert not breaker.available()
+    assert not await breaker.allow(client)  # type: ignore[arg-type]
+    assert breaker.retry_after() > 59
+
+
+async def test_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, probe_timeout=1)
+
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+    breaker.record(0.1, api_error(400))
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+
+    assert not breaker.is_open
+
+
+async def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=60, probe_timeout=1, slow_call_duration=0.5
+    )
+
+    breaker.record(0.6)
+    breaker.record(0.7)
+
+    assert breaker.is_open
+
+
+@pytest.mark.parametrize("status, closes", [("available", True), (None, False)])
+async def test_probe_after_reset_timeout(status, closes):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, probe_timeout=1)
+    client = FakeClient(status=status)
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+    assert breaker.is_open
+    assert breaker.available()
+
+    assert await breaker.allow(client) is closes  # type: ignore[arg-type]
+    assert breaker.is_open is not closes
+    assert client.probes == 1
+
+
+async def test_probe_timeout_keeps_breaker_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, probe_timeout=0.01)
+    client = FakeClient(delay=1)
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+
+    assert not await breaker.allow(client)  # type: ignore[arg-type]
+    assert breaker.is_open
+
+
+async def test_concurrent_requests_share_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, probe_timeout=1)
+    client = FakeClient(delay=0.01)
+    breaker.record(0.1, MeilisearchCommunicationError("down"))
+
+    results = await asyncio.gather(*[breaker.allow(client) for _ in range(5)])  # type: ignore[arg-type]
+
+    assert all(results)
+    assert client.probes == 1
@@ -0,0 +1,243 @@
+from time import monotonic
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import AsyncClient as HttpxAsyncClient
+from httpx import ConnectError, MockTransport, Request, Response
+
+from meilisearch_fastapi import meilisearch_lifespan
+from meilisearch_fastapi._client import (
+    MeilisearchNode,
+    MeilisearchNodes,
+    _NodeTransport,
+    _track_index_task,
+    create_client,
+    get_nodes,
+    meilisearch_client,
+    meilisearch_local_client,
+    meilisearch_read_client,
+)
+from meilisearch_fastapi._config import get_config
+from meilisearch_fastapi._index_tasks import get_index_tasks
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    monkeypatch.setenv("MEILI_REPLICA_HTTP_ADDRS", '["replica1:7700", "replica2:7700"]')
+
+
+async def test_create_client_pool_limits(monkeypatch):
+    monkeypatch.setenv("MEILISEARCH_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("MEILISEARCH_MAX_KEEPALIVE_CONNECTIONS", "3")
+    monkeypatch.setenv("MEILISEARCH_KEEPALIVE_EXPIRY", "1.5")
+    client = await create_client(get_config())
+    pool = client.http_client._transport._pool  # type: ignore[attr-defined]
+
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 1.5
+    assert client._http_requests.http_client is client.http_client
+    await client.aclose()
+
+
+async def test_create_client_closes_the_sdk_http_client(monkeypatch):
+    closed: list[HttpxAsyncClient] = []
+    monkeypatch.setattr(HttpxAsyncClient, "aclose", lambda self: _record_close(closed, self))
+
+    client = await create_client(get_config())
+
+    assert len(closed) == 1
+    assert closed[0] is not client.http_client
+
+
+async def _record_close(closed, http_client):
+    closed.append(http_client)
+
+
+async def test_lifespan_shares_and_closes_client():
+    app = FastAPI()
+    request = SimpleNamespace(app=app)
+
+    async with meilisearch_lifespan(app):
+        client = await meilisearch_client(request)  # type: ignore[arg-type]
+        assert await meilisearch_client(request) is client  # type: ignore[arg-type]
+
+    assert client.http_client.is_closed
+    assert not hasattr(app.state, "meilisearch_nodes")
+
+
+async def test_client_without_lifespan_is_shared():
+    app = FastAPI()
+    nodes = await get_nodes(app)
+
+    assert await get_nodes(app) is nodes
+    await nodes.aclose()
+
+
+async def test_reads_without_replicas_use_primary():
+    app = FastAPI()
+    request = SimpleNamespace(app=app)
+
+    async with meilisearch_lifespan(app):
+        primary = await meilisearch_client(request)  # type: ignore[arg-type]
+        reader = await meilisearch_read_client(request)  # type: ignore[arg-type]
+
+        assert reader is primary
+
+
+async def test_reads_go_to_least_busy_replica(replicas):
+    nodes = await MeilisearchNodes.from_config(get_config())
+    replica1, replica2 = nodes.replicas
+
+    assert replica1.url == "http://replica1:7700"
+    assert replica2.url == "http://replica2:7700"
+    assert {nodes.reader(), nodes.reader()} == {replica1, replica2}
+
+    replica1.outstanding = 3
+    replica2.outstanding = 1
+    assert nodes.reader() is replica2
+    assert nodes.reader() is replica2
+
+    await nodes.aclose()
+
+
+async def test_outstanding_requests_are_counted():
+    node = await MeilisearchNode.from_config(get_config(), get_config().MEILISEARCH_URL)
+    counted = []
+
+    async def body():
+        yield b"{}"
+
+    async def handler(request):
+        counted.append(node.outstanding)
+        return Response(200, content=body())
+
+    transport = _NodeTransport(node, MockTransport(handler))
+    async with HttpxAsyncClient(transport=transport, base_url=node.url) as http_client:
+        await http_client.get("/health")
+        assert counted == [1]
+        assert node.outstanding == 0
+
+        async with http_client.stream("GET", "/indexes/movies/documents") as response:
+            assert node.outstanding == 1
+            await response.aread()
+            assert node.outstanding == 0
+
+    assert node.outstanding == 0
+    await node.client.aclose()
+
+
+async def test_dependency_alone_is_not_outstanding():
+    app = FastAPI()
+    request = SimpleNamespace(app=app)
+
+    async with meilisearch_lifespan(app):
+        await meilisearch_read_client(request)  # type: ignore[arg-type]
+
+        assert (await get_nodes(app)).primary.outstanding == 0
+
+
+async def test_reads_skip_open_replicas(replicas):
+    nodes = await MeilisearchNodes.from_config(get_config())
+    replica1, replica2 = nodes.replicas
+    replica1.outstanding = 5
+    replica2.breaker.opened_at = monotonic()
+
+    assert nodes.reader() is replica1
+    assert nodes.reader() is replica1
+
+    await nodes.aclose()
+
+
+async def test_open_breaker_fails_fast():
+    app = FastAPI()
+    request = SimpleNamespace(app=app)
+
+    async with meilisearch_lifespan(app):
+        (await get_nodes(app)).primary.breaker.opened_at = monotonic()
+
+        with pytest.raises(HTTPException) as e:
+            await meilisearch_client(request)  # type: ignore[arg-type]
+
+    assert e.value.status_code == 503
+    assert e.value.headers == {"Retry-After": "10"}
+
+
+async def test_upstream_outcomes_are_recorded_on_the_node():
+    node = await MeilisearchNode.from_config(get_config(), get_config().MEILISEARCH_URL)
+    breaker = node.breaker
+
+    async def body():
+        yield b"{}"
+
+    async def handler(request):
+        if request.url.path == "/down":
+            raise ConnectError("down", request=request)
+        return Response(503 if request.url.path == "/error" else 200, content=body())
+
+    transport = _NodeTransport(node, MockTransport(handler))
+    async with HttpxAsyncClient(transport=transport, base_url=node.url) as http_client:
+        with pytest.raises(ConnectError):
+            await http_client.get("/down")
+        await http_client.get("/error")
+        assert breaker.failures == 2
+
+        await http_client.get("/health")
+        assert breaker.failures == 0
+
+        for _ in range(breaker.failure_threshold):
+            await http_client.get("/error")
+
+    assert breaker.is_open
+    await node.client.aclose()
+
+
+async def test_dependency_alone_records_nothing():
+    app = FastAPI()
+    request = SimpleNamespace(app=app)
+
+    async with meilisearch_lifespan(app):
+        breaker = (await get_nodes(app)).primary.breaker
+        breaker.failures = 2
+
+        await meilisearch_client(request)  # type: ignore[arg-type]
+
+        assert breaker.failures == 2
+
+
+async def test_local_client_ignores_open_breaker():
+    app = FastAPI()
+    request = SimpleNamespace(app=app)
+
+    async with meilisearch_lifespan(app):
+        primary = (await get_nodes(app)).primary
+        primary.breaker.opened_at = monotonic()
+
+        assert await meilisearch_local_client(request) is primary.client  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "method, path, status_code, pending",
+    [
+        ("POST", "/indexes/movies/documents", 202, True),
+        ("DELETE", "/indexes/movies", 202, True),
+        ("PATCH", "/indexes/movies/settings", 202, True),
+        ("POST", "/indexes/movies/search", 200, False),
+        ("GET", "/indexes/movies/documents", 200, False),
+        ("POST", "/indexes", 202, False),
+        ("POST", "/keys", 201, False),
+    ],
+)
+async def test_writes_to_an_index_are_tracked(method, path, status_code, pending):
+    client = await create_client(get_config())
+    response = Response(
+        status_code,
+        json={"taskUid": 1},
+        request=Request(method, f"{get_config().MEILISEARCH_URL}{path}"),
+    )
+
+    await _track_index_task(client, response)
+
+    assert get_index_tasks().pending("movies") is pending
+    await get_index_tasks().aclose()
@@ -0,0 +1,120 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from meilisearch_fastapi._compression import Compressor, accepted_encodings, get_compressor
+from meilisearch_fastapi._etags import conditional_response
+from meilisearch_fastapi._responses import FastJSONResponse
+from meilisearch_fastapi._routing import MeilisearchRoute
+
+MOVIES = json.loads((Path(__file__).parent / "assets" / "small_movies.json").read_text())
+
+
+@pytest.fixture
+async def client():
+    router = APIRouter(default_response_class=FastJSONResponse, route_class=MeilisearchRoute)
+
+    @router.get("/movies")
+    async def movies() -> list:
+        return MOVIES
+
+    @router.get("/small")
+    async def small() -> dict:
+        return {"a": 1}
+
+    @router.get("/etag")
+    async def etag(request: Request):
+        return conditional_response(request, MOVIES)
+
+    app = FastAPI()
+    app.include_router(router)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, br;q=0.5, zstd;q=0, *;q=0.1") == {
+        "gzip": 1.0,
+        "br": 0.5,
+        "zstd": 0.0,
+        "*": 0.1,
+    }
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("", None),
+        ("*", "gzip"),
+        ("deflate, gzip;q=0.5", "gzip"),
+    ],
+)
+def test_choose(header, expected):
+    compressor = Compressor(min_size=0, gzip_level=4, brotli_quality=4, zstd_level=3)
+    compressor._compressors = {"gzip": compressor._compressors["gzip"]}
+
+    assert compressor.choose(header) == expected
+
+
+def test_choose_prefers_client_quality():
+    compressor = Compressor(min_size=0, gzip_level=4, brotli_quality=4, zstd_level=3)
+    compressor._compressors = {"zstd": bytes, "br": bytes, "gzip": bytes}
+
+    assert compressor.choose("gzip, br, zstd") == "zstd"
+    assert compressor.choose("gzip, br;q=0.9, zstd;q=0.8") == "gzip"
+
+
+async def test_large_responses_are_compressed(client):
+    response = await client.get("/movies", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(FastJSONResponse(MOVIES).body)
+    assert response.json() == MOVIES
+
+
+async def test_small_responses_are_not_compressed(client):
+    response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"a": 1}
+
+
+async def test_not_compressed_without_accept_encoding(client):
+    response = await client.get("/movies", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == MOVIES
+
+
+async def test_compressed_etag_is_weak(client):
+    response = await client.get("/etag", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["etag"]
+
+    assert etag.startswith('W/"')
+
+    response = await client.get("/etag", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+async def test_stats(client):
+    compressor = get_compressor()
+    assert compressor is not None
+    before = compressor.stats()
+
+    response = await client.get("/movies", headers={"Accept-Encoding": "gzip"})
+    stats = compressor.stats()
+
+    assert stats.responses == before.responses + 1
+    assert stats.bytes_in - before.bytes_in == len(FastJSONResponse(MOVIES).body)
+    assert stats.bytes_out - before.bytes_out == int(response.headers["content-length"])
+    assert stats.max_compression_ms > 0
@@ -33,3 +33,19 @@ def test_config_no_url(monkeypatch):
 
     with pytest.raises(TypeError):
         get_config()
+
+
+@pytest.mark.parametrize("https, scheme", [("true", "https"), ("false", "http")])
+def test_config_replicas(https, scheme, monkeypatch):
+    monkeypatch.setenv("MEILI_HTTPS_URL", https)
+    monkeypatch.setenv("MEILI_REPLICA_HTTP_ADDRS", '["replica1:7700", "replica2:7700"]')
+    config = get_config()
+
+    assert config.MEILISEARCH_REPLICA_URLS == [
+        f"{scheme}://replica1:7700",
+        f"{scheme}://replica2:7700",
+    ]
+
+
+def test_config_no_replicas():
+    assert get_config().MEILISEARCH_REPLICA_URLS == []
@@ -0,0 +1,129 @@
+import pytest
+
+from meilisearch_fastapi._cursor import (
+    Cursor,
+    CursorError,
+    added_attributes,
+    check_ranking_rules,
+    drop_attributes,
+    hit_values,
+    keyset_filter,
+    search_fingerprint,
+    sort_attributes,
+)
+from meilisearch_fastapi._filters import parse_filter
+from meilisearch_fastapi.models.search_parameters import CursorSearchParameters
+
+
+def test_cursor_round_trip():
+    cursor = Cursor("abc", "id", [1553299200, "action"], ["287947"])
+
+    assert Cursor.decode(cursor.encode()) == cursor
+    assert "=" not in cursor.encode()
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "W10"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(CursorError):
+        Cursor.decode(cursor)
+
+
+def test_search_fingerprint():
+    search = CursorSearchParameters(uid="movies", sort=["year:desc"], filter="genre = action")
+
+    assert search_fingerprint(search) == search_fingerprint(
+        search.model_copy(update={"limit": 5, "cursor": "abc", "filter": "genre  =  'action'"})
+    )
+    assert search_fingerprint(search) != search_fingerprint(
+        search.model_copy(update={"sort": ["year:asc"]})
+    )
+
+
+def test_sort_attributes():
+    assert sort_attributes(["year:desc", "title:asc", "a:b:asc"]) == [
+        ("year", False),
+        ("title", True),
+        ("a:b", True),
+    ]
+
+
+@pytest.mark.parametrize("sort", [None, [], ["year"], ["year:up"], ["_geoPoint(1, 2):asc"]])
+def test_unsupported_sort(sort):
+    with pytest.raises(CursorError):
+        sort_attributes(sort)
+
+
+def test_hit_values():
+    hit = {"id": 1, "year": 2000, "meta": {"rating": 4.5}, "tags": ["a"], "flag": True}
+
+    assert hit_values(hit, ["year", "meta.rating"]) == [2000, 4.5]
+    assert hit_values(hit, ["missing"]) is None
+    assert hit_values(hit, ["tags"]) is None
+    assert hit_values(hit, ["flag"]) is None
+
+
+def test_keyset_filter():
+    sort = [("year", False), ("title", True)]
+    cursor = Cursor("abc", "id", [2000, 'The "Movie"'], ["1", "2"])
+
+    expression = keyset_filter(sort, cursor)
+
+    assert expression == (
+        "(year < 2000) OR "
+        '(year = 2000 AND title > "The \\"Movie\\"") OR '
+        '(year = 2000 AND title = "The \\"Movie\\"" AND id NOT IN ["1", "2"])'
+    )
+    assert parse_filter(expression) is not None
+
+
+def test_keyset_filter_without_seen_hits():
+    cursor = Cursor("abc", "id", [2000], [])
+
+    assert keyset_filter([("year", True)], cursor) == "(year > 2000)"
+
+
+DEFAULT_RANKING_RULES = ["words", "typo", "proximity", "attribute", "sort", "exactness"]
+
+
+@pytest.mark.parametrize(
+    "ranking_rules, query",
+    [
+        (DEFAULT_RANKING_RULES, None),
+        (DEFAULT_RANKING_RULES, " "),
+        (["sort", "words", "typo"], "dragon"),
+        (["sort", "year:desc"], None),
+    ],
+)
+def test_check_ranking_rules(ranking_rules, query):
+    check_ranking_rules(ranking_rules, query)
+
+
+@pytest.mark.parametrize(
+    "ranking_rules, query",
+    [
+        (DEFAULT_RANKING_RULES, "dragon"),
+        (["year:desc", "sort"], None),
+        (["words", "typo"], None),
+        (None, None),
+    ],
+)
+def test_check_ranking_rules_sort_does_not_decide(ranking_rules, query):
+    with pytest.raises(CursorError):
+        check_ranking_rules(ranking_rules, query)
+
+
+def test_added_attributes():
+    assert added_attributes(["title", "cast"], ["year", "cast.name", "id", "year"]) == [
+        "year",
+        "id",
+    ]
+
+
+def test_drop_attributes():
+    hit = {"id": 1, "title": "Up", "release": {"year": 2009, "country": "US"}, "rating": {"x": 1}}
+
+    assert drop_attributes(hit, ["id", "release.year", "rating.x", "missing.path"]) == {
+        "title": "Up",
+        "release": {"country": "US"},
+    }
+    assert hit["release"] == {"year": 2009, "country": "US"}
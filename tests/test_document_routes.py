@@ -1,3 +1,4 @@
+import json
 from math import ceil
 from uuid import uuid4
 
@@ -50,6 +51,42 @@ async def test_add_documents(
     assert update.status == "succeeded"
 
 
+@pytest.mark.parametrize("content_type", ["application/x-ndjson", "text/csv"])
+async def test_add_documents_stream(
+    content_type, async_empty_index, fastapi_test_client, async_meilisearch_client
+):
+    uid = str(uuid4())
+    index = await async_empty_index(uid)
+    movies = generate_test_movies(20)
+    if content_type == "text/csv":
+        content = "\n".join(
+            [",".join(movies[0])] + [",".join(str(v) for v in m.values()) for m in movies]
+        )
+    else:
+        content = "\n".join(json.dumps(m) for m in movies)
+
+    response = await fastapi_test_client.post(
+        f"/documents/{uid}/stream",
+        content=content.encode(),
+        headers={"Content-Type": content_type},
+        params={"primary_key": "id"},
+    )
+    assert response.status_code == 202
+    for task in response.json():
+        update = await async_meilisearch_client.wait_for_task(task["taskUid"])
+        assert update.status == "succeeded"
+
+    stats = await index.get_stats()
+    assert stats.number_of_documents == 20
+
+
+async def test_add_documents_stream_unsupported_content_type(fastapi_test_client):
+    response = await fastapi_test_client.post(
+        "/documents/movies/stream", json=[{"id": 1}], headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 415
+
+
 @pytest.mark.parametrize(
     "primary_key, expected_primary_key", [("release_date", "release_date"), (None, "id")]
 )
@@ -81,6 +118,40 @@ async def test_add_documents_in_batches(
     assert await index.get_primary_key() == expected_primary_key
 
 
+@pytest.mark.parametrize("max_payload_size, expected_batches", [(None, 1), (5_000, 4)])
+async def test_add_documents_auto_batch(
+    max_payload_size,
+    expected_batches,
+    async_empty_index,
+    small_movies,
+    fastapi_test_client,
+    async_meilisearch_client,
+):
+    uid = str(uuid4())
+    index = await async_empty_index(uid)
+    document = {"uid": uid, "documents": small_movies, "max_payload_size": max_payload_size}
+    response = await fastapi_test_client.post("/documents/auto-batch", json=document)
+    assert response.status_code == 202
+    assert len(response.json()) == expected_batches
+
+    for r in response.json():
+        update = await async_meilisearch_client.wait_for_task(r["taskUid"])
+        assert update.status == "succeeded"
+
+    stats = await index.get_stats()
+    assert stats.number_of_documents == len(small_movies)
+
+
+async def test_add_documents_auto_batch_document_too_large(fastapi_test_client):
+    document = {
+        "uid": str(uuid4()),
+        "documents": generate_test_movies(2),
+        "max_payload_size": 100,
+    }
+    response = await fastapi_test_client.post("/documents/auto-batch", json=document)
+    assert response.status_code == 413
+
+
 async def test_delete_document(
     fastapi_test_client, async_index_with_documents, small_movies, async_meilisearch_client
 ):
@@ -127,6 +198,21 @@ async def test_get_document(fastapi_test_client, async_index_with_documents, sma
     assert response.json()["title"] == "The Highwaymen"
 
 
+async def test_get_document_not_modified(
+    fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    response = await fastapi_test_client.get(f"documents/{uid}/500682")
+    etag = response.headers["etag"]
+    response = await fastapi_test_client.get(
+        f"documents/{uid}/500682", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
 async def test_get_document_nonexistent(fastapi_test_client, async_empty_index):
     with pytest.raises(MeilisearchApiError):
         uid = str(uuid4())
@@ -222,3 +308,23 @@ async def test_update_documents_in_batches(
 
     response = await fastapi_test_client.get(f"/documents/{uid}/{doc_id}")
     assert response.json()["title"] != "Some title"
+
+
+async def test_update_documents_auto_batch(
+    fastapi_test_client,
+    async_index_with_documents,
+    small_movies,
+    async_meilisearch_client,
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    updated = [{**movie, "title": "Some title"} for movie in small_movies]
+    update_body = {"uid": uid, "documents": updated, "max_payload_size": 5_000}
+    updates = await fastapi_test_client.put("/documents/auto-batch", json=update_body)
+    assert len(updates.json()) > 1
+
+    for update in updates.json():
+        await async_meilisearch_client.wait_for_task(update["taskUid"])
+
+    response = await fastapi_test_client.get(f"/documents/{uid}/{small_movies[0]['id']}")
+    assert response.json()["title"] == "Some title"
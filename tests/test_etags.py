@@ -0,0 +1,88 @@
+from typing import Any
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from meilisearch_fastapi._etags import conditional_response, make_etag
+from meilisearch_fastapi._routing import MeilisearchRoute
+
+CONTENT = {"id": 1, "title": "Amélie"}
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+
+    @app.get("/computed")
+    async def computed(request: Request) -> Response:
+        return conditional_response(request, CONTENT)
+
+    @app.get("/given")
+    async def given(request: Request) -> Response:
+        return conditional_response(request, CONTENT, make_etag(b"v1"))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.parametrize("path", ["/computed", "/given"])
+async def test_not_modified(client, path):
+    response = await client.get(path)
+    etag = response.headers["etag"]
+
+    assert response.status_code == 200
+    assert response.json() == CONTENT
+
+    response = await client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    "header", ['"other", {etag}', "W/{etag}", "*"], ids=["list", "weak", "wildcard"]
+)
+async def test_if_none_match_forms(client, header):
+    etag = make_etag(b"v1")
+    response = await client.get("/given", headers={"If-None-Match": header.format(etag=etag)})
+
+    assert response.status_code == 304
+
+
+async def test_changed(client):
+    response = await client.get("/given", headers={"If-None-Match": make_etag(b"v0")})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == make_etag(b"v1")
+
+
+class TaggedResponse(JSONResponse):
+    def __init__(self, content: Any, **kwargs: Any) -> None:
+        super().__init__(content, **kwargs)
+        self.headers["X-Rendered-By"] = "tagged"
+
+
+async def test_rendered_with_the_route_response_class():
+    app = FastAPI(default_response_class=TaggedResponse)
+    router = APIRouter(route_class=MeilisearchRoute)
+
+    @router.get("/meilisearch")
+    async def meilisearch(request: Request) -> Response:
+        return conditional_response(request, CONTENT)
+
+    @app.get("/app")
+    async def app_default(request: Request) -> Response:
+        return conditional_response(request, CONTENT)
+
+    app.include_router(router)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        meilisearch_response = await client.get("/meilisearch")
+        app_response = await client.get("/app")
+
+    for response in (meilisearch_response, app_response):
+        assert response.headers["x-rendered-by"] == "tagged"
+        assert response.json() == CONTENT
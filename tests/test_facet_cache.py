@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+from meilisearch_python_sdk.models.search import SearchResults
+
+from meilisearch_fastapi._facet_cache import FacetCache, facet_cache_key
+from meilisearch_fastapi._index_tasks import IndexTasks
+from meilisearch_fastapi.models.search_parameters import FacetSearchParameters
+
+
+class FakeIndex:
+    def __init__(self, client):
+        self.client = client
+
+    async def search(self, **kwargs):
+        self.client.searches += 1
+        await asyncio.sleep(0)
+        if self.client.error:
+            raise RuntimeError("down")
+        return SearchResults(
+            hits=[],
+            processing_time_ms=1,
+            query="",
+            estimated_total_hits=self.client.count,
+            facet_distribution={"genre": {"action": self.client.count}},
+        )
+
+
+class FakeClient:
+    def __init__(self):
+        self.searches = 0
+        self.count = 1
+        self.error = False
+
+    def index(self, uid):
+        return FakeIndex(self)
+
+
+class FakeIndexTasks(IndexTasks):
+    def __init__(self):
+        super().__init__()
+        self.pending_uids = set()
+
+    def pending(self, uid):
+        return uid in self.pending_uids
+
+
+@pytest.fixture
+def index_tasks():
+    return FakeIndexTasks()
+
+
+@pytest.fixture
+def cache(index_tasks):
+    return FacetCache(max_entries=2, idle_ttl=60, index_tasks=index_tasks)
+
+
+def params(facets=None, filter=None, uid="movies"):
+    return FacetSearchParameters(uid=uid, facets=facets or ["genre"], filter=filter)
+
+
+def test_facet_cache_key_is_normalized():
+    assert facet_cache_key(params(["b", "a"], "genre  = action")) == facet_cache_key(
+        params(["a", "b", "a"], "genre = action")
+    )
+    assert facet_cache_key(params(filter=["a = 1", ["b = 2"]])) == facet_cache_key(
+        params(filter="b = 2 AND a = 1")
+    )
+    assert facet_cache_key(params(filter=["a = 1", ["b = 2"]])) != facet_cache_key(
+        params(filter=[["a = 1", "b = 2"]])
+    )
+
+
+async def test_hit_and_miss(cache):
+    client = FakeClient()
+
+    first = await cache.get(client, params())  # type: ignore[arg-type]
+    second = await cache.get(client, params())  # type: ignore[arg-type]
+
+    assert first == second
+    assert first.facet_distribution == {"genre": {"action": 1}}
+    assert client.searches == 1
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+
+async def test_concurrent_misses_share_a_search(cache):
+    client = FakeClient()
+
+    await asyncio.gather(*[cache.get(client, params()) for _ in range(5)])  # type: ignore[arg-type]
+
+    assert client.searches == 1
+
+
+async def test_refreshed_in_background_after_writes(cache, index_tasks):
+    client = FakeClient()
+    await cache.get(client, params())  # type: ignore[arg-type]
+    await cache.get(client, params(uid="books"))  # type: ignore[arg-type]
+    client.count = 2
+
+    index_tasks.pending_uids.add("movies")
+    index_tasks._notify("movies")
+    assert client.searches == 2
+
+    index_tasks.pending_uids.clear()
+    index_tasks._notify("movies")
+    stale = await cache.get(client, params())  # type: ignore[arg-type]
+    await asyncio.sleep(0.01)
+    fresh = await cache.get(client, params())  # type: ignore[arg-type]
+
+    assert stale.estimated_total_hits == 1
+    assert fresh.estimated_total_hits == 2
+    assert client.searches == 3
+    assert cache.stats().refreshes == 1
+
+
+async def test_failed_refresh_drops_entry(cache, index_tasks):
+    client = FakeClient()
+    await cache.get(client, params())  # type: ignore[arg-type]
+    client.error = True
+
+    index_tasks._notify("movies")
+    await asyncio.sleep(0.01)
+
+    assert cache.stats().entries == 0
+
+
+async def test_idle_entries_are_not_refreshed(index_tasks):
+    cache = FacetCache(max_entries=2, idle_ttl=0, index_tasks=index_tasks)
+    client = FakeClient()
+    await cache.get(client, params())  # type: ignore[arg-type]
+
+    index_tasks._notify("movies")
+    await asyncio.sleep(0.01)
+
+    assert client.searches == 1
+    assert cache.stats().entries == 0
+
+
+async def test_old_entries_are_refreshed_in_background_when_read(index_tasks):
+    cache = FacetCache(max_entries=2, idle_ttl=60, index_tasks=index_tasks, ttl=0)
+    client = FakeClient()
+    await cache.get(client, params())  # type: ignore[arg-type]
+    client.count = 2
+
+    stale = await asyncio.gather(*[cache.get(client, params()) for _ in range(3)])  # type: ignore[arg-type]
+    await asyncio.sleep(0.01)
+    fresh = await cache.get(client, params())  # type: ignore[arg-type]
+
+    assert [results.estimated_total_hits for results in stale] == [1, 1, 1]
+    assert fresh.estimated_total_hits == 2
+    assert client.searches == 2
+    assert cache.stats().refreshes == 1
+
+
+async def test_oldest_entries_are_evicted(cache):
+    client = FakeClient()
+    for facet in ("a", "b", "c"):
+        await cache.get(client, params([facet]))  # type: ignore[arg-type]
+
+    await cache.get(client, params(["a"]))  # type: ignore[arg-type]
+
+    assert client.searches == 4
+    assert cache.stats().entries == 2
@@ -0,0 +1,213 @@
+import asyncio
+
+import pytest
+from httpx import Request, Response
+from meilisearch_python_sdk.errors import MeilisearchApiError
+from meilisearch_python_sdk.models.settings import (
+    Filter,
+    FilterableAttributeFeatures,
+    FilterableAttributes,
+)
+
+from meilisearch_fastapi._filters import (
+    FilterableAttributesCache,
+    FilterError,
+    canonical_filter,
+    check_filterable,
+    parse_filter,
+)
+from meilisearch_fastapi._index_tasks import IndexTasks
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("genre = action", 'genre = "action"'),
+        ("genre  =  'action'", 'genre = "action"'),
+        ('genre="action"', 'genre = "action"'),
+        ("title = Shazam!", 'title = "Shazam!"'),
+        ("rating >= 4.5", 'rating >= "4.5"'),
+        ("release_date 1 TO 5", 'release_date "1" TO "5"'),
+        ("genre IN [action, 'sci fi']", 'genre IN ["action", "sci fi"]'),
+        ("genre not in []", "genre NOT IN []"),
+        ("genre IN [a, b,]", 'genre IN ["a", "b"]'),
+        ("poster EXISTS", "poster EXISTS"),
+        ("poster NOT EXISTS", "poster NOT EXISTS"),
+        ("poster is not null", "poster IS NOT NULL"),
+        ("poster IS EMPTY", "poster IS EMPTY"),
+        ("title CONTAINS kid", 'title CONTAINS "kid"'),
+        ("title STARTS WITH th", 'title STARTS WITH "th"'),
+        ("'release date' = 1", '"release date" = "1"'),
+        ("cast.name = 'Tom \\'Hanks\\''", "cast.name = \"Tom 'Hanks'\""),
+        ("_geoRadius(45.47, 9.18, 2000)", "_geoRadius(45.47, 9.18, 2000)"),
+        ("_geoBoundingBox([45.4,9.1],[45.5,9.2])", "_geoBoundingBox([45.4, 9.1], [45.5, 9.2])"),
+        ("(a = 1)", 'a = "1"'),
+        ("b = 2 AND (a = 1 AND c = 3)", 'a = "1" AND b = "2" AND c = "3"'),
+        ("a = 1 OR b = 2 AND c = 3", '(b = "2" AND c = "3") OR a = "1"'),
+        ("NOT (a = 1 OR b = 2)", 'NOT (a = "1" OR b = "2")'),
+        (["b = 2", ["a = 1", "c = 3"]], '(a = "1" OR c = "3") AND b = "2"'),
+        ("   ", ""),
+        (None, ""),
+    ],
+)
+def test_canonical_filter(expression, expected):
+    assert canonical_filter(expression) == expected
+
+
+def test_equivalent_filters_have_the_same_canonical_form():
+    assert canonical_filter("genre = action AND year > 2000") == canonical_filter(
+        ["year > '2000'", ["genre = action"]]
+    )
+
+
+def test_canonical_filter_of_invalid_filter():
+    assert canonical_filter("genre =") == '"genre ="'
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "genre =",
+        "genre action",
+        "= action",
+        "a = 1 AND",
+        "(a = 1",
+        "a = 1)",
+        "a IN [1, 2",
+        "a IN [,]",
+        "a IN [1 2]",
+        "a IS",
+        "a NOT = 1",
+        "a = 1 b = 2",
+        "a = 'unterminated",
+        "a 1 TO",
+        "_geoRadius(1, 2)",
+        "_geoRadius(a, 2, 3)",
+        "_geoBoundingBox([1, 2])",
+        [1],
+    ],
+)
+def test_invalid_filters(expression):
+    with pytest.raises(FilterError):
+        parse_filter(expression)
+
+
+def filterable(patterns, equality=True, comparison=False):
+    return FilterableAttributes(
+        attribute_patterns=patterns,
+        features=FilterableAttributeFeatures(
+            facet_search=False, filter=Filter(equality=equality, comparison=comparison)
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "expression, filterable_attributes",
+    [
+        ("genre = action", ["genre"]),
+        ("cast.name = Tom", ["cast"]),
+        ("_geoRadius(1, 2, 3)", ["_geo"]),
+        ("genre = action", [filterable(["gen*"])]),
+        ("year > 2000", [filterable(["year"], comparison=True)]),
+    ],
+)
+def test_check_filterable(expression, filterable_attributes):
+    check_filterable(parse_filter(expression), filterable_attributes)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "expression, filterable_attributes",
+    [
+        ("genre = action", None),
+        ("genre = action AND year = 1", ["genre"]),
+        ("cast = Tom", ["cast.name"]),
+        ("_geoRadius(1, 2, 3)", ["genre"]),
+        ("year > 2000", [filterable(["year"])]),
+        ("year = 2000", [filterable(["year"], equality=False, comparison=True)]),
+    ],
+)
+def test_check_not_filterable(expression, filterable_attributes):
+    with pytest.raises(FilterError, match="is not filterable"):
+        check_filterable(parse_filter(expression), filterable_attributes)  # type: ignore[arg-type]
+
+
+class FakeIndex:
+    def __init__(self, client):
+        self.client = client
+
+    async def get_filterable_attributes(self):
+        self.client.calls += 1
+        if self.client.missing:
+            response = Response(404, json={"message": "missing"}, request=Request("GET", "/"))
+            raise MeilisearchApiError("missing", response)
+        return self.client.filterable_attributes
+
+
+class FakeClient:
+    def __init__(self, missing=False):
+        self.calls = 0
+        self.missing = missing
+        self.filterable_attributes = ["genre"]
+
+    def index(self, uid):
+        return FakeIndex(self)
+
+
+async def test_filterable_attributes_are_cached():
+    index_tasks = IndexTasks()
+    cache = FilterableAttributesCache(ttl=60, index_tasks=index_tasks)
+    client = FakeClient()
+
+    await cache.check(client, "movies", "genre = action")  # type: ignore[arg-type]
+    await cache.check(client, "movies", ["genre = drama"])  # type: ignore[arg-type]
+    assert client.calls == 1
+
+    index_tasks._notify("movies")
+    with pytest.raises(FilterError):
+        await cache.check(client, "movies", "year = 2000")  # type: ignore[arg-type]
+    assert client.calls == 2
+
+
+async def test_filterable_attributes_are_read_again_before_rejecting():
+    cache = FilterableAttributesCache(ttl=60, index_tasks=IndexTasks())
+    client = FakeClient()
+
+    await cache.check(client, "movies", "genre = action")  # type: ignore[arg-type]
+    client.filterable_attributes = ["genre", "year"]
+
+    await cache.check(client, "movies", "year = 2000")  # type: ignore[arg-type]
+    await cache.check(client, "movies", "year = 2001")  # type: ignore[arg-type]
+    assert client.calls == 2
+
+    with pytest.raises(FilterError):
+        await cache.check(client, "movies", "rating > 5")  # type: ignore[arg-type]
+    assert client.calls == 3
+
+
+async def test_filters_are_left_to_meilisearch_without_filterable_attributes():
+    cache = FilterableAttributesCache(ttl=60, index_tasks=IndexTasks())
+    client = FakeClient(missing=True)
+
+    await cache.check(client, "movies", "year = 2000")  # type: ignore[arg-type]
+    assert client.calls == 1
+
+
+async def test_unparsed_filters_are_left_to_meilisearch():
+    cache = FilterableAttributesCache(ttl=60, index_tasks=IndexTasks())
+    client = FakeClient()
+
+    await cache.check(client, "movies", "year =")  # type: ignore[arg-type]
+    assert client.calls == 0
+
+
+async def test_expired_filterable_attributes_are_used_while_refreshed():
+    cache = FilterableAttributesCache(ttl=0, index_tasks=IndexTasks(), max_stale=60)
+    client = FakeClient()
+
+    await cache.check(client, "movies", "genre = action")  # type: ignore[arg-type]
+    await cache.check(client, "movies", "genre = drama")  # type: ignore[arg-type]
+    assert client.calls == 1
+
+    await asyncio.sleep(0.01)
+    assert client.calls == 2
+    await cache.aclose()
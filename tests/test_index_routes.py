@@ -119,6 +119,18 @@ async def test_get_index(fastapi_test_client, index_uid):
     assert response.json()["uid"] == index_uid
 
 
+@pytest.mark.usefixtures("indexes_sample")
+async def test_get_index_not_modified(fastapi_test_client, index_uid):
+    response = await fastapi_test_client.get(f"/indexes/{index_uid}")
+    etag = response.headers["etag"]
+    response = await fastapi_test_client.get(
+        f"/indexes/{index_uid}", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
 async def test_get_index_none(fastapi_test_client):
     response = await fastapi_test_client.get("/indexes/bad")
     assert response.status_code == 404
@@ -0,0 +1,93 @@
+import asyncio
+
+from meilisearch_python_sdk.errors import MeilisearchCommunicationError
+
+from meilisearch_fastapi._index_tasks import IndexTasks
+
+
+class FakeClient:
+    def __init__(self):
+        self.finished = asyncio.Event()
+        self.waited_on = []
+        self.fail = False
+
+    async def wait_for_task(self, task_uid, **kwargs):
+        self.waited_on.append(task_uid)
+        await self.finished.wait()
+        if self.fail:
+            raise MeilisearchCommunicationError("down")
+
+
+async def test_listeners_called_on_enqueue_and_finish():
+    index_tasks = IndexTasks()
+    client = FakeClient()
+    notified: list[str] = []
+    index_tasks.add_listener(notified.append)
+
+    index_tasks.enqueued(client, "movies", 1)  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+
+    assert notified == ["movies"]
+    assert index_tasks.pending("movies")
+    assert not index_tasks.pending("books")
+    assert index_tasks.generation("movies") == 1
+    assert index_tasks.generation("books") == 0
+
+    client.finished.set()
+    await asyncio.sleep(0)
+
+    assert notified == ["movies", "movies"]
+    assert not index_tasks.pending("movies")
+    assert index_tasks.generation("movies") == 2
+
+
+async def test_listeners_see_the_index_as_pending_while_writes_are_in_flight():
+    index_tasks = IndexTasks()
+    client = FakeClient()
+    pending: list[bool] = []
+    index_tasks.add_listener(lambda uid: pending.append(index_tasks.pending(uid)))
+
+    index_tasks.enqueued(client, "movies", 1)  # type: ignore[arg-type]
+    index_tasks.enqueued(client, "movies", 2)  # type: ignore[arg-type]
+    client.finished.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert pending == [True, True, False]
+
+
+async def test_one_watcher_waits_for_the_latest_task():
+    index_tasks = IndexTasks()
+    client = FakeClient()
+
+    index_tasks.enqueued(client, "movies", 1)  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    index_tasks.enqueued(client, "movies", 2)  # type: ignore[arg-type]
+    client.finished.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert client.waited_on == [1, 2]
+    assert not index_tasks.pending("movies")
+
+
+async def test_watcher_stops_on_error():
+    index_tasks = IndexTasks()
+    client = FakeClient()
+    client.fail = True
+
+    index_tasks.enqueued(client, "movies", 1)  # type: ignore[arg-type]
+    client.finished.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert not index_tasks.pending("movies")
+
+
+async def test_aclose_cancels_watchers():
+    index_tasks = IndexTasks()
+
+    index_tasks.enqueued(FakeClient(), "movies", 1)  # type: ignore[arg-type]
+    await index_tasks.aclose()
+
+    assert not index_tasks.pending("movies")
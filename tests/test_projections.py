@@ -0,0 +1,41 @@
+import pytest
+
+from meilisearch_fastapi._projections import ProjectionError, apply_projection
+from meilisearch_fastapi.models.search_parameters import SearchParameters
+
+PROJECTIONS = {
+    "movies": {"default": ["id", "title"], "detail": ["id", "title", "overview"]},
+    "books": {"card": ["title"]},
+}
+
+
+def test_named_projection():
+    search_parameters = apply_projection(
+        SearchParameters(uid="movies", projection="detail"), PROJECTIONS
+    )
+
+    assert search_parameters.attributes_to_retrieve == ["id", "title", "overview"]
+    assert search_parameters.projection is None
+
+
+def test_default_projection():
+    search_parameters = apply_projection(SearchParameters(uid="movies"), PROJECTIONS)
+
+    assert search_parameters.attributes_to_retrieve == ["id", "title"]
+
+
+@pytest.mark.parametrize(
+    "search_parameters",
+    [
+        SearchParameters(uid="movies", attributes_to_retrieve=["*"]),
+        SearchParameters(uid="books"),
+        SearchParameters(uid="other"),
+    ],
+)
+def test_no_projection(search_parameters):
+    assert apply_projection(search_parameters, PROJECTIONS) == search_parameters
+
+
+def test_unknown_projection():
+    with pytest.raises(ProjectionError, match="Available projections are: `card`"):
+        apply_projection(SearchParameters(uid="books", projection="detail"), PROJECTIONS)
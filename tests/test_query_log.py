@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from httpx import ASGITransport, AsyncClient
+
+from meilisearch_fastapi import meilisearch_lifespan
+from meilisearch_fastapi._query_log import QueryLog, get_query_log
+from meilisearch_fastapi.replay import main, percentile, read_queries, replay
+
+
+def test_query_log_writes_ndjson(tmp_path):
+    path = tmp_path / "queries.ndjson"
+    query_log = QueryLog(str(path), sample_rate=1)
+    query_log.record("search", {"uid": "movies", "query": "dark"}, 0.0031, 200, 12)
+    query_log.record("search", {"uid": "movies", "filter": "genre = x"}, 0.001, 400)
+    query_log.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert [line["params"] for line in lines] == [
+        {"uid": "movies", "query": "dark"},
+        {"uid": "movies", "filter": "genre = x"},
+    ]
+    assert lines[0]["ms"] == 3.1
+    assert lines[0]["hits"] == 12
+    assert lines[1]["status"] == 400
+
+
+async def test_query_log_lines_are_flushed_without_closing(tmp_path):
+    path = tmp_path / "queries.ndjson"
+    query_log = QueryLog(str(path), sample_rate=1)
+    query_log.record("search", {"uid": "movies"}, 0.001, 200, 1)
+
+    for _ in range(100):
+        if path.read_text():
+            break
+        await asyncio.sleep(0.01)
+
+    assert json.loads(path.read_text())["params"] == {"uid": "movies"}
+    query_log.close()
+
+
+def test_query_log_ignores_records_after_close(tmp_path):
+    path = tmp_path / "queries.ndjson"
+    query_log = QueryLog(str(path), sample_rate=1)
+    query_log.close()
+    query_log.record("search", {"uid": "movies"}, 0.001, 200, 1)
+    query_log.close()
+
+    assert path.read_text() == ""
+
+
+async def test_query_log_is_reopened_by_the_next_lifespan(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEILISEARCH_QUERY_LOG", str(tmp_path / "queries.ndjson"))
+    app = FastAPI()
+
+    async with meilisearch_lifespan(app):
+        first = get_query_log()
+    async with meilisearch_lifespan(app):
+        second = get_query_log()
+        assert second is not None
+        second.record("search", {"uid": "movies"}, 0.001, 200, 1)
+
+    assert first is not second
+    assert len((tmp_path / "queries.ndjson").read_text().splitlines()) == 1
+
+
+@pytest.mark.parametrize("sample_rate, expected", [(1, True), (0, False)])
+def test_query_log_sampling(tmp_path, sample_rate, expected):
+    query_log = QueryLog(str(tmp_path / "queries.ndjson"), sample_rate=sample_rate)
+
+    assert all(query_log.sampled() is expected for _ in range(10))
+    query_log.close()
+
+
+@pytest.mark.parametrize("p, expected", [(50, 5), (90, 9), (99, 10), (100, 10), (0, 1)], ids=str)
+def test_percentile(p, expected):
+    assert percentile(list(range(1, 11)), p) == expected
+
+
+def test_percentile_of_nothing():
+    assert percentile([], 50) == 0.0
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "queries.ndjson"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps({"route": "search", "params": {"uid": "movies", "query": "a"}}),
+                json.dumps({"route": "other", "params": {}}),
+                "",
+                json.dumps({"route": "search", "params": {"uid": "movies", "query": "b"}}),
+            ]
+        )
+    )
+
+    return path
+
+
+def test_read_queries(log_path):
+    assert read_queries(log_path) == [
+        ("search", {"uid": "movies", "query": "a"}),
+        ("search", {"uid": "movies", "query": "b"}),
+    ]
+
+
+@pytest.fixture
+async def app_client():
+    received = []
+    app = FastAPI()
+
+    @app.post("/search")
+    async def search(request: Request) -> dict:
+        params = await request.json()
+        received.append(params)
+        if params["query"] == "fail":
+            raise HTTPException(400)
+        return {"hits": []}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        client.received = received  # type: ignore[attr-defined]
+        yield client
+
+
+@pytest.mark.parametrize("mode", [{"qps": 1000.0}, {"concurrency": 3}], ids=["qps", "concurrency"])
+async def test_replay(app_client, mode):
+    queries = [("search", {"uid": "movies", "query": q}) for q in ("a", "b", "fail", "c")]
+
+    report = await replay(app_client, "http://test/search/", queries, **mode)
+    summary = report.summary()
+
+    assert sorted(p["query"] for p in app_client.received) == ["a", "b", "c", "fail"]
+    assert summary["sent"] == 4
+    assert summary["errors"] == 1
+    assert summary["statuses"] == {200: 3, 400: 1}
+    assert summary["throughput_rps"] > 0
+    assert list(summary["latency_ms"]) == ["p50", "p90", "p95", "p99", "max"]
+
+
+def test_main_without_searches(tmp_path):
+    path = tmp_path / "queries.ndjson"
+    path.write_text("")
+
+    with pytest.raises(SystemExit):
+        main([str(path)])
+
+
+@pytest.mark.parametrize("flag", ["--qps", "--concurrency"])
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_main_rejects_rates_that_are_not_positive(log_path, flag, value, capsys):
+    with pytest.raises(SystemExit):
+        main([str(log_path), flag, value])
+
+    assert "must be greater than 0" in capsys.readouterr().err
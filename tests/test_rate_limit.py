@@ -0,0 +1,147 @@
+import base64
+import json
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from meilisearch_fastapi import _routing
+from meilisearch_fastapi._rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    caller_identity,
+    get_rate_limiter,
+    load_rate_limit_backend,
+)
+from meilisearch_fastapi._routing import MeilisearchRoute
+
+
+def tenant_token(api_key_uid, search_rules):
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    claims = {"searchRules": search_rules, "apiKeyUid": api_key_uid}
+
+    return f"{encode({'alg': 'HS256'})}.{encode(claims)}.signature"
+
+
+def request(headers=None):
+    scope = {
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("10.0.0.1", 1234),
+    }
+
+    return Request(scope)
+
+
+def test_caller_identity_of_tenant_tokens():
+    first = tenant_token("uid", {"movies": {"filter": "tenant = 1"}})
+    second = tenant_token("uid", {"movies": {"filter": "tenant = 1"}}) + "x"
+    other_rules = tenant_token("uid", {"movies": {"filter": "tenant = 2"}})
+    other_key = tenant_token("uid2", {"movies": {"filter": "tenant = 1"}})
+
+    identity = caller_identity(request({"Authorization": f"Bearer {first}"}), "Authorization")
+
+    assert identity == "tenant:uid"
+    for token in (second, other_rules):
+        assert identity == caller_identity(
+            request({"Authorization": f"Bearer {token}"}), "Authorization"
+        )
+    assert identity != caller_identity(
+        request({"Authorization": f"Bearer {other_key}"}), "Authorization"
+    )
+
+
+class CustomBackend(MemoryRateLimitBackend):
+    pass
+
+
+def test_custom_backend(monkeypatch):
+    monkeypatch.setenv("MEILISEARCH_RATE_LIMITS", '{"search": [1, 1]}')
+    monkeypatch.setenv("MEILISEARCH_RATE_LIMIT_BACKEND", f"{__name__}:CustomBackend")
+
+    rate_limiter = get_rate_limiter()
+
+    assert rate_limiter is not None
+    assert isinstance(rate_limiter.backend, CustomBackend)
+
+
+@pytest.mark.parametrize("path", ["tests.test_rate_limit", ":CustomBackend"])
+def test_load_rate_limit_backend_needs_module_and_attribute(path):
+    with pytest.raises(ValueError):
+        load_rate_limit_backend(path)
+
+
+def test_caller_identity_of_keys_and_addresses():
+    key = caller_identity(request({"X-Api-Key": "secret"}), "X-Api-Key")
+
+    assert key.startswith("key:")
+    assert "secret" not in key
+    assert caller_identity(request(), "Authorization") == "address:10.0.0.1"
+
+
+async def test_memory_backend_token_bucket(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr("meilisearch_fastapi._rate_limit.monotonic", lambda: now)
+    backend = MemoryRateLimitBackend()
+
+    results = [await backend.take("a", rate=1, burst=2) for _ in range(3)]
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert [r.remaining for r in results] == [1, 0, 0]
+    assert results[2].headers()["Retry-After"] == "1"
+    assert (await backend.take("b", rate=1, burst=2)).allowed
+
+    now += 1
+    assert (await backend.take("a", rate=1, burst=2)).allowed
+    assert not (await backend.take("a", rate=1, burst=2)).allowed
+
+
+async def test_memory_backend_max_entries():
+    backend = MemoryRateLimitBackend(max_entries=1)
+    await backend.take("a", rate=1, burst=1)
+    await backend.take("b", rate=1, burst=1)
+
+    assert (await backend.take("a", rate=1, burst=1)).allowed
+
+
+@pytest.fixture
+async def client(monkeypatch):
+    limiter = RateLimiter(
+        limits={"search": (0.001, 2)}, backend=MemoryRateLimitBackend(), header="Authorization"
+    )
+    monkeypatch.setattr(_routing, "get_rate_limiter", lambda: limiter)
+
+    search_router = APIRouter(route_class=MeilisearchRoute.for_group("search"))
+    settings_router = APIRouter(route_class=MeilisearchRoute.for_group("settings"))
+
+    @search_router.get("/search")
+    async def search() -> dict:
+        return {}
+
+    @settings_router.get("/settings")
+    async def settings() -> dict:
+        return {}
+
+    app = FastAPI()
+    app.include_router(search_router)
+    app.include_router(settings_router)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_route_group_is_limited(client):
+    headers = {"Authorization": "Bearer a"}
+    responses = [await client.get("/search", headers=headers) for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert responses[0].headers["ratelimit-limit"] == "2"
+    assert responses[0].headers["ratelimit-remaining"] == "1"
+    assert "retry-after" in responses[2].headers
+
+    # Other callers and other route groups have their own limits.
+    assert (await client.get("/search", headers={"Authorization": "Bearer b"})).status_code == 200
+    assert (await client.get("/settings", headers=headers)).status_code == 200
+    assert "ratelimit-limit" not in (await client.get("/settings", headers=headers)).headers
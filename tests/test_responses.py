@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+
+from meilisearch_fastapi._responses import FastJSONResponse
+from meilisearch_fastapi.routes import search_routes
+
+MOVIES = json.loads((Path(__file__).parent / "assets" / "small_movies.json").read_text())
+
+
+@pytest.mark.parametrize(
+    "content", [MOVIES, {"hits": MOVIES[:5], "limit": 5}, {"name": "Amélie", "value": None}]
+)
+def test_fast_json_response_matches_json_response(content):
+    assert json.loads(FastJSONResponse(content).body) == json.loads(JSONResponse(content).body)
+
+
+def test_fast_json_response_is_compact():
+    assert FastJSONResponse({"a": [1, 2]}).body == b'{"a":[1,2]}'
+
+
+def test_routers_use_fast_json_response():
+    app = FastAPI()
+    app.include_router(search_routes.router, prefix="/search")
+
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/search/cache")
+
+    # Left as a placeholder so a response class given where the router is included wins.
+    assert route.response_class.value is FastJSONResponse  # type: ignore[attr-defined]
+
+
+def test_include_router_can_override_the_response_class():
+    app = FastAPI()
+    app.include_router(search_routes.router, prefix="/search", default_response_class=JSONResponse)
+
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/search/cache")
+
+    assert route.response_class is JSONResponse  # type: ignore[attr-defined]
+
+
+def test_app_can_override_the_response_class():
+    app = FastAPI(default_response_class=JSONResponse)
+    api_router = APIRouter()
+    api_router.include_router(search_routes.router, prefix="/search")
+    app.include_router(api_router)
+
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/search/cache")
+
+    assert route.response_class is JSONResponse  # type: ignore[attr-defined]
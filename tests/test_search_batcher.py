@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from httpx import Request, Response
+from meilisearch_python_sdk.errors import MeilisearchApiError, MeilisearchCommunicationError
+from meilisearch_python_sdk.models.search import SearchParams, SearchResultsWithUID
+
+from meilisearch_fastapi._search_batcher import SearchBatcher
+
+
+class FakeClient:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    async def multi_search(self, queries):
+        self.calls.append([query.query for query in queries])
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        if any(query.query == "bad" for query in queries):
+            response = Response(400, json={"message": "bad"}, request=Request("POST", "/"))
+            raise MeilisearchApiError("bad", response)
+        return [
+            SearchResultsWithUID(
+                index_uid=query.index_uid, hits=[], processing_time_ms=1, query=query.query
+            )
+            for query in queries
+        ]
+
+
+def params(query):
+    return SearchParams(index_uid="movies", q=query)
+
+
+async def test_searches_in_window_are_batched():
+    batcher = SearchBatcher(window=0.01, max_size=10)
+    client = FakeClient()
+
+    results = await asyncio.gather(*[batcher.search(client, params(q)) for q in "abc"])  # type: ignore[arg-type]
+
+    assert [result.query for result in results] == ["a", "b", "c"]
+    assert client.calls == [["a", "b", "c"]]
+    assert batcher.stats().batches == 1
+    assert batcher.stats().average_batch_size == 3
+    assert batcher.stats().max_added_latency_ms > 0
+
+
+async def test_full_batch_is_sent_right_away():
+    batcher = SearchBatcher(window=60, max_size=2)
+    client = FakeClient()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*[batcher.search(client, params(q)) for q in "ab"]),  # type: ignore[arg-type]
+        timeout=1,
+    )
+
+    assert len(results) == 2
+    assert client.calls == [["a", "b"]]
+
+
+async def test_clients_are_batched_separately():
+    batcher = SearchBatcher(window=0.01, max_size=10)
+    first = FakeClient()
+    second = FakeClient()
+
+    await asyncio.gather(batcher.search(first, params("a")), batcher.search(second, params("b")))  # type: ignore[arg-type]
+
+    assert first.calls == [["a"]]
+    assert second.calls == [["b"]]
+
+
+async def test_rejected_batch_is_retried_one_at_a_time():
+    batcher = SearchBatcher(window=0.01, max_size=10)
+    client = FakeClient()
+
+    good, bad = await asyncio.gather(
+        batcher.search(client, params("good")),  # type: ignore[arg-type]
+        batcher.search(client, params("bad")),  # type: ignore[arg-type]
+        return_exceptions=True,
+    )
+
+    assert good.query == "good"  # type: ignore[union-attr]
+    assert isinstance(bad, MeilisearchApiError)
+    assert client.calls == [["good", "bad"], ["good"], ["bad"]]
+
+
+async def test_communication_errors_fail_the_batch():
+    batcher = SearchBatcher(window=0.01, max_size=10)
+    client = FakeClient(error=MeilisearchCommunicationError("down"))
+
+    with pytest.raises(MeilisearchCommunicationError):
+        await batcher.search(client, params("a"))  # type: ignore[arg-type]
+
+    assert len(client.calls) == 1
+
+
+async def test_cancelled_searches_are_not_sent():
+    batcher = SearchBatcher(window=0.01, max_size=10)
+    client = FakeClient()
+    cancelled = asyncio.create_task(batcher.search(client, params("a")))  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    result = await batcher.search(client, params("b"))  # type: ignore[arg-type]
+
+    assert result.query == "b"
+    assert client.calls == [["b"]]
@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+from meilisearch_python_sdk.models.search import SearchResults
+
+from meilisearch_fastapi._index_tasks import IndexTasks
+from meilisearch_fastapi._search_cache import SearchCache, search_cache_key
+from meilisearch_fastapi.models.search_parameters import SearchParameters
+
+
+class FakeIndexTasks(IndexTasks):
+    def __init__(self):
+        super().__init__()
+        self.pending_uids = set()
+
+    def pending(self, uid):
+        return uid in self.pending_uids
+
+
+def results(query="test", hits=1):
+    return SearchResults(
+        hits=[{"id": i, "title": "x" * 50} for i in range(hits)],
+        processing_time_ms=1,
+        query=query,
+    )
+
+
+@pytest.fixture
+def index_tasks():
+    return FakeIndexTasks()
+
+
+@pytest.fixture
+def cache(index_tasks):
+    return SearchCache(ttl=60, max_entries=10, max_bytes=100_000, index_tasks=index_tasks)
+
+
+def test_search_cache_key_is_canonical():
+    assert search_cache_key(SearchParameters(uid="movies", query="a")) == search_cache_key(
+        SearchParameters.model_validate({"query": "a", "uid": "movies", "limit": 20})
+    )
+    assert search_cache_key(SearchParameters(uid="movies", query="a")) != search_cache_key(
+        SearchParameters(uid="movies", query="b")
+    )
+
+
+def test_hit_and_miss(cache):
+    assert cache.get("a") is None
+
+    cache.set("a", "movies", results(), 0)
+
+    assert cache.get("a") == results()
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+    assert cache.stats().entries == 1
+    assert cache.stats().size_bytes == len(results().model_dump_json())
+
+
+def test_expired_entries_are_misses(index_tasks):
+    cache = SearchCache(ttl=0, max_entries=10, max_bytes=100_000, index_tasks=index_tasks)
+    cache.set("a", "movies", results(), 0)
+
+    assert cache.get("a") is None
+    assert cache.stats().entries == 0
+    assert cache.stats().size_bytes == 0
+
+
+def test_evicts_least_recently_used(index_tasks):
+    cache = SearchCache(ttl=60, max_entries=2, max_bytes=100_000, index_tasks=index_tasks)
+    cache.set("a", "movies", results("a"), 0)
+    cache.set("b", "movies", results("b"), 0)
+    cache.get("a")
+    cache.set("c", "movies", results("c"), 0)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats().evictions == 1
+
+
+def test_evicts_to_stay_under_max_bytes(index_tasks):
+    size = len(results().model_dump_json())
+    cache = SearchCache(ttl=60, max_entries=10, max_bytes=size * 2, index_tasks=index_tasks)
+    for key in "abc":
+        cache.set(key, "movies", results(), 0)
+
+    assert cache.stats().entries == 2
+    assert cache.stats().size_bytes == size * 2
+    assert cache.get("a") is None
+
+
+def test_results_larger_than_max_bytes_are_not_stored(index_tasks):
+    cache = SearchCache(ttl=60, max_entries=10, max_bytes=10, index_tasks=index_tasks)
+    cache.set("a", "movies", results(), 0)
+
+    assert cache.stats().entries == 0
+
+
+def test_invalidate_only_drops_the_index(cache):
+    cache.set("a", "movies", results(), 0)
+    cache.set("b", "books", results(), 0)
+
+    cache.invalidate("movies")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.stats().invalidations == 1
+
+
+def test_results_from_before_a_write_are_not_stored(cache, index_tasks):
+    generation = index_tasks.generation("movies")
+    index_tasks._notify("movies")
+    cache.set("a", "movies", results(), generation)
+
+    assert cache.get("a") is None
+
+
+def test_nothing_is_stored_while_writes_are_pending(cache, index_tasks):
+    index_tasks.pending_uids.add("movies")
+    cache.set("a", "movies", results(), 0)
+
+    assert cache.get("a") is None
+
+
+def test_index_task_listener_invalidates(cache, index_tasks):
+    cache.set("a", "movies", results(), 0)
+
+    index_tasks._notify("movies")
+
+    assert cache.get("a") is None
+
+
+async def test_expired_entries_are_served_while_revalidated(index_tasks):
+    cache = SearchCache(
+        ttl=0, max_entries=10, max_bytes=100_000, index_tasks=index_tasks, max_stale=60
+    )
+    cache.set("a", "movies", results("old"), 0)
+    calls = 0
+
+    async def revalidate():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        cache.set("a", "movies", results("new"), 0)
+
+    assert cache.get("a", revalidate) == results("old")
+    assert cache.get("a", revalidate) == results("old")
+    await asyncio.sleep(0.01)
+
+    assert calls == 1
+    assert cache.stats().stale_hits == 2
+    assert cache.stats().revalidations == 1
+    assert cache.get("a", revalidate) == results("new")
+
+
+async def test_failed_revalidation_keeps_serving_stale_entry(index_tasks):
+    cache = SearchCache(
+        ttl=0, max_entries=10, max_bytes=100_000, index_tasks=index_tasks, max_stale=60
+    )
+    cache.set("a", "movies", results(), 0)
+
+    async def revalidate():
+        raise RuntimeError("down")
+
+    assert cache.get("a", revalidate) == results()
+    await asyncio.sleep(0.01)
+
+    assert cache.get("a", revalidate) == results()
+    await cache.aclose()
+
+
+def test_entries_past_max_stale_are_misses(index_tasks):
+    cache = SearchCache(
+        ttl=0, max_entries=10, max_bytes=100_000, index_tasks=index_tasks, max_stale=0
+    )
+    cache.set("a", "movies", results(), 0)
+
+    async def revalidate():
+        pass
+
+    assert cache.get("a", revalidate) is None
+    assert cache.stats().stale_hits == 0
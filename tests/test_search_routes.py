@@ -1,7 +1,11 @@
+import asyncio
+import json
 from uuid import uuid4
 
 import pytest
 
+from meilisearch_fastapi._singleflight import get_search_flights
+
 
 async def test_basic_search(fastapi_test_client, async_index_with_documents, small_movies):
     uid = str(uuid4())
@@ -354,3 +358,435 @@ async def test_custom_search_params_with_matching_strategy_last(
 
     response = await fastapi_test_client.post("/search", json=data)
     assert len(response.json()["hits"]) > 1
+
+
+@pytest.fixture
+def search_cache_enabled(monkeypatch):
+    monkeypatch.setenv("MEILISEARCH_SEARCH_CACHE", "true")
+
+
+async def test_search_cache(
+    search_cache_enabled,
+    fastapi_test_client,
+    async_index_with_documents,
+    small_movies,
+    async_meilisearch_client,
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "query": "How to Train Your Dragon"}
+    first = await fastapi_test_client.post("/search", json=data)
+    second = await fastapi_test_client.post("/search", json=data)
+    stats = await fastapi_test_client.get("/search/cache")
+
+    assert first.json()["hits"] == second.json()["hits"]
+    assert stats.json()["hits"] == 1
+    assert stats.json()["misses"] == 1
+    assert stats.json()["entries"] == 1
+
+
+async def test_search_cache_invalidated_by_writes(
+    search_cache_enabled,
+    fastapi_test_client,
+    async_index_with_documents,
+    small_movies,
+    async_meilisearch_client,
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "query": "How to Train Your Dragon"}
+    await fastapi_test_client.post("/search", json=data)
+    response = await fastapi_test_client.delete(f"/documents/{uid}/166428")
+    await async_meilisearch_client.wait_for_task(response.json()["taskUid"])
+    response = await fastapi_test_client.post("/search", json=data)
+    stats = await fastapi_test_client.get("/search/cache")
+
+    assert response.json()["hits"][0]["id"] != "166428"
+    assert stats.json()["hits"] == 0
+    assert stats.json()["invalidations"] == 1
+
+
+async def test_search_cache_disabled(fastapi_test_client):
+    response = await fastapi_test_client.get("/search/cache")
+
+    assert response.status_code == 404
+
+
+async def test_concurrent_identical_searches_are_coalesced(
+    fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "query": "How to Train Your Dragon"}
+    responses = await asyncio.gather(
+        *[fastapi_test_client.post("/search", json=data) for _ in range(10)]
+    )
+    search_flights = get_search_flights()
+
+    assert all(r.json()["hits"] == responses[0].json()["hits"] for r in responses)
+    assert search_flights is not None
+    assert search_flights.calls + search_flights.shared == 10
+    assert search_flights.calls < 10
+
+
+async def test_multi_search(fastapi_test_client, async_index_with_documents, small_movies):
+    uid = str(uuid4())
+    uid2 = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    await async_index_with_documents(small_movies, uid2)
+    data = {
+        "queries": [
+            {"uid": uid, "query": "How to Train Your Dragon"},
+            {"uid": uid2, "query": "", "limit": 5},
+        ]
+    }
+    response = await fastapi_test_client.post("/search/multi", json=data)
+
+    assert [r["indexUid"] for r in response.json()] == [uid, uid2]
+    assert response.json()[0]["hits"][0]["id"] == "166428"
+    assert len(response.json()[1]["hits"]) == 5
+
+
+async def test_multi_search_uses_search_cache(
+    search_cache_enabled, fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "query": "How to Train Your Dragon"}
+    await fastapi_test_client.post("/search", json=data)
+    response = await fastapi_test_client.post(
+        "/search/multi", json={"queries": [data, {"uid": uid, "query": "dragon"}]}
+    )
+    stats = await fastapi_test_client.get("/search/cache")
+
+    assert [r["indexUid"] for r in response.json()] == [uid, uid]
+    assert response.json()[0]["hits"][0]["id"] == "166428"
+    assert stats.json()["hits"] == 1
+    assert stats.json()["entries"] == 2
+
+
+async def test_multi_search_answers_repeated_requests_from_search_cache(
+    search_cache_enabled, fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"queries": [{"uid": uid, "query": "How to Train Your Dragon"}]}
+    first = await fastapi_test_client.post("/search/multi", json=data)
+    second = await fastapi_test_client.post("/search/multi", json=data)
+    single = await fastapi_test_client.post("/search", json=data["queries"][0])
+    stats = await fastapi_test_client.get("/search/cache")
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert "indexUid" not in single.json()
+    assert stats.json()["hits"] == 2
+
+
+async def test_federated_search(fastapi_test_client, async_index_with_documents, small_movies):
+    uid = str(uuid4())
+    uid2 = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    await async_index_with_documents(small_movies, uid2)
+    data = {
+        "queries": [
+            {"uid": uid, "query": "How to Train Your Dragon"},
+            {"uid": uid2, "query": "How to Train Your Dragon", "weight": 0.5},
+        ],
+        "limit": 4,
+    }
+    response = await fastapi_test_client.post("/search/federated", json=data)
+    hits = response.json()["hits"]
+    scores = [hit["_federation"]["weightedRankingScore"] for hit in hits]
+
+    assert len(hits) == 4
+    assert scores == sorted(scores, reverse=True)
+    assert hits[0]["id"] == "166428"
+    assert hits[0]["_federation"]["indexUid"] == uid
+    assert response.json()["estimatedTotalHits"] > 4
+
+
+async def test_federated_search_offset(
+    fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    uid2 = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    await async_index_with_documents(small_movies, uid2)
+    queries = [{"uid": uid, "query": "dragon"}, {"uid": uid2, "query": "dragon"}]
+    first = await fastapi_test_client.post(
+        "/search/federated", json={"queries": queries, "limit": 4}
+    )
+    second = await fastapi_test_client.post(
+        "/search/federated", json={"queries": queries, "offset": 2, "limit": 2}
+    )
+
+    assert second.json()["hits"] == first.json()["hits"][2:]
+
+
+@pytest.mark.parametrize("batch_size", [7, 1000])
+async def test_export_search(
+    batch_size, fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "batchSize": batch_size, "attributesToRetrieve": ["id"]}
+    response = await fastapi_test_client.post("/search/export", json=data)
+    hits = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(hits) == len(small_movies)
+    assert {hit["id"] for hit in hits} == {movie["id"] for movie in small_movies}
+
+
+async def test_export_search_max_hits(
+    fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "offset": 3, "batchSize": 5, "maxHits": 12}
+    response = await fastapi_test_client.post("/search/export", json=data)
+    expected = await fastapi_test_client.post(
+        "/search", json={"uid": uid, "offset": 3, "limit": 12}
+    )
+
+    assert [json.loads(line) for line in response.text.splitlines()] == expected.json()["hits"]
+
+
+async def test_raw_search(fastapi_test_client, async_index_with_documents, small_movies):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "query": "Dragon", "attributesToHighlight": ["title"], "limit": 5}
+    raw = await fastapi_test_client.post("/search/raw", json=data)
+    parsed = await fastapi_test_client.post("/search", json=data)
+
+    assert raw.headers["content-type"] == "application/json"
+    assert raw.json()["hits"] == parsed.json()["hits"]
+    assert raw.json()["estimatedTotalHits"] == parsed.json()["estimatedTotalHits"]
+
+
+async def test_typeahead_search(fastapi_test_client, async_index_with_documents, small_movies):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    responses = [
+        await fastapi_test_client.post("/search/typeahead", json={"uid": uid, "query": query})
+        for query in ("dr", "dra", "dragon")
+    ]
+    stats = await fastapi_test_client.get("/search/typeahead/cache")
+    expected = await fastapi_test_client.post("/search", json={"uid": uid, "query": "dragon"})
+
+    assert responses[2].json()["hits"] == expected.json()["hits"]
+    assert responses[2].json()["estimatedTotalHits"] == expected.json()["estimatedTotalHits"]
+    assert stats.json()["hits"] == 2
+    assert stats.json()["misses"] == 1
+
+
+async def test_typeahead_search_with_highlighting_is_not_narrowed(
+    fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    data = {"uid": uid, "query": "dragon", "attributesToHighlight": ["title"]}
+    response = await fastapi_test_client.post("/search/typeahead", json=data)
+    stats = await fastapi_test_client.get("/search/typeahead/cache")
+
+    assert "_formatted" in response.json()["hits"][0]
+    assert stats.json()["misses"] == 0
+
+
+@pytest.fixture
+def search_batching_enabled(monkeypatch):
+    monkeypatch.setenv("MEILISEARCH_SEARCH_BATCHING", "true")
+    monkeypatch.setenv("MEILISEARCH_SEARCH_BATCH_WINDOW", "0.05")
+
+
+async def test_search_batching(
+    search_batching_enabled, fastapi_test_client, async_index_with_documents, small_movies
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    responses = await asyncio.gather(
+        *[
+            fastapi_test_client.post("/search", json={"uid": uid, "query": query})
+            for query in ("Dragon", "Avengers", "Spider")
+        ]
+    )
+    stats = await fastapi_test_client.get("/search/batcher")
+
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[0].json()["hits"][0]["id"] == "166428"
+    assert stats.json()["batches"] == 1
+    assert stats.json()["searches"] == 3
+
+
+async def test_search_batching_disabled(fastapi_test_client):
+    response = await fastapi_test_client.get("/search/batcher")
+
+    assert response.status_code == 404
+
+
+async def test_facet_search(
+    fastapi_test_client, async_index_with_documents, small_movies, async_meilisearch_client
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    facet_data = {"uid": uid, "filterableAttributes": ["genre"]}
+    update = await fastapi_test_client.patch("/indexes/filterable-attributes", json=facet_data)
+    await async_meilisearch_client.wait_for_task(update.json()["taskUid"])
+    data = {"uid": uid, "facets": ["genre"], "filter": "genre = action"}
+    first = await fastapi_test_client.post("/search/facets", json=data)
+    second = await fastapi_test_client.post("/search/facets", json=data)
+    stats = await fastapi_test_client.get("/search/facets/cache")
+
+    assert first.json() == second.json()
+    assert list(first.json()["facetDistribution"]["genre"]) == ["action"]
+    assert stats.json()["hits"] == 1
+    assert stats.json()["misses"] == 1
+
+
+async def test_search_filter_not_filterable(
+    fastapi_test_client,
+    async_index_with_documents,
+    small_movies,
+    async_meilisearch_client,
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    facet_data = {"uid": uid, "filterableAttributes": ["genre"]}
+    update = await fastapi_test_client.patch("/indexes/filterable-attributes", json=facet_data)
+    await async_meilisearch_client.wait_for_task(update.json()["taskUid"])
+    response = await fastapi_test_client.post(
+        "/search", json={"uid": uid, "filter": "release_date > 1"}
+    )
+
+    assert response.status_code == 400
+    assert "is not filterable" in response.json()["detail"]
+
+
+async def test_search_filter_with_trailing_comma(
+    fastapi_test_client,
+    async_index_with_documents,
+    small_movies,
+    async_meilisearch_client,
+):
+    uid = str(uuid4())
+    await async_index_with_documents(small_movies, uid)
+    facet_data = {"uid": uid, "filterableAttributes": ["genre"]}
+    update = await fastapi_test_client.patch("/indexes/filterable-attributes", json=facet_data)
+    await async_meilisearch_client.wait_for_task(update.json()["taskUid"])
+    response = await fastapi_test_client.post(
+        "/search", json={"uid": uid, "filter": "genre IN [action, comedy,]"}
+    )
+
+    assert response.status_code == 200
+
+
+async def test_cursor_search(
+    fastapi_test_client, async_index_with_documents, small_movies, async_meilisearch_client
+):
+    uid = str(uuid4())
+    index = await async_index_with_documents(small_movies, uid)
+    await async_meilisearch_client.wait_for_task(
+        (await index.update_filterable_attributes(["release_date", "id"])).task_uid
+    )
+    await async_meilisearch_client.wait_for_task(
+        (await index.update_sortable_attributes(["release_date"])).task_uid
+    )
+    data = {"uid": uid, "sort": ["release_date:desc"], "limit": 7}
+    pages = []
+    while True:
+        response = await fastapi_test_client.post("/search/cursor", json=data)
+        pages.append(response.json()["hits"])
+        if response.json()["nextCursor"] is None:
+            break
+        data["cursor"] = response.json()["nextCursor"]
+
+    ids = [hit["id"] for page in pages for hit in page]
+    release_dates = [hit["release_date"] for page in pages for hit in page]
+
+    assert len(pages) == 5
+    assert sorted(ids) == sorted(movie["id"] for movie in small_movies)
+    assert release_dates == sorted(release_dates, reverse=True)
+
+
+async def test_cursor_search_returns_only_requested_attributes(
+    fastapi_test_client, async_index_with_documents, small_movies, async_meilisearch_client
+):
+    uid = str(uuid4())
+    index = await async_index_with_documents(small_movies, uid)
+    await async_meilisearch_client.wait_for_task(
+        (await index.update_filterable_attributes(["release_date", "id"])).task_uid
+    )
+    await async_meilisearch_client.wait_for_task(
+        (await index.update_sortable_attributes(["release_date"])).task_uid
+    )
+    data = {
+        "uid": uid,
+        "sort": ["release_date:desc"],
+        "limit": 7,
+        "attributesToRetrieve": ["title"],
+    }
+    response = await fastapi_test_client.post("/search/cursor", json=data)
+
+    assert response.json()["nextCursor"] is not None
+    assert all(list(hit) == ["title"] for hit in response.json()["hits"])
+
+
+async def test_cursor_search_with_query_needs_sort_ranked_first(
+    fastapi_test_client, async_index_with_documents, small_movies, async_meilisearch_client
+):
+    uid = str(uuid4())
+    index = await async_index_with_documents(small_movies, uid)
+    await async_meilisearch_client.wait_for_task(
+        (await index.update_sortable_attributes(["release_date"])).task_uid
+    )
+    data = {"uid": uid, "query": "dragon", "sort": ["release_date:desc"]}
+    response = await fastapi_test_client.post("/search/cursor", json=data)
+
+    assert response.status_code == 400
+    assert "first ranking rule" in response.json()["detail"]
+
+
+async def test_cursor_search_needs_sort(fastapi_test_client):
+    response = await fastapi_test_client.post("/search/cursor", json={"uid": str(uuid4())})
+
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def search_projections(monkeypatch):
+    monkeypatch.setenv(
+        "MEILISEARCH_PROJECTIONS",
+        json.dumps({"movies": {"default": ["id", "title"], "detail": ["id", "overview"]}}),
+    )
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({}, {"id", "title"}),
+        ({"projection": "detail"}, {"id", "overview"}),
+        ({"attributesToRetrieve": ["*"]}, None),
+    ],
+)
+async def test_search_projections(
+    data,
+    expected,
+    search_projections,
+    fastapi_test_client,
+    async_index_with_documents,
+    small_movies,
+):
+    await async_index_with_documents(small_movies, "movies")
+    response = await fastapi_test_client.post("/search", json={"uid": "movies", **data})
+
+    assert set(response.json()["hits"][0]) == (expected or set(small_movies[0]))
+
+
+async def test_search_unknown_projection(search_projections, fastapi_test_client):
+    response = await fastapi_test_client.post(
+        "/search", json={"uid": "movies", "projection": "card"}
+    )
+    projections = await fastapi_test_client.get("/search/projections/movies")
+
+    assert response.status_code == 400
+    assert set(projections.json()) == {"default", "detail"}
@@ -41,6 +41,18 @@ async def test_settings_get(default_settings, index_uid, fastapi_test_client):
     assert response.json() == default_settings
 
 
+@pytest.mark.usefixtures("indexes_sample")
+async def test_settings_get_not_modified(index_uid, fastapi_test_client):
+    response = await fastapi_test_client.get(f"/settings/{index_uid}")
+    etag = response.headers["etag"]
+    response = await fastapi_test_client.get(
+        f"/settings/{index_uid}", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
 @pytest.mark.usefixtures("indexes_sample")
 async def test_settings_update_and_delete(
     default_settings, index_uid, fastapi_test_client, async_meilisearch_client
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from meilisearch_fastapi._singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_call():
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*[flights.do("a", fn) for _ in range(10)])
+
+    assert results == [1] * 10
+    assert calls == 1
+    assert flights.calls == 1
+    assert flights.shared == 9
+
+
+async def test_different_keys_do_not_share():
+    flights: SingleFlight[str] = SingleFlight()
+
+    async def fn(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        flights.do("a", lambda: fn("a")), flights.do("b", lambda: fn("b"))
+    )
+
+    assert results == ["a", "b"]
+    assert flights.calls == 2
+
+
+async def test_finished_calls_are_not_reused():
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flights.do("a", fn) == 1
+    assert await flights.do("a", fn) == 2
+
+
+async def test_errors_are_shared():
+    flights: SingleFlight[int] = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad")
+
+    results = await asyncio.gather(flights.do("a", fn), flights.do("a", fn), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.calls == 1
+
+
+async def test_cancelled_caller_does_not_cancel_the_call():
+    flights: SingleFlight[int] = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        return 1
+
+    first = asyncio.create_task(flights.do("a", fn))
+    second = asyncio.create_task(flights.do("a", fn))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    assert await second == 1
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+import pytest
+
+from meilisearch_fastapi._streaming import RecordChunks
+
+
+async def stream(data, piece_size):
+    for i in range(0, len(data), piece_size):
+        yield data[i : i + piece_size]
+    yield b""
+
+
+async def read_chunks(chunks):
+    result = []
+    while await chunks.has_more():
+        result.append(b"".join([piece async for piece in chunks.chunk()]))
+
+    return result
+
+
+def ndjson(count):
+    return b"".join(
+        json.dumps({"id": i, "title": f"movie {i}"}).encode() + b"\n" for i in range(count)
+    )
+
+
+@pytest.mark.parametrize("piece_size", [1, 7, 64, 10_000])
+@pytest.mark.parametrize("max_bytes", [1, 50, 200, 100_000])
+async def test_ndjson_chunks_hold_whole_records(piece_size, max_bytes):
+    data = ndjson(20)
+    chunks = await read_chunks(RecordChunks(stream(data, piece_size), max_bytes))
+
+    assert b"".join(chunks) == data
+    for chunk in chunks:
+        assert chunk.endswith(b"\n")
+        assert all(json.loads(line) for line in chunk.splitlines())
+    if max_bytes < len(data):
+        assert len(chunks) > 1
+        # Chunks only go past max_bytes to finish a record.
+        assert all(len(chunk) < max_bytes + 40 for chunk in chunks)
+
+
+async def test_ndjson_without_trailing_newline():
+    data = ndjson(3).rstrip(b"\n")
+    chunks = await read_chunks(RecordChunks(stream(data, 5), 10))
+
+    assert b"".join(chunks) == data
+    assert len(chunks) == 3
+
+
+@pytest.mark.parametrize("body", [b"", b"\n", b"  \n\n"])
+async def test_empty_bodies_have_no_chunks(body):
+    assert await read_chunks(RecordChunks(stream(body, 1), 10)) == []
+
+
+@pytest.mark.parametrize("piece_size", [1, 5, 1000])
+async def test_csv_chunks_repeat_header_and_respect_quotes(piece_size):
+    rows = [["id", "overview"]] + [[str(i), f'line one\nline "{i}", two'] for i in range(10)]
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    data = buffer.getvalue().encode()
+
+    chunks = await read_chunks(RecordChunks(stream(data, piece_size), 40, csv=True))
+
+    assert len(chunks) > 1
+    read_rows = []
+    for chunk in chunks:
+        chunk_rows = list(csv.reader(io.StringIO(chunk.decode())))
+        assert chunk_rows[0] == ["id", "overview"]
+        read_rows.extend(chunk_rows[1:])
+    assert read_rows == rows[1:]
+
+
+async def test_csv_header_only():
+    assert await read_chunks(RecordChunks(stream(b"id,title", 3), 10, csv=True)) == []
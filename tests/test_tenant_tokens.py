@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from meilisearch_python_sdk.models.client import Key
+
+from meilisearch_fastapi._tenant_tokens import TenantTokenCache, tenant_token_cache_key
+
+
+@pytest.fixture
+def api_key():
+    return Key(
+        uid="a1b2",
+        key="secret",
+        actions=["search"],
+        indexes=["movies"],
+        created_at=datetime.now(tz=timezone.utc),
+    )
+
+
+def test_cache_key_ignores_search_rules_order(api_key):
+    assert tenant_token_cache_key(
+        api_key, {"movies": {"filter": "a = 1"}, "books": {}}, True
+    ) == tenant_token_cache_key(api_key, {"books": {}, "movies": {"filter": "a = 1"}}, True)
+
+
+def test_cache_key_includes_key(api_key):
+    other = api_key.model_copy(update={"key": "other"})
+
+    assert tenant_token_cache_key(api_key, ["*"], True) != tenant_token_cache_key(
+        other, ["*"], True
+    )
+
+
+def test_reuses_token_without_expiry(api_key):
+    cache = TenantTokenCache(min_remaining=60, max_entries=10)
+    cache.set(api_key, ["*"], None, "token")
+
+    assert cache.get(api_key, ["*"], None) == "token"
+    assert cache.get(api_key, ["*"], datetime.now(tz=timezone.utc) + timedelta(hours=1)) is None
+
+
+def test_reuses_token_expiring_before_requested(api_key):
+    cache = TenantTokenCache(min_remaining=60, max_entries=10)
+    expires_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    cache.set(api_key, ["*"], expires_at, "token")
+
+    assert cache.get(api_key, ["*"], expires_at + timedelta(minutes=5)) == "token"
+    assert cache.get(api_key, ["*"], expires_at - timedelta(minutes=5)) is None
+    assert cache.get(api_key, ["*"], None) is None
+    assert cache.get(api_key, {"indexes": ["movies"]}, expires_at) is None
+
+
+def test_drops_token_close_to_expiry(api_key):
+    cache = TenantTokenCache(min_remaining=600, max_entries=10)
+    expires_at = datetime.now(tz=timezone.utc) + timedelta(minutes=5)
+    cache.set(api_key, ["*"], expires_at, "token")
+
+    assert cache.get(api_key, ["*"], expires_at + timedelta(hours=1)) is None
+    assert cache.get(api_key, ["*"], expires_at + timedelta(hours=1)) is None
+
+
+def test_naive_expiry_skips_cache(api_key):
+    cache = TenantTokenCache(min_remaining=60, max_entries=10)
+    expires_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    cache.set(api_key, ["*"], expires_at, "token")
+
+    assert cache.get(api_key, ["*"], expires_at.replace(tzinfo=None)) is None
+
+
+@pytest.mark.parametrize("key", ["a1b2", "secret"])
+def test_evict(api_key, key):
+    cache = TenantTokenCache(min_remaining=60, max_entries=10)
+    other = api_key.model_copy(update={"uid": "c3d4", "key": "other"})
+    cache.set(api_key, ["*"], None, "token")
+    cache.set(other, ["*"], None, "other token")
+    cache.evict(key)
+
+    assert cache.get(api_key, ["*"], None) is None
+    assert cache.get(other, ["*"], None) == "other token"
+
+
+def test_max_entries(api_key):
+    cache = TenantTokenCache(min_remaining=60, max_entries=2)
+    cache.set(api_key, ["a"], None, "a")
+    cache.set(api_key, ["b"], None, "b")
+    cache.get(api_key, ["a"], None)
+    cache.set(api_key, ["c"], None, "c")
+
+    assert cache.get(api_key, ["a"], None) == "a"
+    assert cache.get(api_key, ["b"], None) is None
+    assert cache.get(api_key, ["c"], None) == "c"
@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+
+from meilisearch_fastapi._index_tasks import IndexTasks
+from meilisearch_fastapi._typeahead import (
+    TypeaheadCache,
+    can_narrow,
+    narrow,
+    query_words,
+    typeahead_signature,
+)
+from meilisearch_fastapi.models.search_parameters import TypeaheadSearchParameters
+
+HITS = [
+    {"id": 1, "title": "Spider-Man: Into the Spider-Verse"},
+    {"id": 2, "title": "Spirited Away", "genres": ["animation"]},
+    {"id": 3, "title": "Iron Man", "cast": [{"name": "Robert Downey Jr."}]},
+]
+
+
+@pytest.fixture
+def index_tasks():
+    return IndexTasks()
+
+
+@pytest.fixture
+def cache(index_tasks):
+    return TypeaheadCache(window=10, ttl=60, max_entries=2, index_tasks=index_tasks)
+
+
+def test_query_words():
+    assert query_words("Spider-Man  INTO") == ["spider", "man", "into"]
+    assert query_words(None) == []
+
+
+def test_signature_ignores_query_and_paging():
+    first = TypeaheadSearchParameters(uid="movies", query="sp", limit=5)
+    second = TypeaheadSearchParameters(uid="movies", query="spi", offset=5)
+
+    assert typeahead_signature(first) == typeahead_signature(second)
+    assert typeahead_signature(first) != typeahead_signature(
+        TypeaheadSearchParameters(uid="movies", query="sp", session="a")
+    )
+    assert typeahead_signature(first) != typeahead_signature(
+        TypeaheadSearchParameters(uid="movies", query="sp", filter="genre = action")
+    )
+
+
+@pytest.mark.parametrize(
+    "parameters, expected",
+    [
+        ({}, True),
+        ({"attributesToHighlight": ["title"]}, False),
+        ({"facets": ["genre"]}, False),
+        ({"attributesToRetrieve": ["title"]}, False),
+        ({"page": 1}, False),
+        ({"matchingStrategy": "frequency"}, False),
+    ],
+)
+def test_can_narrow(parameters, expected):
+    assert can_narrow(TypeaheadSearchParameters(uid="movies", **parameters)) is expected
+
+
+@pytest.mark.parametrize(
+    "words, matching_strategy, expected",
+    [
+        ([], "last", [1, 2, 3]),
+        (["spi"], "last", [1, 2]),
+        (["spider", "ver"], "all", [1]),
+        (["spider", "v"], "last", [1]),
+        (["iron", "mango"], "all", []),
+        (["iron", "mango"], "last", [3]),
+        (["man", "spi"], "last", [1, 3]),
+        (["robert"], "all", [3]),
+        (["animation"], "all", [2]),
+    ],
+)
+def test_narrow(words, matching_strategy, expected):
+    assert [hit["id"] for hit in narrow(HITS, words, matching_strategy)] == expected
+
+
+@pytest.mark.parametrize(
+    "words, searchable_attributes, expected",
+    [
+        (["spi"], ["*"], [1, 2]),
+        (["animation"], ["title"], []),
+        (["robert"], ["title", "cast"], [3]),
+        (["robert"], ["cast.name"], [3]),
+        (["robert"], ["cast.character"], []),
+    ],
+)
+def test_narrow_only_matches_searchable_attributes(words, searchable_attributes, expected):
+    narrowed = narrow(HITS, words, "all", searchable_attributes)
+
+    assert [hit["id"] for hit in narrowed] == expected
+
+
+def test_get_longest_cached_prefix(cache):
+    cache.set("a", "movies", ["s"], HITS, 0)
+    cache.set("a", "movies", ["spi"], HITS[:2], 0)
+
+    assert cache.get("a", ["spider", "man"]).hits == HITS[:2]
+    assert cache.get("a", ["sp"]).hits == HITS
+    assert cache.get("a", ["x"]) is None
+    assert cache.get("b", ["spider"]) is None
+    assert cache.stats().hits == 2
+    assert cache.stats().misses == 2
+
+
+def test_expired_windows_are_misses(index_tasks):
+    cache = TypeaheadCache(window=10, ttl=0, max_entries=2, index_tasks=index_tasks)
+    cache.set("a", "movies", ["s"], HITS, 0)
+
+    assert cache.get("a", ["spi"]) is None
+    assert cache.stats().entries == 0
+
+
+def test_oldest_windows_are_evicted(cache):
+    cache.set("a", "movies", ["a"], HITS, 0)
+    cache.set("a", "movies", ["b"], HITS, 0)
+    cache.get("a", ["a"])
+    cache.set("a", "movies", ["c"], HITS, 0)
+
+    assert cache.get("a", ["a"]) is not None
+    assert cache.get("a", ["b"]) is None
+
+
+def test_writes_invalidate(cache, index_tasks):
+    cache.set("a", "movies", ["s"], HITS, 0)
+    cache.set("b", "books", ["s"], HITS, 0)
+    index_tasks._notify("movies")
+
+    assert cache.get("a", ["spi"]) is None
+    assert cache.stats().entries == 1
+    assert cache.stats().invalidations == 1
+
+
+def test_stale_generation_is_not_stored(cache, index_tasks):
+    generation = index_tasks.generation("movies")
+    index_tasks._notify("movies")
+    cache.set("a", "movies", ["s"], HITS, generation)
+
+    assert cache.stats().entries == 0
+
+
+async def test_fill_stores_hits_in_the_background(cache):
+    limits = []
+
+    async def fetch(limit):
+        limits.append(limit)
+        await asyncio.sleep(0)
+        return HITS
+
+    async def searchable_attributes():
+        return ["title"]
+
+    cache.fill("a", "movies", ["s"], fetch, searchable_attributes, 0)
+    cache.fill("a", "movies", ["s"], fetch, searchable_attributes, 0)
+    assert cache.stats().entries == 0
+
+    await asyncio.sleep(0.01)
+    window = cache.get("a", ["spi"])
+
+    assert limits == [11]
+    assert window.hits == HITS
+    assert window.searchable_attributes == ["title"]
+
+
+async def test_fill_skips_more_hits_than_the_window(index_tasks):
+    cache = TypeaheadCache(window=2, ttl=60, max_entries=2, index_tasks=index_tasks)
+
+    async def fetch(limit):
+        return HITS[:limit]
+
+    async def searchable_attributes():
+        return ["*"]
+
+    cache.fill("a", "movies", ["s"], fetch, searchable_attributes, 0)
+    await asyncio.sleep(0.01)
+
+    assert cache.stats().entries == 0
+
+
+async def test_aclose_cancels_fills(cache):
+    async def fetch(limit):
+        await asyncio.sleep(10)
+        return HITS
+
+    async def searchable_attributes():
+        return ["*"]
+
+    cache.fill("a", "movies", ["s"], fetch, searchable_attributes, 0)
+    await cache.aclose()
+
+    assert cache.stats().entries == 0